@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Mede o custo de gerar os labels dos fluxogramas em módulos grandes.
+
+Compara a extração por trechos do código-fonte (SourceSegments) com o
+astor.to_source usado anteriormente, quando o astor estiver instalado.
+
+Uso: python benchmarks/bench_mermaid_labels.py --functions 500
+"""
+import argparse
+import ast
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from convert_py_to_mmd_and_svg import SourceSegments, generate_mermaid_from_ast  # noqa: E402
+
+try:
+    import astor
+except ImportError:
+    astor = None
+
+FUNCTION_TEMPLATE = '''
+def funcao_{index}(dados, limite={index}):
+    resultado = []
+    for chave, valor in sorted(dados.items(), key=lambda item: (item[1], item[0])):
+        if valor > limite and chave not in resultado:
+            resultado.append({{"chave": chave, "valor": [valor * 2, valor ** 2, valor // 3]}})
+        while len(resultado) > limite:
+            resultado.pop(0)
+    total = sum(item["valor"][0] for item in resultado if item["chave"].startswith("a"))
+    print(f"funcao_{index}: {{total}}")
+'''
+
+
+def labelled_nodes(tree):
+    """
+    Retorna os nós cujo código-fonte vira label no fluxograma.
+    """
+    nodes = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.If, ast.While)):
+            nodes.append(node.test)
+        elif isinstance(node, ast.For):
+            nodes.extend((node.target, node.iter))
+        elif isinstance(node, (ast.Assign, ast.Expr)):
+            nodes.append(node)
+    return nodes
+
+
+def measure(name, func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:>28}: {elapsed * 1000:10.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--functions", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    code = "".join(FUNCTION_TEMPLATE.format(index=index) for index in range(args.functions))
+    tree = ast.parse(code)
+    nodes = labelled_nodes(tree)
+    print(f"{args.functions} funções, {len(code.splitlines())} linhas, {len(nodes)} labels")
+
+    segments = SourceSegments(code)
+    measure("labels via SourceSegments", lambda: [segments.get(node) for node in nodes], args.repeat)
+    if astor is not None:
+        measure("labels via astor.to_source", lambda: [astor.to_source(node) for node in nodes], args.repeat)
+    else:
+        print("astor não instalado; comparação com astor.to_source omitida.")
+    measure("generate_mermaid_from_ast", lambda: generate_mermaid_from_ast(code), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Compara a renderização de diagramas Mermaid arquivo a arquivo com a renderização em lotes
+e com o renderizador em Python puro (svg_flowchart). Sem o mmdc, mede apenas o último.
+
+Uso: python benchmarks/bench_mermaid_render.py --files 50 --batch-size 25 --render-workers 2
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from convert_py_to_mmd_and_svg import MmdcBatchRenderer, MmdcRenderer, write_mermaid_file  # noqa: E402
+from svg_flowchart import SvgRenderer  # noqa: E402
+
+SAMPLE_CODE = '''
+def soma(valores):
+    total = 0
+    for valor in valores:
+        if valor > 0:
+            total = total + valor
+    return total
+
+resultado = soma([1, 2, 3])
+print(resultado)
+'''
+
+
+def create_jobs(directory, count):
+    """
+    Cria arquivos .py de exemplo e os respectivos .mmd.
+
+    :param directory: Diretório onde os arquivos serão criados
+    :param count: Quantidade de arquivos
+    :return: Lista de tuplas (mmd_path, svg_path)
+    """
+    jobs = []
+    for index in range(count):
+        py_path = os.path.join(directory, f"sample_{index}.py")
+        with open(py_path, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_CODE)
+        jobs.extend(write_mermaid_file(py_path))
+    return jobs
+
+
+def time_renderer(renderer, jobs):
+    start = time.perf_counter()
+    failures = [job for job in renderer.render_many(jobs) if job[2] is not None]
+    return time.perf_counter() - start, len(failures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--render-workers", type=int, default=2)
+    parser.add_argument("--mmdc", default="mmdc")
+    args = parser.parse_args()
+
+    renderers = [("svg_flowchart", SvgRenderer())]
+    if shutil.which(args.mmdc) is None:
+        print(f"Comando {args.mmdc} não encontrado; medindo apenas o svg_flowchart.")
+    else:
+        renderers[:0] = [
+            ("por arquivo", MmdcRenderer(args.mmdc)),
+            ("em lotes", MmdcBatchRenderer(args.mmdc, args.batch_size, args.render_workers)),
+        ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        jobs = create_jobs(tmp_dir, args.files)
+        for name, renderer in renderers:
+            elapsed, failures = time_renderer(renderer, jobs)
+            print(f"{name:>12}: {elapsed:8.2f} s  {args.files / elapsed:8.1f} diagramas/s  falhas: {failures}")
+
+
+if __name__ == "__main__":
+    main()
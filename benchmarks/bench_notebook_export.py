@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Compara a exportação de notebooks para .md e .py do jeito antigo com o pipeline de notebook_export.
+
+Jeito antigo: para cada notebook, nbformat.read para validar, exportadores
+novos e from_filename uma vez por formato (três leituras do arquivo).
+Pipeline: uma leitura por notebook e exportadores reutilizados.
+
+Uso: python benchmarks/bench_notebook_export.py --notebooks 100 --cells 40
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nbformat  # noqa: E402
+from nbconvert import MarkdownExporter, PythonExporter  # noqa: E402
+
+from notebook_export import export_notebook, read_notebook  # noqa: E402
+
+
+def create_notebooks(directory, count, cells):
+    """
+    Cria notebooks de exemplo com células markdown e de código com saídas.
+
+    :return: Lista de caminhos dos notebooks
+    """
+    paths = []
+    for index in range(count):
+        notebook = nbformat.v4.new_notebook()
+        for cell in range(cells):
+            notebook.cells.append(nbformat.v4.new_markdown_cell(f'## Seção {cell}\n\nTexto com *ênfase* e `código`.'))
+            notebook.cells.append(nbformat.v4.new_code_cell(
+                f'valores = list(range({cell}))\nprint(sum(valores))',
+                outputs=[nbformat.v4.new_output('stream', name='stdout', text=f'{cell}\n')]))
+        path = os.path.join(directory, f'notebook_{index}', 'README.ipynb')
+        os.makedirs(os.path.dirname(path))
+        nbformat.write(notebook, path)
+        paths.append(path)
+    return paths
+
+
+def export_old(paths):
+    for path in paths:
+        with open(path, 'r') as file:
+            nbformat.read(file, as_version=4)
+        MarkdownExporter().from_filename(path)
+        PythonExporter().from_filename(path)
+
+
+def export_pipeline(paths):
+    for path in paths:
+        export_notebook(read_notebook(path), path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--notebooks', type=int, default=100)
+    parser.add_argument('--cells', type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = create_notebooks(tmp_dir, args.notebooks, args.cells)
+        for name, func in [('antigo', export_old), ('pipeline', export_pipeline)]:
+            start = time.perf_counter()
+            func(paths)
+            elapsed = time.perf_counter() - start
+            print(f'{name:>10}: {elapsed:8.2f} s  {elapsed / len(paths) * 1000:8.1f} ms/notebook')
+
+
+if __name__ == '__main__':
+    main()
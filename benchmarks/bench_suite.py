@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+Suíte de benchmarks das ferramentas, com linha de base e verificação de regressões.
+
+Para cada tamanho (número de projetos), gera uma árvore sintética com
+synthetic_tree e mede, em uma cópia nova da árvore a cada repetição:
+
+    sync     copy_files_to_non_empty_dir (template -> projetos)
+    search   find_files_with_keyword.search_files
+    mermaid  generate_mermaid_from_ast (sem E/S)
+    diagram  update_diagrams com o stub_mmdc no lugar do mmdc
+    svg      update_diagrams com o renderizador em Python puro (svg_flowchart)
+    nb2md    convert_ipynb_to_md_and_py.convert_tree
+    md2nb    convert_md_to_ipynb_and_py.convert_tree
+
+O tempo é a mediana de --repeat execuções; o pico de memória é medido com
+tracemalloc em uma execução à parte. Os tempos são divididos pelo tempo de
+uma carga fixa de calibração, medida intercalada com as execuções de cada
+caso, para que a linha de base gravada em outra máquina (ou num momento mais
+lento desta) continue comparável. Uma regressão acima de --threshold (no tempo
+normalizado ou no pico de memória) faz o script terminar com código 1.
+
+Uso:
+    python benchmarks/bench_suite.py                      # compara com benchmarks/baseline.json
+    python benchmarks/bench_suite.py --update-baseline    # grava a nova linha de base
+    python benchmarks/bench_suite.py --cases sync,search --sizes 4,16 --repeat 9
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import convert_ipynb_to_md_and_py  # noqa: E402
+import convert_md_to_ipynb_and_py  # noqa: E402
+import convert_py_to_mmd_and_svg  # noqa: E402
+import copy_files_to_non_empty_dirs  # noqa: E402
+import find_files_with_keyword  # noqa: E402
+import stub_mmdc  # noqa: E402
+from file_manifest import atomic_write  # noqa: E402
+from run_report import RunReport  # noqa: E402
+from synthetic_tree import create_tree  # noqa: E402
+
+# Versão do formato dos resultados e da linha de base
+SUITE_VERSION = 2
+# Linha de base versionada no repositório
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+# Tamanhos padrão (número de projetos da árvore sintética)
+DEFAULT_SIZES = (4, 16)
+# Piora relativa tolerada antes de acusar regressão
+DEFAULT_THRESHOLD = 0.25
+# Execuções por medida de tempo
+DEFAULT_REPEAT = 9
+# Diferenças absolutas abaixo destas são tratadas como ruído de medição
+MIN_SECONDS_DELTA = 0.05
+MIN_PEAK_DELTA_KIB = 256
+# Casos que criam subprocessos (stub_mmdc) ou dependem do sistema de arquivos (sync) oscilam bem mais
+MIN_SECONDS_DELTA_BY_CASE = {'diagram': 0.25, 'sync': 0.15}
+# Novas rodadas de medição de um caso que parece ter regredido no tempo, antes de acusar a regressão
+CONFIRM_ROUNDS = 2
+# Arquivos do repositório copiados pelo caso sync
+SYNC_FILES = ['figures', '.gitignore', '.gitattributes', 'LICENSE.txt', 'file_manifest.py', 'tree_walker.py']
+# Parâmetros da árvore sintética, além do número de projetos
+TREE_OPTIONS = dict(modules=3, functions=40, depth=6, cells=10, output_bytes=20000, sections=10)
+
+
+def quiet_report(tool):
+    """
+    RunReport sem mensagens por arquivo nem linha de progresso.
+    """
+    return RunReport(tool, interval=None)
+
+
+def case_sync(root, created, workdir):
+    manifest_path = os.path.join(workdir, 'sync.json')
+
+    def run():
+        copy_files_to_non_empty_dirs.copy_files_to_non_empty_dir(REPO_DIR, SYNC_FILES, [root], manifest_path,
+                                                                  report=quiet_report('sync'))
+    return run, len(created['projects'])
+
+
+def case_search(root, created, workdir):
+    def run():
+        for _ in find_files_with_keyword.search_files(root, ['valor_3', 'Classe'], jobs=2):
+            pass
+    return run, len(created['python'])
+
+
+def case_mermaid(root, created, workdir):
+    codes = []
+    for path in created['python']:
+        with open(path, 'r', encoding='utf-8') as file:
+            codes.append(file.read())
+
+    def run():
+        for code in codes:
+            convert_py_to_mmd_and_svg.generate_mermaid_from_ast(code, convert_py_to_mmd_and_svg.DEFAULT_MAX_NODES,
+                                                                convert_py_to_mmd_and_svg.DEFAULT_MAX_LABEL)
+    return run, len(codes)
+
+
+def case_diagram(root, created, workdir):
+    renderer = convert_py_to_mmd_and_svg.MmdcBatchRenderer(stub_mmdc.launcher_script(workdir))
+
+    def run():
+        failures = convert_py_to_mmd_and_svg.update_diagrams(created['python'], renderer, batch=True, root=root,
+                                                             report=quiet_report('diagram'))
+        if failures:
+            raise RuntimeError(f'{len(failures)} diagrama(s) não renderizado(s)')
+    return run, len(created['python'])
+
+
+def case_svg(root, created, workdir):
+    renderer = convert_py_to_mmd_and_svg.create_renderer('svg')
+
+    def run():
+        failures = convert_py_to_mmd_and_svg.update_diagrams(created['python'], renderer, root=root,
+                                                             report=quiet_report('diagram'))
+        if failures:
+            raise RuntimeError(f'{len(failures)} diagrama(s) não renderizado(s)')
+    return run, len(created['python'])
+
+
+def case_nb2md(root, created, workdir):
+    def run():
+        summary = convert_ipynb_to_md_and_py.convert_tree(root, use_manifest=False, report=quiet_report('nb2md'))
+        if summary['errors']:
+            raise RuntimeError(summary['errors'][0])
+    return run, len(created['notebooks'])
+
+
+def case_md2nb(root, created, workdir):
+    def run():
+        summary = convert_md_to_ipynb_and_py.convert_tree(root, use_manifest=False, report=quiet_report('md2nb'))
+        if summary['errors']:
+            raise RuntimeError(summary['errors'][0])
+    return run, len(created['markdown'])
+
+
+# Casos da suíte: nome -> função que prepara a execução e devolve (função medida, itens processados)
+CASES = {
+    'sync': case_sync,
+    'search': case_search,
+    'mermaid': case_mermaid,
+    'diagram': case_diagram,
+    'svg': case_svg,
+    'nb2md': case_nb2md,
+    'md2nb': case_md2nb,
+}
+
+
+def calibrate(rounds=1):
+    """
+    Mede uma carga fixa (JSON, hash e ast) que serve de unidade para os tempos.
+
+    :return: Lista com o tempo, em segundos, de cada rodada
+    """
+    code = 'def f(x):\n    if x:\n        return [i * 2 for i in range(x)]\n    return None\n' * 200
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        data = json.dumps([{'chave': index, 'valor': str(index) * 3} for index in range(20000)])
+        json.loads(data)
+        hashlib.sha256(data.encode('utf-8')).hexdigest()
+        ast.parse(code)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+class CaseRunner:
+    """
+    Executa um caso sobre cópias novas de uma árvore sintética.
+
+    :param case: Função do caso (um valor de CASES)
+    :param pristine: Árvore gerada, que nunca é alterada
+    :param created: Caminhos devolvidos por create_tree para a árvore original
+    :param workdir: Diretório temporário onde as cópias são feitas
+    """
+
+    def __init__(self, case, pristine, created, workdir):
+        self.case = case
+        self.pristine = pristine
+        self.created = created
+        self.workdir = workdir
+        self.items = None
+
+    def prepare(self, name):
+        root = os.path.join(self.workdir, f'run_{name}')
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.copytree(self.pristine, root, symlinks=True)
+        # Os caminhos gerados apontam para a árvore original; são remapeados para a cópia
+        paths = {kind: [os.path.join(root, os.path.relpath(path, self.pristine)) for path in paths]
+                 for kind, paths in self.created.items()}
+        run, self.items = self.case(root, paths, self.workdir)
+        return root, run
+
+    def sample_times(self, repeat):
+        """
+        Mede repeat execuções, cada uma precedida de uma rodada de calibração, de
+        modo que as duas listas acompanham as mesmas variações de velocidade da máquina.
+
+        :return: Tupla (tempos das execuções, tempos da calibração), em segundos
+        """
+        samples, calibration = [], []
+        for index in range(repeat):
+            calibration += calibrate(1)
+            root, run = self.prepare(index)
+            start = time.perf_counter()
+            run()
+            samples.append(time.perf_counter() - start)
+            shutil.rmtree(root)
+        return samples, calibration
+
+    def peak_memory(self):
+        """
+        :return: Pico de memória alocada pelo Python durante uma execução, em bytes
+        """
+        root, run = self.prepare('memory')
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        shutil.rmtree(root)
+        return peak
+
+
+def result_entry(items, samples, calibration, peak):
+    seconds = statistics.median(samples)
+    return {'items': items, 'seconds': round(seconds, 6), 'items_per_s': round(items / seconds, 3),
+            'peak_kib': round(peak / 1024, 1), 'calibration_s': round(statistics.median(calibration), 6)}
+
+
+def min_seconds_delta(key):
+    """
+    :return: Diferença absoluta de tempo abaixo da qual o caso key ('nome/tamanho') não acusa regressão
+    """
+    return MIN_SECONDS_DELTA_BY_CASE.get(key.split('/')[0], MIN_SECONDS_DELTA)
+
+
+def check(result, base, threshold, min_seconds=MIN_SECONDS_DELTA):
+    """
+    Compara um resultado com a linha de base.
+
+    O tempo da linha de base é escalado pela razão entre as calibrações medidas
+    junto com o caso, nesta execução e na linha de base.
+
+    :param min_seconds: Diferença absoluta de tempo tratada como ruído (veja min_seconds_delta)
+    :return: Tupla (variação do tempo, variação do pico, lista de problemas: 'tempo' e/ou 'memória')
+    """
+    # Tempo esperado nesta máquina, a partir da linha de base e da calibração
+    expected = base['seconds'] * result['calibration_s'] / base['calibration_s']
+    time_change = result['seconds'] / expected - 1
+    peak_change = result['peak_kib'] / base['peak_kib'] - 1 if base['peak_kib'] else 0.0
+    problems = []
+    if time_change > threshold and result['seconds'] - expected > min_seconds:
+        problems.append('tempo')
+    if peak_change > threshold and result['peak_kib'] - base['peak_kib'] > MIN_PEAK_DELTA_KIB:
+        problems.append('memória')
+    return time_change, peak_change, problems
+
+
+def run_suite(cases, sizes, repeat, baseline=None, threshold=DEFAULT_THRESHOLD):
+    """
+    Mede todos os casos em todos os tamanhos.
+
+    A calibração é medida intercalada com as execuções de cada caso (veja
+    CaseRunner.sample_times) e guardada no resultado do caso. Com uma linha de base, um caso que
+    parece ter regredido no tempo é medido de novo (até CONFIRM_ROUNDS vezes)
+    antes de a regressão ser aceita; a mediana passa a ser calculada sobre
+    todas as execuções do caso.
+
+    :return: Resultados no formato da linha de base
+    """
+    results = {'suite_version': SUITE_VERSION, 'python': platform.python_version(),
+               'calibration_s': None, 'tree': TREE_OPTIONS, 'results': {}}
+    calibration = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix='bench-suite-') as workdir:
+            pristine = os.path.join(workdir, 'pristine')
+            created = create_tree(pristine, projects=size, **TREE_OPTIONS)
+            for name in cases:
+                key = f'{name}/{size}'
+                runner = CaseRunner(CASES[name], pristine, created, workdir)
+                samples, case_calibration = runner.sample_times(repeat)
+                peak = runner.peak_memory()
+                base = baseline['results'].get(key) if baseline else None
+                for _ in range(CONFIRM_ROUNDS if base else 0):
+                    entry = result_entry(runner.items, samples, case_calibration, peak)
+                    if 'tempo' not in check(entry, base, threshold, min_seconds_delta(key))[2]:
+                        break
+                    more_samples, more_calibration = runner.sample_times(repeat)
+                    samples += more_samples
+                    case_calibration += more_calibration
+                calibration += case_calibration
+                result = results['results'][key] = result_entry(runner.items, samples, case_calibration, peak)
+                print(f"{key:>12}: {result['seconds']:8.3f} s  {result['items_per_s']:10.1f} itens/s  "
+                      f"pico {result['peak_kib']:10.1f} KiB", flush=True)
+    results['calibration_s'] = round(statistics.median(calibration), 6)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara os resultados com a linha de base.
+
+    :return: Lista de mensagens de regressão (vazia se não houver)
+    """
+    regressions = []
+    print(f"\nCalibração: {results['calibration_s'] * 1000:.1f} ms (linha de base: "
+          f"{baseline['calibration_s'] * 1000:.1f} ms)")
+    print(f"{'caso':>12}  {'tempo':>8}  {'memória':>8}")
+    for key, result in results['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            print(f'{key:>12}  {"novo":>8}')
+            continue
+        time_change, peak_change, status = check(result, base, threshold, min_seconds_delta(key))
+        print(f'{key:>12}  {time_change:+8.0%}  {peak_change:+8.0%}  {"❌ " + ", ".join(status) if status else "✅"}')
+        if status:
+            regressions.append(f'{key}: tempo {time_change:+.0%}, memória {peak_change:+.0%}')
+    return regressions
+
+
+def parse_list(value, convert=str):
+    return [convert(item.strip()) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', type=parse_list, default=list(CASES),
+                        help=f"casos separados por vírgula (padrão: {','.join(CASES)})")
+    parser.add_argument('--sizes', type=lambda value: parse_list(value, int), default=list(DEFAULT_SIZES),
+                        help=f"números de projetos separados por vírgula (padrão: {','.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='execuções por medida de tempo (vale a mediana)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='piora relativa tolerada (padrão: %(default)s)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='arquivo da linha de base')
+    parser.add_argument('--update-baseline', action='store_true', help='grava os resultados como nova linha de base')
+    parser.add_argument('--output', help='grava os resultados desta execução em JSON')
+    args = parser.parse_args()
+
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f"casos desconhecidos: {', '.join(sorted(unknown))}")
+
+    baseline = None
+    if not args.update_baseline:
+        if not os.path.exists(args.baseline):
+            sys.exit(f'Linha de base {args.baseline} não encontrada; use --update-baseline para criá-la.')
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline.get('suite_version') != SUITE_VERSION:
+            sys.exit(f'Linha de base {args.baseline} de outra versão da suíte; use --update-baseline para recriá-la.')
+
+    results = run_suite(args.cases, args.sizes, max(1, args.repeat), baseline, args.threshold)
+    text = json.dumps(results, indent=2, ensure_ascii=False) + '\n'
+    if args.output:
+        atomic_write(args.output, text)
+    if args.update_baseline:
+        atomic_write(args.baseline, text)
+        print(f'Linha de base gravada em {args.baseline}')
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        sys.exit(f'{len(regressions)} regressão(ões) acima de {args.threshold:.0%}:\n  ' + '\n  '.join(regressions))
+    print('Nenhuma regressão.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Compara a distribuição do template com cópias seriais e com o pool de threads.
+
+Cria um template e N diretórios de programa (com README) em um diretório
+temporário, ou em --workdir (por exemplo, um ponto de montagem de rede), e
+mede o tempo de copy_files_to_non_empty_dir com diferentes números de cópias
+simultâneas. Para comparar com o caminho original, --serial-shutil usa
+shutil.copy, sem cópia no kernel nem escrita atômica.
+
+Uso: python benchmarks/bench_template_copy.py --dirs 200 --workers 1 4 16
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy_files_to_non_empty_dirs as sync  # noqa: E402
+
+SOURCE_FILES = ['figures', '.gitignore', '.gitattributes', 'LICENSE.txt', 'data.bin']
+
+
+def create_template(template_dir, file_size):
+    os.makedirs(os.path.join(template_dir, 'figures'))
+    for index in range(5):
+        with open(os.path.join(template_dir, 'figures', f'figure_{index}.png'), 'wb') as f:
+            f.write(os.urandom(file_size))
+    for name in ('.gitignore', '.gitattributes', 'LICENSE.txt'):
+        with open(os.path.join(template_dir, name), 'w', encoding='utf-8') as f:
+            f.write(f'{name}\n' * 100)
+    with open(os.path.join(template_dir, 'data.bin'), 'wb') as f:
+        f.write(os.urandom(file_size))
+
+
+def create_targets(root, count):
+    for index in range(count):
+        program_dir = os.path.join(root, f'program_{index}')
+        os.makedirs(program_dir)
+        open(os.path.join(program_dir, 'README.md'), 'w').close()
+
+
+def run(workdir, dirs, file_size, workers):
+    template_dir = os.path.join(workdir, 'TEMPLATE')
+    target_root = os.path.join(workdir, 'targets')
+    create_template(template_dir, file_size)
+    create_targets(target_root, dirs)
+    start = time.perf_counter()
+    sync.copy_files_to_non_empty_dir(template_dir, SOURCE_FILES, [target_root], max_workers=workers)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--dirs', type=int, default=200)
+    parser.add_argument('--file-size', type=int, default=256 * 1024)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--workdir', default=None)
+    parser.add_argument('--serial-shutil', action='store_true',
+                        help='inclui uma execução serial com shutil.copy no lugar de fast_copy_file')
+    args = parser.parse_args()
+
+    total_bytes = args.dirs * args.file_size * 6
+    configurations = [(f'{workers} cópia(s)', workers, sync.fast_copy_file) for workers in args.workers]
+    if args.serial_shutil:
+        configurations.insert(0, ('serial shutil', 1, shutil.copy))
+
+    original_copy = sync.fast_copy_file
+    for name, workers, copy_function in configurations:
+        sync.fast_copy_file = copy_function
+        try:
+            with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+                with open(os.devnull, 'w') as devnull:
+                    stdout, sys.stdout = sys.stdout, devnull
+                    try:
+                        elapsed = run(workdir, args.dirs, args.file_size, workers)
+                    finally:
+                        sys.stdout = stdout
+        finally:
+            sync.fast_copy_file = original_copy
+        print(f'{name:>16}: {elapsed:8.2f} s  {total_bytes / elapsed / 2 ** 20:8.1f} MiB/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Substituto do mermaid-cli (mmdc) para os benchmarks, que rodam sem rede e sem navegador.
+
+Aceita a mesma linha de comando usada pelos renderizadores
+(-i ENTRADA -o SAIDA [--quiet]) e grava um SVG mínimo com o número de linhas
+do diagrama. Uma entrada .md gera SAIDA-1.svg, SAIDA-2.svg, ... (um por bloco
+```mermaid), como o mmdc faz no modo em lotes.
+
+Uso: python benchmarks/stub_mmdc.py -i diagrama.mmd -o diagrama.svg
+"""
+import argparse
+import os
+import sys
+
+SVG_TEMPLATE = '<svg xmlns="http://www.w3.org/2000/svg" data-lines="{lines}"><text>stub</text></svg>\n'
+
+
+def launcher_script(directory):
+    """
+    Cria em directory um executável 'mmdc' que chama este script com o interpretador atual.
+
+    :param directory: Diretório onde o executável é criado
+    :return: Caminho do executável, para ser passado aos renderizadores
+    """
+    path = os.path.join(directory, 'mmdc')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(f'#!/bin/sh\nexec "{sys.executable}" "{os.path.abspath(__file__)}" "$@"\n')
+    os.chmod(path, 0o755)
+    return path
+
+
+def write_svg(path, source):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(SVG_TEMPLATE.format(lines=source.count('\n') + 1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-i', '--input', required=True)
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('-q', '--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r', encoding='utf-8') as file:
+        source = file.read()
+    if not args.input.endswith('.md'):
+        write_svg(args.output, source)
+        return 0
+    stem, extension = os.path.splitext(args.output)
+    blocks = source.split('```mermaid\n')[1:]
+    for index, block in enumerate(blocks, start=1):
+        write_svg(f'{stem}-{index}{extension}', block.split('\n```', 1)[0])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
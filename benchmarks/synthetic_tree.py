@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Gera árvores sintéticas de projetos para os benchmarks.
+
+Cada projeto tem um README.ipynb com saídas grandes (texto e imagem), um
+Markdown (src/guia.md) com blocos de código, módulos Python grandes e profundamente
+aninhados e, em parte dos projetos, uma pasta .git. Também são criadas pastas
+aninhadas que não são projetos, para exercitar a poda das varreduras. O
+conteúdo é determinístico (gerado a partir de uma semente).
+
+Uso: python benchmarks/synthetic_tree.py DESTINO --projects 20 --functions 40 --depth 6
+"""
+import argparse
+import base64
+import os
+import random
+
+# Blocos de controle usados para aninhar o corpo das funções
+BLOCKS = (
+    'if {var} > {n}:',
+    'for item_{level} in range({n}):',
+    'while {var} < {n}:',
+    'try:',
+    'with open(__file__) as handle_{level}:',
+)
+
+
+def python_module(rng, functions, depth):
+    """
+    Monta o código de um módulo com funções e classes de corpo aninhado.
+
+    :param rng: random.Random usado para variar as estruturas
+    :param functions: Número de funções (uma em cada quatro vira método de uma classe)
+    :param depth: Profundidade máxima de blocos aninhados
+    :return: Código Python
+    """
+    lines = ['# -*- coding: utf-8 -*-', '"""Módulo gerado para benchmarks."""', 'import os', '']
+
+    def body(indent, level):
+        pad = ' ' * indent
+        lines.append(f'{pad}valor_{level} = {rng.randint(0, 100)}')
+        lines.append(f'{pad}print("nível {level}", valor_{level})')
+        if level < depth:
+            block = rng.choice(BLOCKS).format(var=f'valor_{level}', n=rng.randint(1, 50), level=level)
+            lines.append(pad + block)
+            body(indent + 4, level + 1)
+            if block == 'try:':
+                lines.append(f'{pad}except ValueError:')
+                lines.append(f'{pad}    pass')
+            elif block.startswith('if'):
+                lines.append(f'{pad}else:')
+                lines.append(f'{pad}    valor_{level} = os.getpid()')
+            elif block.startswith('while'):
+                lines.append(f'{pad}    break')
+        lines.append(f'{pad}return valor_{level}')
+
+    for index in range(functions):
+        if index % 4 == 3:
+            lines += [f'class Classe{index}:', f'    """Classe {index}."""', '']
+            lines.append(f'    def metodo_{index}(self, entrada):')
+            lines.append(f'        """Método {index}."""')
+            body(8, 0)
+        else:
+            lines.append(f'def funcao_{index}(entrada):')
+            lines.append(f'    """Função {index}."""')
+            body(4, 0)
+        lines.append('')
+    lines += ['', "if __name__ == '__main__':", '    funcao_0(1)', '']
+    return '\n'.join(lines)
+
+
+def markdown_document(rng, sections):
+    """
+    Monta um Markdown com títulos, texto e blocos de código Python.
+    """
+    parts = ['# Documento gerado', '']
+    for index in range(sections):
+        parts += [f'## Seção {index}', '', 'Texto com *ênfase*, `código` e uma lista:', '', '- item a', '- item b', '']
+        parts += ['```python', f'valores = list(range({rng.randint(1, 100)}))', 'print(sum(valores))', '```', '']
+    return '\n'.join(parts)
+
+
+def write_notebook(path, rng, cells, output_bytes):
+    """
+    Grava um notebook com células de código que têm saídas grandes.
+
+    :param path: Caminho do .ipynb
+    :param rng: random.Random usado para gerar o conteúdo
+    :param cells: Número de pares de células (markdown + código)
+    :param output_bytes: Tamanho aproximado de cada saída (texto e imagem)
+    """
+    import nbformat
+    notebook = nbformat.v4.new_notebook()
+    size = max(1, output_bytes * 3 // 4)
+    image = base64.b64encode(rng.getrandbits(size * 8).to_bytes(size, 'little')).decode('ascii')
+    line = 'resultado ' * 8 + '\n'
+    text = line * max(1, output_bytes // len(line))
+    for index in range(cells):
+        notebook.cells.append(nbformat.v4.new_markdown_cell(f'## Célula {index}\n\nTexto *explicativo*.'))
+        outputs = [nbformat.v4.new_output('stream', name='stdout', text=text)]
+        if index % 2 == 0:
+            outputs.append(nbformat.v4.new_output('display_data', data={'image/png': image, 'text/plain': '<Figure>'}))
+        notebook.cells.append(nbformat.v4.new_code_cell(f'print({index})', execution_count=index + 1,
+                                                        outputs=outputs))
+    with open(path, 'w', encoding='utf-8') as file:
+        nbformat.write(notebook, file)
+
+
+def create_tree(root, projects=10, modules=3, functions=40, depth=6, cells=10, output_bytes=20000,
+                sections=10, seed=0):
+    """
+    Cria uma árvore sintética de projetos em root.
+
+    :param root: Diretório de destino (criado se não existir)
+    :param projects: Número de pastas de projeto
+    :param modules: Módulos Python por projeto
+    :param functions: Funções por módulo
+    :param depth: Profundidade de aninhamento do corpo das funções
+    :param cells: Pares de células por notebook
+    :param output_bytes: Tamanho aproximado de cada saída dos notebooks
+    :param sections: Seções por Markdown
+    :param seed: Semente do gerador
+    :return: Dicionário com as listas de caminhos criados: projects, python, notebooks e markdown
+    """
+    rng = random.Random(seed)
+    created = {'projects': [], 'python': [], 'notebooks': [], 'markdown': []}
+    for index in range(projects):
+        # Projetos agrupados em categorias, como nas raízes reais (android, debian, ...)
+        project = os.path.join(root, f'categoria_{index % 4}', f'projeto_{index}')
+        os.makedirs(os.path.join(project, 'src'), exist_ok=True)
+        created['projects'].append(project)
+        if index % 2:
+            os.makedirs(os.path.join(project, '.git'), exist_ok=True)
+            with open(os.path.join(project, '.git', 'HEAD'), 'w', encoding='utf-8') as file:
+                file.write('ref: refs/heads/main\n')
+
+        notebook_path = os.path.join(project, 'README.ipynb')
+        write_notebook(notebook_path, rng, cells, output_bytes)
+        created['notebooks'].append(notebook_path)
+
+        markdown_path = os.path.join(project, 'src', 'guia.md')
+        with open(markdown_path, 'w', encoding='utf-8') as file:
+            file.write(markdown_document(rng, sections))
+        created['markdown'].append(markdown_path)
+
+        for module in range(modules):
+            module_path = os.path.join(project, 'src', f'modulo_{module}.py')
+            with open(module_path, 'w', encoding='utf-8') as file:
+                file.write(python_module(rng, functions, depth))
+            created['python'].append(module_path)
+
+        # Pasta aninhada que não é projeto (sem README nem .git)
+        nested = os.path.join(project, 'dados', *[f'nivel_{level}' for level in range(depth)])
+        os.makedirs(nested, exist_ok=True)
+        with open(os.path.join(nested, 'dados.txt'), 'w', encoding='utf-8') as file:
+            file.write('dados\n' * 100)
+    return created
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('root', help='diretório de destino')
+    parser.add_argument('--projects', type=int, default=10)
+    parser.add_argument('--modules', type=int, default=3)
+    parser.add_argument('--functions', type=int, default=40)
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--cells', type=int, default=10)
+    parser.add_argument('--output-bytes', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    created = create_tree(args.root, args.projects, args.modules, args.functions, args.depth, args.cells,
+                          args.output_bytes, seed=args.seed)
+    print(', '.join(f'{len(paths)} {name}' for name, paths in created.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de build no estilo make para a cadeia .md -> .ipynb -> .py -> .py.mmd -> .py.svg.
+
+Cada conversão é uma regra que declara, para um arquivo de origem, as saídas
+que produz. Com todas as regras, o motor monta um grafo de tarefas (a saída
+de uma tarefa pode ser a origem de outra), detecta ciclos e saídas
+declaradas por mais de uma tarefa e executa em paralelo as tarefas
+independentes, em ordem topológica.
+
+O estado (.build_docs.json) guarda o hash do conteúdo de origens e saídas de
+cada tarefa. Uma tarefa só é executada se a origem mudou ou se alguma saída
+sumiu ou foi alterada; como as saídas só são regravadas quando o conteúdo
+muda, uma origem editada sem efeito nas saídas não propaga o rebuild para
+as tarefas seguintes.
+
+Regras, em ordem de prioridade:
+
+- notebook: README.ipynb -> README.md, README.py
+- markdown: X.md -> X.ipynb, X.py
+- diagram:  X.py -> X.py.mmd, X.py.svg (e os subdiagramas X.py.<função>.mmd/.svg)
+
+Em um ciclo (por exemplo, README.ipynb -> README.md -> README.ipynb), a
+tarefa da regra de menor prioridade é descartada e o ciclo é informado. Uma
+saída declarada por duas tarefas fica com a regra de maior prioridade.
+
+Uso: python build_docs.py [--jobs 4] [--dry-run] [--force] [--no-diagrams]
+"""
+import argparse
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from file_manifest import Manifest
+from run_report import RunReport, add_arguments, report_stdout
+from tree_walker import walk_tree
+
+# Estado dos builds, gravado na raiz
+STATE_NAME = '.build_docs.json'
+# Incrementar quando o formato do estado ou as regras mudarem
+ENGINE_VERSION = '1'
+
+
+def run_notebook(source):
+    """
+    Ação da regra notebook: README.ipynb -> .md e .py.
+    """
+    import convert_ipynb_to_md_and_py
+    output_filenames, _ = convert_ipynb_to_md_and_py.write_outputs(source)
+    return output_filenames
+
+
+def run_markdown(source, emit=('ipynb', 'py')):
+    """
+    Ação da regra markdown: .md -> .ipynb e/ou .py.
+    """
+    import convert_md_to_ipynb_and_py
+    return convert_md_to_ipynb_and_py.convert_md(source, emit)
+
+
+def run_diagram(source, mmdc='mmdc', renderer='mmdc'):
+    """
+    Ação da regra diagram: .py -> .py.mmd e .py.svg.
+    """
+    import convert_py_to_mmd_and_svg
+    if renderer == 'svg':
+        # O svg_flowchart desenha os SVGs direto dos grafos, sem reler os .mmd
+        jobs = convert_py_to_mmd_and_svg.write_mermaid_file(source, render_svg=True)
+        return [path for job in jobs for path in job]
+    jobs = convert_py_to_mmd_and_svg.write_mermaid_file(source)
+    # Sem mensagens por diagrama: o resultado da tarefa é relatado por execute
+    failures = convert_py_to_mmd_and_svg.render_diagrams(jobs,
+                                                         convert_py_to_mmd_and_svg.create_renderer(renderer, mmdc),
+                                                         RunReport('diagram', interval=None))
+    if failures:
+        raise RuntimeError(f'{len(failures)} diagrama(s) não renderizado(s)')
+    return [path for job in jobs for path in job]
+
+
+class Rule:
+    """
+    Transformação de um tipo de arquivo em outros.
+
+    :param name: Nome da regra
+    :param matches: Função que recebe um caminho e diz se ele é origem desta regra
+    :param outputs: Função que recebe a origem e devolve as saídas declaradas
+    :param action: Função de nível de módulo (action(origem, *args)) que devolve as saídas realmente gravadas
+    :param args: Argumentos extras da ação
+    :param overlaps: Função opcional que devolve arquivos que, se existirem, sobrepõem as saídas
+    """
+
+    def __init__(self, name, matches, outputs, action, args=(), overlaps=None):
+        self.name = name
+        self.matches = matches
+        self.outputs = outputs
+        self.action = action
+        self.args = tuple(args)
+        self.overlaps = overlaps
+
+
+class Task:
+    """
+    Aplicação de uma regra a uma origem.
+    """
+    __slots__ = ('rule', 'priority', 'source', 'outputs', 'deps', 'dependents')
+
+    def __init__(self, rule, priority, source):
+        self.rule = rule
+        self.priority = priority
+        self.source = source
+        self.outputs = [os.path.normpath(path) for path in rule.outputs(source)]
+        self.deps = set()
+        self.dependents = set()
+
+    @property
+    def key(self):
+        return f'{self.rule.name}:{self.source}'
+
+    def __repr__(self):
+        return f'<Task {self.key}>'
+
+
+def default_rules(emit=('ipynb', 'py'), diagrams=True, mmdc='mmdc', renderer='mmdc'):
+    """
+    Regras dos conversores do projeto, em ordem de prioridade.
+    """
+    rules = [
+        Rule('notebook',
+             lambda path: os.path.basename(path) == 'README.ipynb',
+             lambda path: [path[:-len('.ipynb')] + suffix for suffix in ('.md', '.py')],
+             run_notebook),
+        Rule('markdown',
+             lambda path: path.endswith('.md'),
+             lambda path: [path[:-len('.md')] + '.' + name for name in emit],
+             run_markdown, (emit,)),
+    ]
+    if diagrams:
+        rules.append(Rule('diagram',
+                          lambda path: path.endswith('.py'),
+                          lambda path: [path + '.mmd', path + '.svg'],
+                          run_diagram, (mmdc, renderer),
+                          # Nomenclatura antiga (docs/convert_py_to_mmd_and_svg.py): X.mmd e X.svg
+                          overlaps=lambda path: [path[:-len('.py')] + '.mmd', path[:-len('.py')] + '.svg']))
+    return rules
+
+
+class BuildGraph:
+    """
+    Grafo de tarefas montado a partir das regras e dos arquivos da árvore.
+
+    :param root: Diretório raiz
+    :param rules: Lista de Rule, em ordem de prioridade
+    """
+
+    def __init__(self, root, rules):
+        self.root = root
+        self.rules = rules
+        self.tasks = []
+        self.problems = []
+        self._build()
+
+    def _build(self):
+        files = set()
+        for listing in walk_tree(self.root):
+            files.update(os.path.normpath(entry.path) for entry in listing.files)
+
+        # Saídas declaradas também são origens possíveis, para que a cadeia exista mesmo antes do primeiro build
+        pending = sorted(files)
+        known = set(files)
+        while pending:
+            path = pending.pop()
+            for priority, rule in enumerate(self.rules):
+                if rule.matches(path):
+                    task = Task(rule, priority, path)
+                    self.tasks.append(task)
+                    for output in task.outputs:
+                        if output not in known:
+                            known.add(output)
+                            pending.append(output)
+
+        self._link()
+        self._break_cycles()
+        self._resolve_collisions()
+        self._find_overlaps(files)
+
+    def _link(self):
+        by_output = {}
+        for task in self.tasks:
+            task.deps, task.dependents = set(), set()
+            for output in task.outputs:
+                by_output.setdefault(output, []).append(task)
+        for task in self.tasks:
+            for producer in by_output.get(task.source, []):
+                if producer is not task:
+                    task.deps.add(producer)
+                    producer.dependents.add(task)
+        self.by_output = by_output
+
+    def _find_cycle(self):
+        """
+        Procura um ciclo com busca em profundidade iterativa.
+
+        :return: Lista de tarefas do ciclo, ou None
+        """
+        state = {}
+        for start in sorted(self.tasks, key=lambda task: task.key):
+            if start in state:
+                continue
+            state[start] = 'open'
+            stack = [(start, iter(sorted(start.dependents, key=lambda task: task.key)))]
+            while stack:
+                task, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    state[task] = 'done'
+                    stack.pop()
+                elif state.get(child) == 'open':
+                    path = [item for item, _ in stack]
+                    return path[path.index(child):]
+                elif child not in state:
+                    state[child] = 'open'
+                    stack.append((child, iter(sorted(child.dependents, key=lambda task: task.key))))
+        return None
+
+    def _drop(self, task):
+        self.tasks.remove(task)
+        self._link()
+
+    def _break_cycles(self):
+        while True:
+            cycle = self._find_cycle()
+            if cycle is None:
+                return
+            victim = max(cycle, key=lambda task: (task.priority, task.key))
+            chain = ' -> '.join(task.source for task in cycle + cycle[:1])
+            self.problems.append(f'ciclo {chain}: {victim.key} descartada')
+            self._drop(victim)
+
+    def _resolve_collisions(self):
+        for output, producers in sorted(self.by_output.items()):
+            producers = [task for task in producers if task in self.tasks]
+            if len(producers) < 2:
+                continue
+            producers.sort(key=lambda task: (task.priority, task.key))
+            for task in producers[1:]:
+                self.problems.append(f'{output} é saída de {producers[0].key} e de {task.key}: {task.key} descartada')
+                self._drop(task)
+
+    def _find_overlaps(self, files):
+        outputs = set(self.by_output)
+        for task in self.tasks:
+            if task.rule.overlaps is None:
+                continue
+            for path in task.rule.overlaps(task.source):
+                path = os.path.normpath(path)
+                if path in files and path not in outputs:
+                    self.problems.append(f'{path} sobrepõe as saídas de {task.key} (gerado por outra ferramenta?)')
+
+
+class BuildState:
+    """
+    Hashes das origens e saídas de cada tarefa no último build bem-sucedido.
+
+    :param path: Caminho do arquivo de estado
+    :param version: Versão das regras (muda quando a configuração muda)
+    """
+
+    def __init__(self, path, version):
+        self.manifest = Manifest(path, version)
+
+    def digest(self, path):
+        """
+        Hash do conteúdo, recalculado apenas quando tamanho ou mtime mudam.
+        """
+        key = 'file:' + path
+        _, current = self.manifest.lookup(key, path)
+        if current != self.manifest.get(key):
+            self.manifest.set(key, current)
+        return current['sha256']
+
+    def is_up_to_date(self, task):
+        record = self.manifest.get('task:' + task.key)
+        if record is None or self.manifest.stale:
+            return False
+        try:
+            if record['inputs'].get(task.source) != self.digest(task.source):
+                return False
+            return all(self.digest(path) == digest for path, digest in record['outputs'].items())
+        except OSError:
+            return False
+
+    def record(self, task, outputs):
+        """
+        Registra o build de uma tarefa e remove saídas antigas que deixaram de ser geradas.
+        """
+        key = 'task:' + task.key
+        previous = (self.manifest.get(key) or {}).get('outputs', {})
+        outputs = [os.path.normpath(path) for path in outputs]
+        for path, digest in previous.items():
+            if path not in outputs and os.path.exists(path) and self.digest(path) == digest:
+                os.remove(path)
+                print(f'🗑️ Removido: {path}')
+        self.manifest.set(key, {'inputs': {task.source: self.digest(task.source)},
+                                'outputs': {path: self.digest(path) for path in outputs if os.path.exists(path)}})
+
+    def forget_missing(self, tasks):
+        keys = {'task:' + task.key for task in tasks}
+        for key in [key for key in self.manifest.entries if key not in keys]:
+            if key.startswith('task:') or not os.path.exists(key[len('file:'):]):
+                self.manifest.remove(key)
+
+    def save(self):
+        self.manifest.save()
+
+
+def _run_task(action, source, args):
+    """
+    Executa a ação de uma tarefa (em um processo do pool), devolvendo o erro em vez de levantá-lo.
+
+    :return: Tupla (saídas ou None, mensagem de erro ou None, duração em segundos)
+    """
+    start = time.perf_counter()
+    try:
+        return action(source, *args), None, time.perf_counter() - start
+    except Exception as e:
+        return None, f'{type(e).__name__}: {e}', time.perf_counter() - start
+
+
+def execute(graph, state, jobs=1, force=False, dry_run=False, report=None):
+    """
+    Executa as tarefas desatualizadas, em paralelo quando as dependências permitem.
+
+    :param graph: BuildGraph
+    :param state: BuildState
+    :param jobs: Número de processos (1 executa no processo atual)
+    :param force: Se True, executa todas as tarefas
+    :param dry_run: Se True, apenas lista as tarefas que seriam executadas
+    :param report: RunReport que recebe o tempo de cada regra, contadores e mensagens (padrão: uma mensagem por tarefa)
+    :return: Dicionário com o resumo: built, up_to_date, failed (lista de (tarefa, erro)) e skipped
+    """
+    if report is None:
+        report = RunReport('build', verbose=True, stream=sys.stdout)
+    summary = {'built': 0, 'up_to_date': 0, 'failed': [], 'skipped': 0}
+    remaining = {task: len(task.deps) for task in graph.tasks}
+    ready = sorted((task for task, count in remaining.items() if count == 0), key=lambda task: task.key)
+    broken = set()
+    rebuilt = set()
+    in_flight = {}
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 and not dry_run else None
+
+    def finish(task):
+        for dependent in task.dependents:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+
+    def complete(task, outputs, error, seconds):
+        # Cada regra é um estágio do relatório (notebook, markdown, diagram)
+        report.add_time(task.rule.name, seconds)
+        if error is not None:
+            report.file('failed')
+            report.error(f'❌ {task.key}: {error}')
+            summary['failed'].append((task.key, error))
+            broken.add(task)
+        else:
+            state.record(task, outputs)
+            summary['built'] += 1
+            report.file('changed')
+            report.log(f'✅ {task.key} -> {", ".join(outputs) or "(nenhuma saída)"}')
+        finish(task)
+
+    try:
+        while ready or in_flight:
+            while ready:
+                task = ready.pop(0)
+                report.file('seen')
+                if task.deps & broken or not os.path.exists(task.source) and not dry_run:
+                    # Dependência falhou ou a origem não foi gerada
+                    summary['skipped'] += 1
+                    report.count('blocked')
+                    broken.add(task)
+                    finish(task)
+                    continue
+                with report.stage('hash'):
+                    up_to_date = not force and not (dry_run and task.deps & rebuilt) \
+                        and os.path.exists(task.source) and state.is_up_to_date(task)
+                if up_to_date:
+                    summary['up_to_date'] += 1
+                    report.file('skipped')
+                    finish(task)
+                    continue
+                if dry_run:
+                    print(f'🔨 {task.key} -> {", ".join(task.outputs)}')
+                    rebuilt.add(task)
+                    summary['built'] += 1
+                    finish(task)
+                elif pool is None:
+                    complete(task, *_run_task(task.rule.action, task.source, task.rule.args))
+                else:
+                    in_flight[pool.submit(_run_task, task.rule.action, task.source, task.rule.args)] = task
+            if in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    complete(in_flight.pop(future), *future.result())
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reconstrói notebooks, Markdown e fluxogramas desatualizados.')
+    parser.add_argument('root', nargs='?', default='.', help='diretório raiz (padrão: o atual)')
+    parser.add_argument('--jobs', type=int, default=1, help='processos em paralelo (0 = número de CPUs)')
+    parser.add_argument('--force', action='store_true', help='executa todas as tarefas')
+    parser.add_argument('--dry-run', action='store_true', help='apenas lista as tarefas que seriam executadas')
+    parser.add_argument('--emit', default='ipynb,py', help="saídas da regra markdown (padrão: 'ipynb,py')")
+    parser.add_argument('--no-diagrams', action='store_true', help='não inclui a regra diagram')
+    parser.add_argument('--renderer', choices=('mmdc', 'svg'), default='mmdc',
+                        help='gera os SVGs com o mermaid-cli (mmdc) ou com o renderizador em Python puro (svg)')
+    parser.add_argument('--mmdc', default='mmdc', help='comando do mermaid-cli')
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    report = RunReport('build', verbose=args.verbose)
+    with report_stdout(args.report):
+
+        emit = tuple(name for name in ('ipynb', 'py') if name in args.emit.split(','))
+        diagrams = not args.no_diagrams
+        if diagrams and args.renderer == 'mmdc' and shutil.which(args.mmdc) is None:
+            print(f'⚠️ {args.mmdc} não encontrado; regra diagram desativada '
+                  '(use --renderer svg para dispensá-lo).')
+            diagrams = False
+
+        rules = default_rules(emit, diagrams, args.mmdc, args.renderer)
+        with report.stage('walk'):
+            graph = BuildGraph(args.root, rules)
+        for problem in graph.problems:
+            print(f'⚠️ {problem}')
+
+        version = f'{ENGINE_VERSION}/{",".join(rule.name for rule in rules)}/{",".join(emit)}'
+        if diagrams and args.renderer != 'mmdc':
+            # Trocar de renderizador refaz os SVGs
+            version += f'/{args.renderer}'
+        state = BuildState(os.path.join(args.root, STATE_NAME), version)
+        try:
+            summary = execute(graph, state, args.jobs or os.cpu_count() or 1, args.force, args.dry_run, report)
+            if not args.dry_run:
+                state.forget_missing(graph.tasks)
+        finally:
+            if not args.dry_run:
+                state.save()
+            report.finish(args.report)
+
+        verb = 'a executar' if args.dry_run else 'executada(s)'
+        print(f"Resumo: {summary['built']} tarefa(s) {verb}, {summary['up_to_date']} atualizada(s), "
+              f"{len(summary['failed'])} com erro, {summary['skipped']} pulada(s)")
+        return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
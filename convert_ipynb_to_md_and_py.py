@@ -19,66 +19,231 @@
 # 
 # Para executar o código fornecido em todos os arquivos `README.ipynb` na pasta raiz e subpastas, você precisará realizar executar o código abaixo. Uma abordagem eficaz é usar o módulo `os` do Python para percorrer todos os diretórios e subdiretórios, encontrando arquivos que correspondam ao nome `README.ipynb`. A seguir, apresento um exemplo de como você pode fazer isso:
 # 
-# Esse código utiliza `os.walk()` para percorrer todos os diretórios e subdiretórios da pasta atual (indicada por '.'). Ele verifica se algum dos arquivos nos diretórios é um `README.ipynb` e, em seguida, realiza o processo de conversão para Markdown, como especificado no seu código original. O caminho completo do arquivo é usado para garantir que o arquivo correto seja convertido, independente de onde ele esteja na estrutura de pastas.
+# Esse código utiliza `walk_tree()` (do módulo `tree_walker`, baseado em `os.scandir()`) para percorrer todos os diretórios e subdiretórios da pasta atual (indicada por '.'), sem descer em `.git`, `node_modules`, ambientes virtuais e caminhos listados no `.gitignore`. Ele verifica se algum dos arquivos nos diretórios é um `README.ipynb` e, em seguida, realiza o processo de conversão para Markdown, como especificado no seu código original. O caminho completo do arquivo é usado para garantir que o arquivo correto seja convertido, independente de onde ele esteja na estrutura de pastas.
 
 # %%
 # ! pip install nbconvert
 
 # %%
+import argparse
 import os
-from nbconvert import MarkdownExporter, PythonExporter
-import nbformat
+import sys
+from file_manifest import Manifest, output_state, write_if_changed
+from notebook_export import export_notebook, map_bounded, read_notebook
+from run_report import RunReport, add_arguments, report_stdout, timed
+from tree_walker import walk_tree
 
 # Definindo o nome do arquivo que deve ser excluído das subpastas
 excluded_file = 'convert_ipynb_to_md.ipynb'
 
-# Obtendo o caminho absoluto da pasta raiz
-root_path = os.path.abspath('.')
-
-# Percorrendo todos os diretórios e subdiretórios a partir da pasta atual
-for dirpath, dirnames, filenames in os.walk('.'):
-    for filename in filenames:
-        # Construindo o caminho completo do arquivo
-        full_path = os.path.join(dirpath, filename)
-
-        if filename == 'README.ipynb':
-            try:
-                # Tentando ler o arquivo .ipynb para verificar se é um JSON válido
-                with open(full_path, 'r') as file:
-                    nbformat.read(file, as_version=4)
-
-                # Criando um objeto MarkdownExporter
-                markdown_exporter = MarkdownExporter()
-                # Criando um objeto PythonExporter
-                python_exporter = PythonExporter()
-
-                # Exportando o arquivo .ipynb para código Markdown
-                markdown_code, _ = markdown_exporter.from_filename(full_path)
-                # Exportando o arquivo .ipynb para código Python
-                python_code, _ = python_exporter.from_filename(full_path)
-
-                # Definindo o nome do arquivo de saída .md
-                markdown_output_filename = full_path.replace('.ipynb', '.md')
-                # Definindo o nome do arquivo de saída .py
-                python_output_filename = full_path.replace('.ipynb', '.py')
-
-                # Escrevendo o código Markdown no arquivo de saída
-                with open(markdown_output_filename, 'w') as file:
-                    file.write(markdown_code)
-                # Escrevendo o código Python no arquivo de saída
-                with open(python_output_filename, 'w') as file:
-                    file.write(python_code)
-
-                print(f'{full_path} was successfully converted to {markdown_output_filename} and {python_output_filename}')
-
-            except nbformat.reader.NotJSONError as e:
-                print(f'Error processing {full_path}: File is not valid JSON - {e}')
-
-        # Verificando se o arquivo é o que deve ser excluído e se não está na pasta raiz
-        elif filename == excluded_file and os.path.abspath(dirpath) != root_path:
-            # Excluindo o arquivo
-            os.remove(full_path)
-            print(f'Deleted file: {full_path}')
+# Formatos gerados a partir de cada README.ipynb (os exportadores são criados uma vez e reutilizados)
+output_suffixes = ('.md', '.py')
+
+# Manifesto com o estado dos notebooks já convertidos, gravado na pasta raiz
+MANIFEST_NAME = '.convert_ipynb_to_md_and_py.json'
+# Incrementar quando a conversão mudar a ponto de exigir que todas as saídas sejam refeitas
+CONVERTER_VERSION = '1'
+
+
+def converter_version():
+    """
+    Identifica a versão da conversão (deste script e do nbconvert) gravada no manifesto.
+    """
+    from importlib.metadata import version
+    return f'{CONVERTER_VERSION}/nbconvert-{version("nbconvert")}'
+
+
+def write_outputs(full_path, times=None):
+    """
+    Lê um README.ipynb e grava os arquivos .md e .py correspondentes.
+
+    :param full_path: Caminho do notebook
+    :param times: Dicionário de tempos por estágio (parse, export, write), ou None para não medir
+    :return: Tupla (arquivos de saída, arquivos reescritos)
+    """
+    # Lendo o arquivo .ipynb uma única vez (a leitura também verifica se é um JSON válido)
+    with timed(times, 'parse'):
+        notebook = read_notebook(full_path)
+
+    # Exportando o mesmo notebook em memória para Markdown e Python
+    with timed(times, 'export'):
+        exported = export_notebook(notebook, full_path, output_suffixes)
+
+    output_filenames, written = [], []
+    with timed(times, 'write'):
+        for suffix, code in exported.items():
+            # Definindo o nome do arquivo de saída (.md ou .py)
+            output_filename = full_path.replace('.ipynb', suffix)
+            # Escrevendo o código no arquivo de saída, somente se o conteúdo mudou
+            if write_if_changed(output_filename, code):
+                written.append(output_filename)
+            output_filenames.append(output_filename)
+    return output_filenames, written
+
+
+def convert_job(full_path):
+    """
+    Executa write_outputs em um processo do pool, devolvendo o erro em vez de levantá-lo.
+
+    :param full_path: Caminho do notebook
+    :return: Tupla (full_path, resultado de write_outputs ou None, mensagem de erro ou None, tempos por estágio)
+    """
+    import nbformat
+    times = {}
+    try:
+        return full_path, write_outputs(full_path, times), None, times
+    except nbformat.reader.NotJSONError as e:
+        return full_path, None, f'File is not valid JSON - {e}', times
+    except Exception as e:
+        return full_path, None, f'{type(e).__name__}: {e}', times
+
+
+def convert_notebook(full_path, manifest=None, force=False):
+    """
+    Converte um README.ipynb para .md e .py, se as saídas estiverem desatualizadas.
+
+    :param full_path: Caminho do notebook
+    :param manifest: Manifest com o estado das conversões anteriores (None desativa a verificação)
+    :param force: Se True, converte mesmo que as saídas estejam atualizadas
+    :return: Tupla (arquivos de saída, arquivos reescritos), ou None se o notebook não mudou
+    """
+    key = os.path.normpath(full_path)
+    if manifest is not None:
+        unchanged, current = manifest.lookup(key, full_path)
+        if unchanged and not force and manifest.outputs_unchanged(key):
+            return None
+    result = write_outputs(full_path)
+    if manifest is not None:
+        record_outputs(manifest, full_path, current, result[0])
+    return result
+
+
+def record_outputs(manifest, full_path, current, output_filenames):
+    """
+    Registra no manifesto o estado do notebook e das saídas geradas.
+    """
+    current['outputs'] = {os.path.normpath(path): output_state(path) for path in output_filenames}
+    manifest.set(os.path.normpath(full_path), current)
+
+
+def convert_tree(root='.', force=False, use_manifest=True, jobs=1, max_in_flight=None, report=None):
+    """
+    Converte todos os README.ipynb a partir de root e exclui as cópias de excluded_file nas subpastas.
+
+    :param root: Pasta raiz
+    :param force: Se True, reconverte todos os notebooks
+    :param use_manifest: Se False, não lê nem grava o manifesto
+    :param jobs: Número de processos de conversão (1 converte no processo atual)
+    :param max_in_flight: Máximo de notebooks em conversão ao mesmo tempo (padrão: 2 * jobs)
+    :param report: RunReport que recebe tempos, contadores e mensagens (padrão: um novo, com uma mensagem por arquivo)
+    :return: Dicionário com o resumo: converted, unchanged, up_to_date e errors (lista de (caminho, erro))
+    """
+    if report is None:
+        report = RunReport('nb2md', verbose=True, stream=sys.stdout)
+    # Obtendo o caminho absoluto da pasta raiz
+    root_path = os.path.abspath(root)
+    manifest = Manifest(os.path.join(root, MANIFEST_NAME), converter_version()) if use_manifest else None
+    summary = {'converted': 0, 'unchanged': 0, 'up_to_date': 0, 'errors': []}
+    seen = set()
+    pending = {}
+
+    def stale_notebooks():
+        # Percorrendo todos os diretórios e subdiretórios a partir da pasta raiz
+        for listing in walk_tree(root):
+            for entry in listing.files:
+                filename = entry.name
+                # Construindo o caminho completo do arquivo
+                full_path = entry.path
+
+                if filename == 'README.ipynb':
+                    key = os.path.normpath(full_path)
+                    seen.add(key)
+                    report.file('seen')
+                    current = None
+                    if manifest is not None:
+                        unchanged, current = manifest.lookup(key, full_path)
+                        if unchanged and not force and manifest.outputs_unchanged(key):
+                            summary['up_to_date'] += 1
+                            report.file('skipped')
+                            continue
+                    pending[full_path] = current
+                    yield full_path
+
+                # Verificando se o arquivo é o que deve ser excluído e se não está na pasta raiz
+                elif filename == excluded_file and os.path.abspath(listing.path) != root_path:
+                    # Excluindo o arquivo
+                    os.remove(full_path)
+                    report.count('deleted')
+                    report.log(f'Deleted file: {full_path}')
+
+    try:
+        results = map_bounded(convert_job, report.iter_stage('walk', stale_notebooks()), jobs, max_in_flight)
+        for full_path, result, error, times in results:
+            current = pending.pop(full_path)
+            report.add_times(times)
+            if error is not None:
+                summary['errors'].append((full_path, error))
+                report.file('failed')
+                report.error(f'Error processing {full_path}: {error}')
+                continue
+            output_filenames, written = result
+            report.add_bytes(read=os.path.getsize(full_path),
+                             written=sum(os.path.getsize(path) for path in written))
+            if manifest is not None:
+                record_outputs(manifest, full_path, current, output_filenames)
+            if written:
+                summary['converted'] += 1
+                report.file('changed')
+                report.log(f'{full_path} was successfully converted to {" and ".join(output_filenames)}')
+            else:
+                summary['unchanged'] += 1
+                report.file('unchanged')
+                report.log(f'{full_path} was converted; {" and ".join(output_filenames)} already up to date')
+
+        if manifest is not None:
+            # Esquecendo notebooks que deixaram de existir
+            for key in [key for key in manifest.entries if key not in seen]:
+                manifest.remove(key)
+    finally:
+        if manifest is not None:
+            manifest.save()
+    return summary
+
+
+def print_summary(summary):
+    """
+    Exibe o resumo de convert_tree.
+    """
+    print(f"Summary: {summary['converted']} converted, {summary['unchanged']} with unchanged outputs, "
+          f"{summary['up_to_date']} already up to date, {len(summary['errors'])} error(s)")
+    for full_path, error in summary['errors']:
+        print(f'  {full_path}: {error}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Converte os arquivos README.ipynb para .md e .py.')
+    parser.add_argument('--force', action='store_true',
+                        help='reconverte todos os notebooks, mesmo os que não mudaram')
+    parser.add_argument('--no-cache', action='store_true', help='não lê nem grava o manifesto')
+    parser.add_argument('--jobs', type=int, default=1, help='processos de conversão (0 = número de CPUs)')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='notebooks em conversão ao mesmo tempo (padrão: 2 * jobs)')
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    report = RunReport('nb2md', verbose=args.verbose)
+    with report_stdout(args.report):
+        try:
+            summary = convert_tree('.', force=args.force, use_manifest=not args.no_cache,
+                                   jobs=args.jobs or os.cpu_count() or 1, max_in_flight=args.max_in_flight,
+                                   report=report)
+        finally:
+            report.finish(args.report)
+        print_summary(summary)
+        return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
 
 
 # %% [markdown]
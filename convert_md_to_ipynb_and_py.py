@@ -1,31 +1,193 @@
 # -*- coding: utf-8 -*-
+import argparse
+import functools
+import hashlib
 import os
-from nbconvert import MarkdownExporter, PythonExporter
-import nbformat
+import re
+import sys
+from file_manifest import Manifest, output_state, write_if_changed
+from notebook_export import get_exporter, map_bounded
+from run_report import RunReport, add_arguments, report_stdout, timed
+from tree_walker import walk_tree
 
-def convert_md_to_ipynb(md_file):
+# Manifesto com o estado dos arquivos .md já convertidos, gravado na pasta raiz
+MANIFEST_NAME = '.convert_md_to_ipynb_and_py.json'
+# Incrementar quando a conversão mudar a ponto de exigir que todas as saídas sejam refeitas
+CONVERTER_VERSION = '2'
+
+# Linha que abre ou fecha um bloco de código cercado (``` ou ~~~, com até 3 espaços de recuo)
+FENCE_PATTERN = re.compile(r'^ {0,3}(`{3,}|~{3,})\s*([^`\s]*)[^`]*$')
+# Linguagens dos blocos cercados que viram células de código
+PYTHON_FENCES = {'python', 'python3', 'py', 'ipython', 'ipython3'}
+# Título ATX (# a ######), que inicia uma nova célula markdown
+HEADING_PATTERN = re.compile(r'^ {0,3}#{1,6}(\s|$)')
+
+def split_markdown_cells(lines):
     """
-    Converte um arquivo Markdown (.md) para Jupyter Notebook (.ipynb).
-    
+    Divide um Markdown em células, linha a linha, sem precisar do texto inteiro na memória.
+
+    Blocos cercados de código Python viram células de código; os demais
+    blocos cercados permanecem no markdown. Cada título fora de um bloco
+    cercado inicia uma nova célula markdown. Linhas em branco nas bordas das
+    células são descartadas, assim como células vazias.
+
     Args:
-        md_file (str): Caminho para o arquivo Markdown.
+        lines (iterable): Linhas do arquivo (com ou sem a quebra de linha final).
+
+    Yields:
+        tuple: (tipo da célula, 'markdown' ou 'code', e conteúdo).
+    """
+    cell_type, buffer = 'markdown', []
+    fence = None  # (caractere, comprimento) do bloco cercado aberto
+    for line in lines:
+        line = line.rstrip('\r\n')
+        match = FENCE_PATTERN.match(line)
+        if fence is None:
+            if match:
+                marker, language = match.group(1), match.group(2).lower().strip('{}')
+                fence = (marker[0], len(marker))
+                if language in PYTHON_FENCES:
+                    yield from _flush_cell(cell_type, buffer)
+                    cell_type, buffer = 'code', []
+                    continue
+            elif HEADING_PATTERN.match(line):
+                yield from _flush_cell(cell_type, buffer)
+                buffer = []
+        elif match and not match.group(2) and match.group(1)[0] == fence[0] and len(match.group(1)) >= fence[1]:
+            # Fechamento do bloco cercado aberto
+            fence = None
+            if cell_type == 'code':
+                yield from _flush_cell(cell_type, buffer)
+                cell_type, buffer = 'markdown', []
+                continue
+        buffer.append(line)
+    # Um bloco de código não fechado vai até o fim do arquivo, como no CommonMark
+    yield from _flush_cell(cell_type, buffer)
+
+def _flush_cell(cell_type, buffer):
     """
-    # Lendo o conteúdo do arquivo .md
-    with open(md_file, 'r', encoding='utf-8') as file:
-        md_content = file.read()
+    Gera a célula acumulada em buffer, sem as linhas em branco das bordas, se não estiver vazia.
+    """
+    start, end = 0, len(buffer)
+    while start < end and not buffer[start].strip():
+        start += 1
+    while end > start and not buffer[end - 1].strip():
+        end -= 1
+    if start < end:
+        yield cell_type, '\n'.join(buffer[start:end])
+
+def markdown_to_notebook(lines):
+    """
+    Cria um notebook a partir das linhas de um Markdown, usando split_markdown_cells.
 
-    # Criando um notebook com o conteúdo do arquivo .md
+    Args:
+        lines (iterable): Linhas do arquivo Markdown.
+
+    Returns:
+        NotebookNode: Notebook com as células markdown e de código.
+    """
+    import nbformat
     notebook = nbformat.v4.new_notebook()
-    notebook.cells.append(nbformat.v4.new_markdown_cell(md_content))
+    for index, (cell_type, source) in enumerate(split_markdown_cells(lines)):
+        # O id da célula vem da posição e do conteúdo (e não é aleatório) para que um .md igual gere o mesmo .ipynb
+        cell_id = hashlib.sha1(f'{index}:{source}'.encode('utf-8')).hexdigest()[:8]
+        if cell_type == 'code':
+            notebook.cells.append(nbformat.v4.new_code_cell(source, id=cell_id))
+        else:
+            notebook.cells.append(nbformat.v4.new_markdown_cell(source, id=cell_id))
+    return notebook
 
-    # Definindo o nome do arquivo de saída .ipynb
-    ipynb_file = md_file.replace('.md', '.ipynb')
+def notebook_to_ipynb(notebook):
+    """
+    Serializa o notebook como nbformat.write faria (com a quebra de linha final).
 
-    # Escrevendo o notebook para um arquivo .ipynb
-    with open(ipynb_file, 'w', encoding='utf-8') as file:
-        nbformat.write(notebook, file)
+    Args:
+        notebook (NotebookNode): Notebook a ser serializado.
 
-    return ipynb_file
+    Returns:
+        str: Conteúdo do arquivo .ipynb.
+    """
+    import nbformat
+    ipynb_content = nbformat.writes(notebook)
+    if not ipynb_content.endswith('\n'):
+        ipynb_content += '\n'
+    return ipynb_content
+
+def notebook_to_py(notebook):
+    """
+    Exporta o notebook para Python com o PythonExporter do processo (criado na primeira conversão).
+
+    Args:
+        notebook (NotebookNode): Notebook a ser exportado.
+
+    Returns:
+        str: Código Python.
+    """
+    python_code, _ = get_exporter('.py').from_notebook_node(notebook)
+    return python_code
+
+# Saídas que podem ser geradas a partir de um .md (na ordem em que são escritas)
+EMITTERS = {'ipynb': notebook_to_ipynb, 'py': notebook_to_py}
+
+def parse_emit(value):
+    """
+    Interpreta a opção --emit (por exemplo, 'ipynb,py' ou 'py').
+
+    Args:
+        value (str): Formatos separados por vírgula.
+
+    Returns:
+        tuple: Formatos na ordem de EMITTERS.
+    """
+    formats = {item.strip() for item in value.split(',') if item.strip()}
+    unknown = formats - set(EMITTERS)
+    if not formats or unknown:
+        raise argparse.ArgumentTypeError(f"formatos válidos: {', '.join(EMITTERS)}")
+    return tuple(name for name in EMITTERS if name in formats)
+
+def convert_md(md_file, emit=('ipynb', 'py'), times=None, written=None):
+    """
+    Converte um arquivo .md em memória e grava somente as saídas pedidas.
+
+    O notebook montado a partir do .md é passado direto ao PythonExporter,
+    sem gravar e reler o .ipynb. Cada saída é gravada de forma atômica, e
+    apenas se o conteúdo mudou.
+
+    Args:
+        md_file (str): Caminho para o arquivo Markdown.
+        emit (tuple): Formatos a gravar ('ipynb' e/ou 'py').
+        times (dict): Tempos por estágio (parse, export, write), ou None para não medir.
+        written (list): Se informada, recebe as saídas que foram de fato reescritas.
+
+    Returns:
+        list: Caminhos das saídas, na ordem de emit.
+    """
+    # Lendo o arquivo .md linha a linha e dividindo-o em células
+    with timed(times, 'parse'), open(md_file, 'r', encoding='utf-8') as file:
+        notebook = markdown_to_notebook(file)
+
+    output_files = []
+    for name in emit:
+        # Definindo o nome do arquivo de saída (.ipynb ou .py)
+        output_file = md_file.replace('.md', '.' + name)
+        with timed(times, 'export'):
+            content = EMITTERS[name](notebook)
+        with timed(times, 'write'):
+            if write_if_changed(output_file, content) and written is not None:
+                written.append(output_file)
+        output_files.append(output_file)
+    return output_files
+
+def convert_md_to_ipynb(md_file):
+    """
+    Converte um arquivo Markdown (.md) para Jupyter Notebook (.ipynb).
+
+    Blocos de código Python viram células de código, e cada título inicia uma nova célula.
+    
+    Args:
+        md_file (str): Caminho para o arquivo Markdown.
+    """
+    return convert_md(md_file, emit=('ipynb',))[0]
 
 def convert_ipynb_to_py(ipynb_file):
     """
@@ -35,54 +197,195 @@ def convert_ipynb_to_py(ipynb_file):
         ipynb_file (str): Caminho para o arquivo Jupyter Notebook.
     """
     # Lendo o notebook
+    import nbformat
     with open(ipynb_file, 'r', encoding='utf-8') as file:
         notebook = nbformat.read(file, as_version=4)
 
-    # Criando um objeto PythonExporter
-    python_exporter = PythonExporter()
-
-    # Exportando o notebook para código Python
-    python_code, _ = python_exporter.from_notebook_node(notebook)
-
     # Definindo o nome do arquivo de saída .py
     py_file = ipynb_file.replace('.ipynb', '.py')
 
-    # Escrevendo o código Python no arquivo de saída
-    with open(py_file, 'w', encoding='utf-8') as file:
-        file.write(python_code)
+    # Escrevendo o código Python no arquivo de saída, somente se o conteúdo mudou
+    write_if_changed(py_file, notebook_to_py(notebook))
 
     return py_file
 
-# Definindo o nome do arquivo que deve ser excluído das subpastas
-excluded_file = 'convert_md_to_ipynb.py'
+def converter_version(emit=('ipynb', 'py')):
+    """
+    Identifica a versão da conversão (deste script, do nbconvert e das saídas pedidas) gravada no manifesto.
+    """
+    from importlib.metadata import version
+    return f'{CONVERTER_VERSION}/nbconvert-{version("nbconvert")}/{",".join(emit)}'
+
+def convert_job(md_file, emit=('ipynb', 'py')):
+    """
+    Converte um arquivo .md em um processo do pool, devolvendo o erro em vez de levantá-lo.
+
+    Args:
+        md_file (str): Caminho para o arquivo Markdown.
+        emit (tuple): Formatos a gravar.
+
+    Returns:
+        tuple: (md_file, lista de saídas ou None, mensagem de erro ou None, saídas reescritas, tempos por estágio).
+    """
+    times, written = {}, []
+    try:
+        return md_file, convert_md(md_file, emit, times, written), None, written, times
+    except Exception as e:
+        return md_file, None, str(e), written, times
+
+def record_outputs(manifest, md_file, current, output_files):
+    """
+    Registra no manifesto o estado do arquivo .md e das saídas geradas.
+    """
+    current['outputs'] = {os.path.normpath(path): output_state(path) for path in output_files}
+    manifest.set(os.path.normpath(md_file), current)
+
+def convert_markdown(md_file, manifest=None, force=False, emit=('ipynb', 'py')):
+    """
+    Converte um arquivo .md para .ipynb e/ou .py, se as saídas estiverem desatualizadas.
 
-# Obtendo o caminho absoluto da pasta raiz
-root_path = os.path.abspath('.')
+    Args:
+        md_file (str): Caminho para o arquivo Markdown.
+        manifest (Manifest): Estado das conversões anteriores (None desativa a verificação).
+        force (bool): Se True, converte mesmo que as saídas estejam atualizadas.
+        emit (tuple): Formatos a gravar.
 
-# Percorrendo todos os diretórios e subdiretórios a partir da pasta atual
-for dirpath, dirnames, filenames in os.walk('.'):
-    for filename in filenames:
-        # Construindo o caminho completo do arquivo
-        full_path = os.path.join(dirpath, filename)
+    Returns:
+        list: Caminhos das saídas, ou None se o arquivo .md não mudou.
+    """
+    key = os.path.normpath(md_file)
+    if manifest is not None:
+        unchanged, current = manifest.lookup(key, md_file)
+        if unchanged and not force and manifest.outputs_unchanged(key):
+            return None
 
-        if filename.endswith('.md'):
-            try:
-                # Convertendo .md para .ipynb
-                ipynb_file = convert_md_to_ipynb(full_path)
+    output_files = convert_md(md_file, emit)
 
-                # Convertendo .ipynb para .py
-                py_file = convert_ipynb_to_py(ipynb_file)
+    if manifest is not None:
+        record_outputs(manifest, md_file, current, output_files)
+    return output_files
 
-                print(f'{full_path} foi convertido com sucesso para {ipynb_file} e {py_file}')
+def convert_tree(root='.', force=False, use_manifest=True, jobs=1, max_in_flight=None, emit=('ipynb', 'py'),
+                 report=None):
+    """
+    Converte todos os arquivos .md a partir de root e exclui as cópias de excluded_file nas subpastas.
+
+    Args:
+        root (str): Pasta raiz.
+        force (bool): Se True, reconverte todos os arquivos.
+        use_manifest (bool): Se False, não lê nem grava o manifesto.
+        jobs (int): Número de processos de conversão (1 converte no processo atual).
+        max_in_flight (int): Máximo de arquivos em conversão ao mesmo tempo (padrão: 2 * jobs).
+        emit (tuple): Formatos a gravar ('ipynb' e/ou 'py').
+        report (RunReport): Recebe tempos, contadores e mensagens (padrão: um novo, com uma mensagem por arquivo).
+
+    Returns:
+        dict: Resumo com converted, up_to_date e errors (lista de (caminho, erro)).
+    """
+    if report is None:
+        report = RunReport('md2nb', verbose=True, stream=sys.stdout)
+
+    # Definindo o nome do arquivo que deve ser excluído das subpastas
+    excluded_file = 'convert_md_to_ipynb.py'
+
+    # Obtendo o caminho absoluto da pasta raiz
+    root_path = os.path.abspath(root)
+    manifest = Manifest(os.path.join(root, MANIFEST_NAME), converter_version(emit)) if use_manifest else None
+    summary = {'converted': 0, 'up_to_date': 0, 'errors': []}
+    seen = set()
+    pending = {}
+
+    def stale_files():
+        # Percorrendo todos os diretórios e subdiretórios a partir da pasta raiz
+        for listing in walk_tree(root):
+            for entry in listing.files:
+                filename = entry.name
+                # Construindo o caminho completo do arquivo
+                full_path = entry.path
+
+                if filename.endswith('.md'):
+                    key = os.path.normpath(full_path)
+                    seen.add(key)
+                    report.file('seen')
+                    current = None
+                    if manifest is not None:
+                        unchanged, current = manifest.lookup(key, full_path)
+                        if unchanged and not force and manifest.outputs_unchanged(key):
+                            summary['up_to_date'] += 1
+                            report.file('skipped')
+                            continue
+                    pending[full_path] = current
+                    yield full_path
+
+                # Verificando se o arquivo é o que deve ser excluído e se não está na pasta raiz
+                elif filename == excluded_file and os.path.abspath(listing.path) != root_path:
+                    # Excluindo o arquivo
+                    os.remove(full_path)
+                    report.count('deleted')
+                    report.log(f'Arquivo excluído: {full_path}')
+
+    try:
+        job = functools.partial(convert_job, emit=emit)
+        results = map_bounded(job, report.iter_stage('walk', stale_files()), jobs, max_in_flight)
+        for full_path, result, error, written, times in results:
+            current = pending.pop(full_path)
+            report.add_times(times)
+            if error is not None:
+                summary['errors'].append((full_path, error))
+                report.file('failed')
+                report.error(f'Erro ao processar {full_path}: {error}')
+                continue
+            report.add_bytes(read=os.path.getsize(full_path),
+                             written=sum(os.path.getsize(path) for path in written))
+            if manifest is not None:
+                record_outputs(manifest, full_path, current, result)
+            summary['converted'] += 1
+            report.file('changed' if written else 'unchanged')
+            report.log(f'{full_path} foi convertido com sucesso para {" e ".join(result)}')
+
+        if manifest is not None:
+            # Esquecendo arquivos que deixaram de existir
+            for key in [key for key in manifest.entries if key not in seen]:
+                manifest.remove(key)
+    finally:
+        if manifest is not None:
+            manifest.save()
+    return summary
+
+def print_summary(summary):
+    """
+    Exibe o resumo de convert_tree.
+    """
+    print(f"Resumo: {summary['converted']} convertido(s), {summary['up_to_date']} já atualizado(s), "
+          f"{len(summary['errors'])} erro(s)")
+    for full_path, error in summary['errors']:
+        print(f'  {full_path}: {error}')
 
-            except Exception as e:
-                print(f'Erro ao processar {full_path}: {e}')
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Converte os arquivos .md para .ipynb e .py.')
+    parser.add_argument('--force', action='store_true',
+                        help='reconverte todos os arquivos, mesmo os que não mudaram')
+    parser.add_argument('--no-cache', action='store_true', help='não lê nem grava o manifesto')
+    parser.add_argument('--jobs', type=int, default=1, help='processos de conversão (0 = número de CPUs)')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='arquivos em conversão ao mesmo tempo (padrão: 2 * jobs)')
+    parser.add_argument('--emit', type=parse_emit, default=('ipynb', 'py'),
+                        help="saídas gravadas, separadas por vírgula (padrão: 'ipynb,py')")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    report = RunReport('md2nb', verbose=args.verbose)
+    with report_stdout(args.report):
+        try:
+            summary = convert_tree('.', force=args.force, use_manifest=not args.no_cache,
+                                   jobs=args.jobs or os.cpu_count() or 1, max_in_flight=args.max_in_flight,
+                                   emit=args.emit, report=report)
+        finally:
+            report.finish(args.report)
+        print_summary(summary)
+        return 1 if summary['errors'] else 0
 
-        # Verificando se o arquivo é o que deve ser excluído e se não está na pasta raiz
-        elif filename == excluded_file and os.path.abspath(dirpath) != root_path:
-            # Excluindo o arquivo
-            os.remove(full_path)
-            print(f'Arquivo excluído: {full_path}')
+if __name__ == '__main__':
+    sys.exit(main())
 
 # %% [markdown]
 # ## Referências
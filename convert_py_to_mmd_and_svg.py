@@ -1,10 +1,33 @@
 # -*- coding: utf-8 -*-
+import argparse
 import ast
-import astor
+import functools
+import io
 import re
 import os
 from pathlib import Path
+import shutil
 import subprocess
+import sys
+import tempfile
+import threading
+import tokenize
+import queue
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from file_manifest import Manifest, file_digest
+import flow_graph
+from flow_graph import FlowGraph, to_mermaid
+from run_report import RunReport, add_arguments, report_stdout, timed
+from tree_walker import iter_files
+
+# Incrementar quando a saída gerada mudar de formato
+GENERATOR_VERSION = "3"
+MANIFEST_NAME = ".convert_py_to_mmd_and_svg.json"
+DEFAULT_MAX_NODES = 200
+DEFAULT_MAX_LABEL = 80
+# Renderizadores de SVG disponíveis: o mermaid-cli ou o renderizador em Python puro (svg_flowchart)
+RENDERERS = ("mmdc", "svg")
 
 def clean_label(label):
     """
@@ -14,122 +37,685 @@ def clean_label(label):
     label = re.sub(r"\s+", " ", label)
     return label.strip()
 
-def generate_mermaid_from_ast(code_str):
+class SourceSegments:
     """
-    Gera código Mermaid flowchart a partir de código Python.
+    Recupera o trecho de código-fonte de um nó da AST.
+
+    Equivale a ast.get_source_segment, mas calcula o início de cada linha uma
+    única vez, em vez de dividir o código inteiro a cada chamada. Os
+    deslocamentos de coluna da AST são contados em bytes UTF-8, por isso o
+    recorte é feito sobre o código codificado.
+    """
+
+    def __init__(self, code_str):
+        self.source = code_str.encode("utf-8")
+        self.line_starts = []
+        offset = 0
+        for line in self.source.splitlines(keepends=True):
+            self.line_starts.append(offset)
+            offset += len(line)
+        self.line_starts.append(offset)
+
+    def get(self, node):
+        try:
+            start = self.line_starts[node.lineno - 1] + node.col_offset
+            end = self.line_starts[node.end_lineno - 1] + node.end_col_offset
+        except (AttributeError, IndexError, TypeError):
+            # Nós sem posição (por exemplo, criados por transformações da AST)
+            return ast.unparse(node)
+        segment = self.source[start:end].decode("utf-8", errors="replace")
+        if "#" in segment and "\n" in segment:
+            segment = self._strip_comments(segment, node)
+        return segment
+
+    @staticmethod
+    def _strip_comments(segment, node):
+        """
+        Remove comentários de um trecho com várias linhas, para que não apareçam nos labels.
+        """
+        try:
+            tokens = list(tokenize.generate_tokens(io.StringIO(segment).readline))
+        except (tokenize.TokenError, SyntaxError):
+            return ast.unparse(node)
+        lines = segment.splitlines(keepends=True)
+        for token in reversed(tokens):
+            if token.type == tokenize.COMMENT:
+                (row, col), (_, end_col) = token.start, token.end
+                lines[row - 1] = lines[row - 1][:col] + lines[row - 1][end_col:]
+        return "".join(lines)
+
+
+class _Body:
+    """
+    Corpo de instruções pendente no percurso da AST.
+
+    chain=True liga cada instrução à anterior (corpo de função); chain=False
+    liga todas ao mesmo pai (ramos de If, While e For). run acumula as
+    instruções simples que serão agrupadas em um bloco (modo collapse).
+    """
+    __slots__ = ("statements", "graph", "parent", "chain", "scope", "last", "run")
+
+    def __init__(self, body, graph, parent, chain, scope):
+        self.statements = iter(body)
+        self.graph = graph
+        self.parent = parent
+        self.chain = chain
+        self.scope = scope
+        self.last = parent
+        self.run = []
+
+
+def _build_graphs(tree, segments, name, collapse=False, fold=False, max_label=None, limit=None):
+    """
+    Percorre a AST e monta os grafos dos fluxogramas.
+
+    O percurso usa uma pilha explícita de corpos pendentes, e não recursão,
+    para que código profundamente aninhado não esbarre no limite de recursão.
+
+    :param collapse: Agrupa sequências de instruções simples em um único bloco
+    :param fold: Move o corpo de cada função para um subdiagrama próprio
+    :param limit: Número máximo de nós por diagrama; os excedentes são omitidos
+    :return: Dicionário {sufixo: FlowGraph}
     """
-    tree = ast.parse(code_str)
-    lines = ["flowchart TD"]
-    node_counter = 0
+    graphs = {}
+    flow_nodes = (ast.FunctionDef, ast.If, ast.While, ast.For)
+
+    def new_graph(suffix):
+        base, index = suffix, 2
+        while suffix in graphs:
+            suffix = f"{base}_{index}"
+            index += 1
+        graphs[suffix] = FlowGraph(limit)
+        return suffix, graphs[suffix]
 
-    def new_node(label, shape="rect"):
-        nonlocal node_counter
-        node_id = f"n{node_counter}"
+    def add_node(graph, label, shape="rect"):
         label = clean_label(label)
-        if shape == "diamond":
-            lines.append(f'{node_id}{{"{label}"}}')
-        elif shape == "parallelogram":
-            lines.append(f'{node_id}[/"{label}"/]')
+        if max_label is not None and len(label) > max_label:
+            label = label[:max_label].rstrip() + "…"
+        return graph.add_node(label, shape)
+
+    def statement_label(node):
+        if isinstance(node, (ast.Assign, ast.Expr)):
+            return segments.get(node)
+        return None
+
+    def flush(body):
+        labels = [label for label in map(statement_label, body.run) if label is not None]
+        body.run.clear()
+        if not labels:
+            return
+        if len(labels) == 1:
+            block = add_node(body.graph, labels[0], "rect")
         else:
-            lines.append(f'{node_id}["{label}"]')
-        node_counter += 1
-        return node_id
+            block = add_node(body.graph, f"{len(labels)} instruções: {labels[0]}", "rect")
+        body.graph.add_edge(body.last if body.chain else body.parent, block)
+        if body.chain:
+            body.last = block
 
-    def walk(node, parent=None):
+    def visit(node, graph, parent, scope):
+        # Devolve o nó que representa a instrução e os corpos a percorrer em seguida, em ordem
         if isinstance(node, ast.FunctionDef):
-            current = new_node(f"Func: {node.name}()", "rect")
-            if parent:
-                lines.append(f"{parent} --> {current}")
-            last = current
-            for stmt in node.body:
-                last = walk(stmt, last)
-            return current
+            current = add_node(graph, f"Func: {node.name}()", "rect")
+            graph.add_edge(parent, current)
+            if fold:
+                suffix, sub_graph = new_graph(".".join(scope + [node.name]))
+                graph.add_link(current, f"{name}.{suffix}.svg")
+                root = add_node(sub_graph, f"Func: {node.name}()", "rect")
+                return current, [_Body(node.body, sub_graph, root, True, suffix.split("."))]
+            return current, [_Body(node.body, graph, current, True, scope + [node.name])]
 
         elif isinstance(node, ast.If):
-            cond = new_node(f"If: {astor.to_source(node.test).strip()}", "diamond")
-            if parent:
-                lines.append(f"{parent} --> {cond}")
-            last_true = cond
-            for stmt in node.body:
-                last_true = walk(stmt, cond)
-            last_false = cond
-            for stmt in node.orelse:
-                last_false = walk(stmt, cond)
-            return cond
+            cond = add_node(graph, f"If: {segments.get(node.test)}", "diamond")
+            graph.add_edge(parent, cond)
+            return cond, [_Body(node.body, graph, cond, False, scope), _Body(node.orelse, graph, cond, False, scope)]
 
         elif isinstance(node, ast.While):
-            cond = new_node(f"While: {astor.to_source(node.test).strip()}", "diamond")
-            if parent:
-                lines.append(f"{parent} --> {cond}")
-            for stmt in node.body:
-                walk(stmt, cond)
-            return cond
+            cond = add_node(graph, f"While: {segments.get(node.test)}", "diamond")
+            graph.add_edge(parent, cond)
+            return cond, [_Body(node.body, graph, cond, False, scope)]
 
         elif isinstance(node, ast.For):
-            label = f"For: {astor.to_source(node.target).strip()} in {astor.to_source(node.iter).strip()}"
-            loop = new_node(label, "diamond")
-            if parent:
-                lines.append(f"{parent} --> {loop}")
-            for stmt in node.body:
-                walk(stmt, loop)
-            return loop
+            loop = add_node(graph, f"For: {segments.get(node.target)} in {segments.get(node.iter)}", "diamond")
+            graph.add_edge(parent, loop)
+            return loop, [_Body(node.body, graph, loop, False, scope)]
 
-        elif isinstance(node, ast.Assign):
-            assign = new_node(astor.to_source(node).strip(), "rect")
-            if parent:
-                lines.append(f"{parent} --> {assign}")
-            return assign
+        elif isinstance(node, (ast.Assign, ast.Expr)):
+            block = add_node(graph, segments.get(node), "rect")
+            graph.add_edge(parent, block)
+            return block, []
 
-        elif isinstance(node, ast.Expr):
-            expr = new_node(astor.to_source(node).strip(), "rect")
-            if parent:
-                lines.append(f"{parent} --> {expr}")
-            return expr
+        return parent, []
 
-        return parent
+    _, main = new_graph("")
+    stack = [_Body(tree.body, main, None, False, [])]
+    while stack:
+        body = stack[-1]
+        stmt = next(body.statements, None)
+        if stmt is None:
+            flush(body)
+            stack.pop()
+            continue
+        if collapse and not isinstance(stmt, flow_nodes):
+            body.run.append(stmt)
+            continue
+        flush(body)
+        result, bodies = visit(stmt, body.graph, body.last if body.chain else body.parent, body.scope)
+        if body.chain:
+            body.last = result
+        # O primeiro corpo fica no topo da pilha: os corpos são percorridos por inteiro, na ordem do código
+        stack.extend(reversed(bodies))
+    return graphs
 
-    for n in tree.body:
-        walk(n)
 
-    return "\n".join(lines)
+def build_flow_graphs(code_str, name="", max_nodes=None, max_label=None, times=None):
+    """
+    Monta os grafos de um ou mais fluxogramas a partir de código Python, respeitando um orçamento de nós.
 
+    Enquanto o fluxograma completo couber em max_nodes, o resultado é um único
+    diagrama. Acima disso, sequências de instruções simples viram um só bloco;
+    se ainda não couber, o corpo de cada função vai para um subdiagrama
+    próprio, ligado ao nó da função, e os nós que excederem o orçamento em
+    cada diagrama são resumidos em um nó final.
 
-def process_python_file(file_path):
-    print(f"📄 Processando: {file_path}")
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
+    :param code_str: Código Python
+    :param name: Nome base dos arquivos, usado nos links para os subdiagramas
+    :param max_nodes: Número máximo de nós por diagrama, ou None para não limitar
+    :param max_label: Número máximo de caracteres por label, ou None para não limitar
+    :param times: Dicionário de tempos por estágio (parse, generate), ou None para não medir
+    :return: Dicionário {sufixo: FlowGraph}; o sufixo "" identifica o diagrama principal
+    """
+    with timed(times, "parse"):
+        tree = ast.parse(code_str)
+        segments = SourceSegments(code_str)
+    strategies = [dict()]
+    if max_nodes is not None:
+        strategies += [dict(collapse=True), dict(collapse=True, fold=True, limit=max_nodes)]
 
-        mermaid_code = generate_mermaid_from_ast(code)
+    with timed(times, "generate"):
+        for options in strategies:
+            graphs = _build_graphs(tree, segments, name, max_label=max_label, **options)
+            if max_nodes is None or all(len(graph) <= max_nodes for graph in graphs.values()):
+                break
+        return graphs
 
-        if mermaid_code.strip() == "flowchart TD":
-            print(f"⚠️ Nenhum elemento detectado em {file_path}, pulando.")
-            return
 
-        mmd_path = f"{file_path}.mmd"
-        svg_path = f"{file_path}.svg"
+def generate_mermaid_diagrams(code_str, name="", max_nodes=None, max_label=None, times=None):
+    """
+    Gera um ou mais fluxogramas Mermaid a partir de código Python (veja build_flow_graphs).
+
+    :param times: Dicionário de tempos por estágio (parse, generate, emit), ou None para não medir
+    :return: Dicionário {sufixo: código Mermaid}; o sufixo "" identifica o diagrama principal
+    """
+    graphs = build_flow_graphs(code_str, name, max_nodes, max_label, times)
+    with timed(times, "emit"):
+        return {suffix: to_mermaid(graph) for suffix, graph in graphs.items()}
+
+
+def generate_mermaid_from_ast(code_str, max_nodes=None, max_label=None):
+    """
+    Gera código Mermaid flowchart a partir de código Python.
+    """
+    return generate_mermaid_diagrams(code_str, max_nodes=max_nodes, max_label=max_label)[""]
+
+
+class MmdcRenderer:
+    """
+    Renderiza cada arquivo .mmd com uma chamada própria ao mmdc.
+    """
+
+    def __init__(self, command="mmdc"):
+        self.command = command
+
+    def render(self, mmd_path, svg_path):
+        subprocess.run([self.command, "-i", mmd_path, "-o", svg_path, "--quiet"], check=True)
+
+    def render_many(self, jobs):
+        """
+        Renderiza uma lista de pares (mmd_path, svg_path).
+
+        :param jobs: Lista de tuplas (mmd_path, svg_path)
+        :return: Gerador de tuplas (mmd_path, svg_path, erro), com erro None em caso de sucesso
+        """
+        for mmd_path, svg_path in jobs:
+            try:
+                self.render(mmd_path, svg_path)
+            except Exception as e:
+                yield mmd_path, svg_path, e
+            else:
+                yield mmd_path, svg_path, None
+
+
+class MmdcBatchRenderer(MmdcRenderer):
+    """
+    Renderiza vários diagramas por processo do mmdc.
+
+    Os diagramas de cada lote são reunidos em um único Markdown, que o mmdc
+    transforma em out-1.svg, out-2.svg, ... com uma única instância do
+    navegador. Os lotes podem ser processados por um pequeno pool de processos.
+    """
+
+    def __init__(self, command="mmdc", batch_size=200, workers=1):
+        super().__init__(command)
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+
+    def render_many(self, jobs):
+        jobs = list(jobs)
+        chunks = [jobs[i:i + self.batch_size] for i in range(0, len(jobs), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for results in pool.map(self._render_chunk, chunks):
+                yield from results
+
+    def _render_chunk(self, chunk):
+        with tempfile.TemporaryDirectory(prefix="mmdc-batch-") as tmp_dir:
+            md_path = os.path.join(tmp_dir, "batch.md")
+            out_path = os.path.join(tmp_dir, "out.svg")
+            with open(md_path, "w", encoding="utf-8") as md_file:
+                for mmd_path, _ in chunk:
+                    with open(mmd_path, "r", encoding="utf-8") as f:
+                        md_file.write(f"```mermaid\n{f.read()}\n```\n\n")
 
-        with open(mmd_path, "w", encoding="utf-8") as f:
+            try:
+                subprocess.run(
+                    [self.command, "-i", md_path, "-o", out_path, "--quiet"],
+                    check=True, capture_output=True,
+                )
+            except (OSError, subprocess.CalledProcessError):
+                # Um diagrama inválido derruba o lote inteiro: renderiza um a um para isolar as falhas
+                return list(MmdcRenderer.render_many(self, chunk))
+
+            results = []
+            for index, (mmd_path, svg_path) in enumerate(chunk, start=1):
+                produced = os.path.join(tmp_dir, f"out-{index}.svg")
+                if os.path.exists(produced):
+                    shutil.move(produced, svg_path)
+                    results.append((mmd_path, svg_path, None))
+                else:
+                    results.append((mmd_path, svg_path, FileNotFoundError(f"mmdc não gerou {produced}")))
+            return results
+
+
+def create_renderer(name="mmdc", command="mmdc", batch=False, batch_size=200, workers=1):
+    """
+    Cria o renderizador de SVG escolhido.
+
+    :param name: Um de RENDERERS
+    :param command: Comando do mermaid-cli (renderizador mmdc)
+    :param batch: Se True, usa o mmdc em lotes (MmdcBatchRenderer)
+    :param batch_size: Número de diagramas por processo do mmdc no modo em lotes
+    :param workers: Número de processos do mmdc em paralelo no modo em lotes
+    :return: Objeto com os métodos render e render_many
+    """
+    if name == "svg":
+        from svg_flowchart import SvgRenderer
+        return SvgRenderer()
+    if name != "mmdc":
+        raise ValueError(f"renderizador desconhecido: {name}")
+    if batch:
+        return MmdcBatchRenderer(command, batch_size=batch_size, workers=workers)
+    return MmdcRenderer(command)
+
+
+def write_mermaid_file(file_path, max_nodes=DEFAULT_MAX_NODES, max_label=DEFAULT_MAX_LABEL, times=None,
+                       render_svg=False):
+    """
+    Gera os arquivos .mmd de um arquivo .py e, com render_svg, também os SVGs.
+
+    O diagrama principal vai para <arquivo>.py.mmd; os subdiagramas de funções,
+    quando o orçamento de nós é excedido, vão para <arquivo>.py.<função>.mmd.
+
+    :param file_path: Caminho do arquivo .py
+    :param max_nodes: Número máximo de nós por diagrama, ou None para não limitar
+    :param max_label: Número máximo de caracteres por label, ou None para não limitar
+    :param times: Dicionário de tempos por estágio (read, parse, generate, emit, write, render), ou None
+    :param render_svg: Se True, grava os .svg com svg_flowchart a partir dos grafos, sem reler os .mmd
+    :return: Lista de tuplas (mmd_path, svg_path), vazia se não houver nada a renderizar
+    """
+    with timed(times, "read"), open(file_path, "r", encoding="utf-8") as f:
+        code = f.read()
+
+    graphs = build_flow_graphs(code, os.path.basename(file_path), max_nodes, max_label, times)
+
+    if not len(graphs[""]) and not graphs[""].omitted:
+        return []
+
+    jobs = []
+    for suffix, graph in graphs.items():
+        base_path = f"{file_path}.{suffix}" if suffix else file_path
+        mmd_path = f"{base_path}.mmd"
+        svg_path = f"{base_path}.svg"
+
+        with timed(times, "emit"):
+            mermaid_code = to_mermaid(graph)
+        with timed(times, "write"), open(mmd_path, "w", encoding="utf-8") as f:
             f.write(mermaid_code)
+        if render_svg:
+            from svg_flowchart import render_graph
+            with timed(times, "render"):
+                svg = render_graph(graph)
+            with timed(times, "write"), open(svg_path, "w", encoding="utf-8") as f:
+                f.write(svg)
+        jobs.append((mmd_path, svg_path))
+
+    return jobs
 
-        print("Generating single mermaid chart")
-        subprocess.run(["mmdc", "-i", mmd_path, "-o", svg_path, "--quiet"], check=True)
-        print(f"✅ SVG gerado: {svg_path}")
+
+def render_diagrams(jobs, renderer, report=None):
+    """
+    Renderiza os diagramas com o renderizador informado e relata cada resultado.
+
+    :param jobs: Lista de tuplas (mmd_path, svg_path)
+    :param renderer: Objeto com o método render_many(jobs), como MmdcBatchRenderer
+    :param report: RunReport que recebe o tempo de renderização e as mensagens (padrão: uma mensagem por diagrama)
+    :return: Lista de tuplas (mmd_path, erro) dos diagramas que falharam
+    """
+    if report is None:
+        report = RunReport("diagram", verbose=True, stream=sys.stdout)
+    failures = []
+    for mmd_path, svg_path, error in report.iter_stage("render", renderer.render_many(jobs)):
+        if error is None:
+            report.count("svg")
+            report.add_bytes(written=os.path.getsize(svg_path))
+            report.log(f"✅ SVG gerado: {svg_path}")
+        else:
+            report.error(f"❌ Erro ao renderizar {mmd_path}: {error}")
+            failures.append((mmd_path, error))
+    return failures
+
+
+def process_python_file(file_path, renderer=None, report=None):
+    """
+    Gera e renderiza os diagramas de um único arquivo .py, sem cache.
+
+    :param renderer: Objeto com o método render(mmd_path, svg_path) (padrão: MmdcRenderer)
+    :param report: RunReport que recebe contadores e mensagens (padrão: uma mensagem por diagrama)
+    """
+    if report is None:
+        report = RunReport("diagram", verbose=True, stream=sys.stdout)
+    report.file("seen")
+    report.log(f"📄 Processando: {file_path}")
+    try:
+        jobs = write_mermaid_file(file_path)
+        if not jobs:
+            report.file("unchanged")
+            report.log(f"⚠️ Nenhum elemento detectado em {file_path}, pulando.")
+            return
+
+        report.count("diagrams", len(jobs))
+        for mmd_path, svg_path in jobs:
+            (renderer or MmdcRenderer()).render(mmd_path, svg_path)
+            report.count("svg")
+            report.log(f"✅ SVG gerado: {svg_path}")
+        report.file("changed")
     except Exception as e:
-        print(f"❌ Erro ao processar {file_path}: {e}")
+        report.file("failed")
+        report.error(f"❌ Erro ao processar {file_path}: {e}")
 
 
 def find_python_files(root="."):
-    py_files = []
-    for dirpath, _, filenames in os.walk(root):
-        for file in filenames:
-            if file.endswith(".py"):
-                py_files.append(os.path.join(dirpath, file))
-    return py_files
+    return [entry.path for entry in iter_files(root, suffixes=(".py",))]
 
 
-if __name__ == "__main__":
-    print("🔍 Procurando arquivos .py...")
-    py_files = find_python_files()
+def generator_version(renderer=None):
+    """
+    Identifica a versão do gerador: muda com GENERATOR_VERSION, com qualquer edição deste arquivo
+    ou com a versão do renderizador, quando ele informa uma (atributo version).
+    """
+    # O grafo intermediário e o emissor Mermaid ficam em flow_graph
+    version = f"{GENERATOR_VERSION}:{file_digest(__file__)[:16]}:{file_digest(flow_graph.__file__)[:8]}"
+    renderer_version = getattr(renderer, "version", None)
+    return f"{version}:{renderer_version}" if renderer_version else version
+
+
+def remove_outputs(paths, root=".", report=None):
+    """
+    Remove saídas geradas, contando-as em 'removed'.
+
+    :param paths: Caminhos relativos a root
+    :param report: RunReport que recebe o contador e as mensagens (padrão: uma mensagem por arquivo)
+    """
+    if report is None:
+        report = RunReport("diagram", verbose=True, stream=sys.stdout)
+    for output in paths:
+        output_path = os.path.join(root, output)
+        if os.path.exists(output_path):
+            os.remove(output_path)
+            report.count("removed")
+            report.log(f"🗑️ Removido: {output_path}")
+
+
+def remove_orphan_outputs(manifest, root=".", report=None):
+    """
+    Remove os .mmd/.svg cujos arquivos .py de origem não existem mais.
+
+    :param manifest: Manifesto com as saídas geradas em execuções anteriores
+    :param root: Diretório raiz ao qual as chaves do manifesto são relativas
+    :param report: RunReport que recebe o contador e as mensagens (padrão: uma mensagem por arquivo)
+    """
+    for key in list(manifest.entries):
+        if not os.path.exists(os.path.join(root, key)):
+            remove_outputs(manifest.get(key).get("outputs", []), root, report)
+            manifest.remove(key)
+
+
+def _generate_job(file_path, **options):
+    """
+    Executa write_mermaid_file em um processo do pool, devolvendo o erro em vez de propagá-lo.
+    """
+    times = {}
+    try:
+        return file_path, write_mermaid_file(file_path, times=times, **options), None, times
+    except Exception as e:
+        return file_path, [], e, times
+
+
+def generate_jobs(py_files, jobs=1, **options):
+    """
+    Gera os .mmd dos arquivos, em paralelo quando jobs > 1.
+
+    Os resultados são devolvidos na ordem de py_files, qualquer que seja o número de processos.
+
+    :param py_files: Lista de arquivos .py
+    :param jobs: Número de processos do pool
+    :param options: Argumentos repassados a write_mermaid_file (max_nodes, max_label, render_svg)
+    :return: Gerador de tuplas (py_file, lista de (mmd_path, svg_path), erro ou None, tempos por estágio)
+    """
+    generate = functools.partial(_generate_job, **options)
+    if jobs <= 1 or len(py_files) <= 1:
+        yield from map(generate, py_files)
+        return
+    chunksize = max(1, len(py_files) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(generate, py_files, chunksize=chunksize)
+
+
+def _render_worker(render_queue, renderer, flush_size, failures, errors, report):
+    """
+    Consome a fila de diagramas gerados, renderizando-os em grupos de flush_size.
+
+    Se o renderizador levantar uma exceção, ela é guardada em errors, os
+    diagramas do grupo (e todos os seguintes, sem renderizar) contam como
+    falhas e a fila continua sendo esvaziada até o None final, para que a
+    thread principal nunca fique bloqueada em render_queue.put.
+    """
+    buffer = []
+    while True:
+        job = render_queue.get()
+        if job is not None:
+            buffer.append(job)
+        if buffer and (job is None or len(buffer) >= flush_size):
+            try:
+                if errors:
+                    raise errors[0]
+                failures += render_diagrams(buffer, renderer, report)
+            except Exception as e:
+                if not errors:
+                    errors.append(e)
+                    report.error(f"❌ Erro no renderizador: {e}")
+                failures += [(mmd_path, e) for mmd_path, _ in buffer]
+            buffer = []
+        if job is None:
+            return
+
+
+def update_diagrams(py_files, renderer, manifest=None, batch=False, root=".", jobs=1, queue_size=1000,
+                    max_nodes=DEFAULT_MAX_NODES, max_label=DEFAULT_MAX_LABEL, report=None):
+    """
+    Gera e renderiza os diagramas dos arquivos .py, pulando os que não mudaram.
+
+    A geração dos .mmd roda em um pool de processos e a renderização em uma
+    thread separada, alimentada por uma fila limitada, de modo que as duas
+    etapas se sobrepõem.
+
+    :param py_files: Lista de arquivos .py
+    :param renderer: Objeto com o método render_many(jobs)
+    :param manifest: Manifesto de cache, ou None para processar todos os arquivos
+    :param batch: Se True, entrega os diagramas ao renderizador em lotes
+    :param root: Diretório raiz ao qual as chaves do manifesto são relativas
+    :param jobs: Número de processos usados para gerar os .mmd
+    :param queue_size: Número máximo de diagramas aguardando renderização
+    :param max_nodes: Número máximo de nós por diagrama, ou None para não limitar
+    :param max_label: Número máximo de caracteres por label, ou None para não limitar
+    :param report: RunReport que recebe tempos, contadores e mensagens (padrão: uma mensagem por arquivo)
+    :return: Lista de tuplas (mmd_path, erro) dos diagramas que falharam
+    :raises Exception: A exceção levantada pelo renderizador, depois de registrados os arquivos concluídos
+    """
+    if report is None:
+        report = RunReport("diagram", verbose=True, stream=sys.stdout)
+
+    def record(py_file, entry, outputs):
+        if manifest is None:
+            return
+        key = os.path.relpath(py_file, root)
+        outputs = [os.path.relpath(path, root) for path in outputs]
+        previous = manifest.get(key) or {}
+        remove_outputs([path for path in previous.get("outputs", []) if path not in outputs], root, report)
+        manifest.set(key, dict(entry, outputs=outputs))
+
+    entries = {}
     for py_file in py_files:
-        process_python_file(py_file)
+        report.file("seen")
+        entry = None
+        if manifest is not None:
+            key = os.path.relpath(py_file, root)
+            unchanged, entry = manifest.lookup(key, py_file)
+            previous = manifest.get(key)
+            if unchanged and all(os.path.exists(os.path.join(root, path)) for path in previous.get("outputs", [])):
+                if previous["mtime_ns"] != entry["mtime_ns"] or previous["size"] != entry["size"]:
+                    manifest.set(key, dict(previous, **entry))
+                report.file("skipped")
+                continue
+        entries[py_file] = entry
+
+    # O svg_flowchart desenha os SVGs a partir dos grafos, já nos processos de geração; nada vai para a fila
+    in_process = getattr(renderer, "renders_graphs", False)
+    flush_size = 1
+    if batch:
+        flush_size = getattr(renderer, "batch_size", 1) * getattr(renderer, "workers", 1)
+    render_queue = queue.Queue(maxsize=max(1, queue_size))
+    failures = []
+    render_errors = []
+    render_thread = threading.Thread(target=_render_worker,
+                                     args=(render_queue, renderer, flush_size, failures, render_errors, report))
+    render_thread.start()
+
+    pending = {}
+    try:
+        results = generate_jobs(list(entries), jobs, max_nodes=max_nodes, max_label=max_label, render_svg=in_process)
+        for py_file, file_jobs, error, times in results:
+            report.add_times(times)
+            report.log(f"📄 Processando: {py_file}")
+            if error is not None:
+                report.file("failed")
+                report.error(f"❌ Erro ao processar {py_file}: {error}")
+                continue
+            report.add_bytes(read=os.path.getsize(py_file),
+                             written=sum(os.path.getsize(mmd_path) for mmd_path, _ in file_jobs))
+            if not file_jobs:
+                report.file("unchanged")
+                report.log(f"⚠️ Nenhum elemento detectado em {py_file}, pulando.")
+                record(py_file, entries[py_file], [])
+            else:
+                report.count("diagrams", len(file_jobs))
+                pending[py_file] = file_jobs
+                for job in file_jobs:
+                    if in_process:
+                        report.count("svg")
+                        report.add_bytes(written=os.path.getsize(job[1]))
+                        report.log(f"✅ SVG gerado: {job[1]}")
+                    else:
+                        render_queue.put(job)
+    finally:
+        render_queue.put(None)
+        render_thread.join()
+
+    failed = {mmd_path for mmd_path, _ in failures}
+    for py_file, file_jobs in pending.items():
+        if any(mmd_path in failed for mmd_path, _ in file_jobs):
+            report.file("failed")
+        else:
+            report.file("changed")
+            record(py_file, entries[py_file], [path for job in file_jobs for path in job])
+    if render_errors:
+        raise render_errors[0]
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gera fluxogramas Mermaid (.mmd e .svg) para arquivos .py.")
+    parser.add_argument("--renderer", choices=RENDERERS, default="mmdc",
+                        help="gera os SVGs com o mermaid-cli (mmdc) ou com o renderizador em Python puro (svg)")
+    parser.add_argument("--batch", action="store_true",
+                        help="gera todos os .mmd primeiro e renderiza em lotes, reaproveitando o mmdc")
+    parser.add_argument("--batch-size", type=int, default=200,
+                        help="número de diagramas por processo do mmdc no modo --batch")
+    parser.add_argument("--render-workers", type=int, default=1,
+                        help="número de processos do mmdc em paralelo no modo --batch")
+    parser.add_argument("--mmdc", default="mmdc", help="comando do mermaid-cli")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="número de processos para gerar os .mmd (0 = número de CPUs)")
+    parser.add_argument("--max-nodes", type=int, default=DEFAULT_MAX_NODES,
+                        help="orçamento de nós por diagrama; acima dele os diagramas são resumidos (0 = sem limite)")
+    parser.add_argument("--max-label", type=int, default=DEFAULT_MAX_LABEL,
+                        help="número máximo de caracteres por label (0 = sem limite)")
+    parser.add_argument("--force", action="store_true",
+                        help="regenera todos os diagramas, mesmo os que não mudaram")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="não lê nem grava o manifesto de cache")
+    add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = RunReport("diagram", verbose=args.verbose)
+    with report_stdout(args.report):
+        print("🔍 Procurando arquivos .py...")
+        with report.stage("walk"):
+            py_files = find_python_files()
+
+        renderer = create_renderer(args.renderer, args.mmdc, args.batch, args.batch_size, args.render_workers)
+        manifest = None
+        if not args.no_cache:
+            manifest = Manifest(MANIFEST_NAME, version=generator_version(renderer))
+            if args.force:
+                manifest.stale = True
+            remove_orphan_outputs(manifest, report=report)
+
+        try:
+            jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+            failures = update_diagrams(py_files, renderer, manifest, batch=args.batch, jobs=jobs,
+                                       max_nodes=args.max_nodes or None, max_label=args.max_label or None,
+                                       report=report)
+        finally:
+            if manifest is not None:
+                manifest.save()
+            report.finish(args.report)
+        if failures:
+            print(f"❌ {len(failures)} diagrama(s) falharam na renderização.")
+            return 1
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,46 @@
 # -*- coding: utf-8 -*-
 
+import argparse
+import errno
 import os
 import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from file_manifest import Manifest, file_digest
+from run_report import RunReport, add_arguments, report_stdout
+from tree_walker import walk_tree
+
+# Manifesto com o estado dos arquivos do template e das cópias já sincronizadas
+SYNC_MANIFEST_NAME = '.template_sync.json'
+# Registro, em cada diretório raiz, dos arquivos e pastas criados pela ferramenta
+LEDGER_NAME = '.template_sync_ledger.json'
+# Arquivos de configuração que são mantidos idênticos aos do template
+CONFIG_FILES = ['.gitignore', '.gitattributes']
+# Número padrão de cópias simultâneas
+DEFAULT_COPY_WORKERS = 8
+# Bytes copiados por chamada de copy_file_range/sendfile/read
+COPY_CHUNK_SIZE = 1 << 24
+# Diretório que contém os arquivos e pastas a serem copiados
+DEFAULT_TEMPLATE_DIR = 'TEMPLATE'
+# Lista de pastas e arquivos para copiar
+DEFAULT_SOURCE_FILES = ['figures',
+                        '.gitattributes',
+                        '.gitignore',
+                        'CHANGES.txt',
+                        'copy_files_to_non_empty_dirs.py',
+                        'file_manifest.py',
+                        'tree_walker.py',
+                        'notebook_export.py',
+                        'run_report.py',
+                        'convert_md_to_ipynb_and_py.py',
+                        'convert_ipynb_to_md_and_py.py',
+                        'LICENSE.txt']
+# Lista de diretórios raiz onde as cópias serão feitas
+DEFAULT_TARGET_ROOTS = ['android', 'debian', 'mac_os', 'ubuntu']
+
 def should_process_directory(dirpath):
     """
     Verifica se o diretório deve ser processado, ignorando diretórios ocultos e .git.
@@ -14,74 +51,440 @@ def should_process_directory(dirpath):
     # Ignorar diretórios ocultos e .git
     return not (os.path.basename(dirpath).startswith('.') or '.git' in dirpath)
 
-def contains_readme_or_git(dirpath):
+def contains_readme_or_git(dirpath, names=None):
     """
     Verifica se o diretório contém um arquivo README ou um diretório .git.
     
     :param dirpath: Caminho do diretório a ser verificado
+    :param names: Nomes das entradas do diretório, se já conhecidos (evita um novo os.listdir)
     :return: True se o diretório contém README ou .git, False caso contrário
     """
-    for item in os.listdir(dirpath):
+    for item in os.listdir(dirpath) if names is None else names:
         if item.lower().startswith('readme') or item == '.git':
             return True
     return False
 
-def copy_files_to_non_empty_dir(template_dir, source_files, target_roots):
+def _copy_fd(infd, outfd):
+    """
+    Copia o conteúdo entre descritores, usando cópia no kernel quando disponível.
+
+    Tenta os.copy_file_range (cópia sem passar pelo espaço do usuário e, em
+    alguns sistemas de arquivos, sem copiar blocos), depois os.sendfile (só no
+    Linux: no macOS e nos BSDs o destino precisa ser um socket e offset=None
+    não é aceito) e, por fim, leitura e escrita comuns. Cada alternativa continua da posição atual
+    dos descritores, então uma falha no meio do caminho não duplica dados.
+    """
+    for name in ('copy_file_range', 'sendfile'):
+        func = getattr(os, name, None)
+        if func is None or (name == 'sendfile' and not sys.platform.startswith('linux')):
+            continue
+        try:
+            while True:
+                if name == 'copy_file_range':
+                    copied = func(infd, outfd, COPY_CHUNK_SIZE)
+                else:
+                    copied = func(outfd, infd, None, COPY_CHUNK_SIZE)
+                if copied == 0:
+                    return
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.ENOTSUP,
+                               errno.ENOTSOCK):
+                raise
+    while True:
+        chunk = os.read(infd, COPY_CHUNK_SIZE)
+        if not chunk:
+            return
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(outfd, view):]
+
+def fast_copy_file(src, dst):
+    """
+    Copia um arquivo (conteúdo e permissões) de forma atômica.
+
+    O conteúdo é gravado em um arquivo temporário no diretório de destino,
+    que depois substitui dst com os.replace; quem lê dst nunca vê uma cópia
+    pela metade.
+    
+    :param src: Caminho do arquivo de origem
+    :param dst: Caminho do arquivo de destino
+    :return: dst
+    """
+    directory = os.path.dirname(os.path.abspath(dst))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(dst) + '.', suffix='.tmp', dir=directory)
+    try:
+        infd = os.open(src, os.O_RDONLY)
+        try:
+            _copy_fd(infd, fd)
+        finally:
+            os.close(infd)
+        os.close(fd)
+        fd = None
+        shutil.copymode(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if fd is not None:
+            os.close(fd)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return dst
+
+def matches_template(target_path, manifest, source_state):
+    """
+    Verifica se o arquivo de destino tem o mesmo conteúdo do arquivo do template.
+
+    O estado do destino (tamanho, mtime e hash) fica registrado no manifesto,
+    de modo que, nas execuções seguintes, um destino inalterado é reconhecido
+    apenas pelo os.stat, sem ser lido novamente.
+
+    :param target_path: Caminho do arquivo de destino
+    :param manifest: Manifesto de sincronização
+    :param source_state: Entrada do manifesto (size, mtime_ns, sha256) do arquivo do template
+    :return: True se o destino existe e é idêntico ao template
+    """
+    if not os.path.isfile(target_path):
+        return False
+    key = 'target:' + os.path.abspath(target_path)
+    _, target_state = manifest.lookup(key, target_path)
+    manifest.set(key, target_state)
+    return target_state['sha256'] == source_state['sha256']
+
+def sync_file(item_path, target_path, manifest, source_state):
+    """
+    Copia um arquivo do template somente se o conteúdo do destino for diferente.
+
+    :param item_path: Caminho do arquivo no template
+    :param target_path: Caminho do arquivo de destino
+    :param manifest: Manifesto de sincronização
+    :param source_state: Entrada do manifesto (size, mtime_ns, sha256) do arquivo do template
+    :return: True se o arquivo foi copiado, False se já estava idêntico
+    """
+    if matches_template(target_path, manifest, source_state):
+        return False
+
+    fast_copy_file(item_path, target_path)
+    st = os.stat(target_path)
+    key = 'target:' + os.path.abspath(target_path)
+    manifest.set(key, {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': source_state['sha256']})
+    return True
+
+def copy_if_missing(item_path, target_path):
+    """
+    Copia um arquivo ou pasta do template somente se o destino ainda não existir.
+    
+    :return: True se algo foi copiado
+    """
+    if os.path.exists(target_path):
+        return False
+    if os.path.isdir(item_path):
+        shutil.copytree(item_path, target_path, copy_function=fast_copy_file, dirs_exist_ok=True)
+    else:
+        fast_copy_file(item_path, target_path)
+    return True
+
+def path_state(path):
+    """
+    Descreve o conteúdo de um arquivo ou pasta para o registro de arquivos criados.
+
+    :param path: Caminho do arquivo ou pasta
+    :return: {'kind': 'file', 'sha256': ...} ou {'kind': 'dir', 'files': {caminho relativo: sha256}}
+    """
+    if not os.path.isdir(path):
+        return {'kind': 'file', 'sha256': file_digest(path)}
+    files = {}
+    for listing in walk_tree(path, prune=(), gitignore=False, prune_venvs=False):
+        for entry in listing.files:
+            files[os.path.relpath(entry.path, path)] = file_digest(entry.path)
+    return {'kind': 'dir', 'files': files}
+
+def path_size(path):
+    """
+    Calcula o tamanho em bytes de um arquivo ou de todos os arquivos de uma pasta.
+    """
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(entry.stat().st_size
+               for listing in walk_tree(path, prune=(), gitignore=False, prune_venvs=False)
+               for entry in listing.files)
+
+class CopyTask:
+    """
+    Uma ação do plano de sincronização.
+
+    :param message: Mensagem impressa se a ação alterar algo (None para não imprimir)
+    :param func: Função executada; retorna verdadeiro se alterou algo
+    :param args: Argumentos da função
+    :param created: Tupla (ledger, chave, caminho) quando a ação cria um caminho que deve ser registrado no ledger
+    """
+    __slots__ = ('message', 'func', 'args', 'created')
+
+    def __init__(self, message, func, args, created=None):
+        self.message = message
+        self.func = func
+        self.args = args
+        self.created = created
+
+class SyncPlan:
+    """
+    Plano de uma sincronização: o que copiar e o que remover, montado com uma única varredura.
+
+    :ivar program_dirs: Diretórios de programa encontrados, por diretório raiz
+    :ivar copies: Cópias (CopyTask), executadas em paralelo
+    :ivar followups: Ações que dependem das cópias (criação do CHANGES.txt)
+    :ivar removals: Tuplas (ledger, chave, caminho) dos caminhos criados pela ferramenta que devem ser removidos
+    :ivar ledgers: Ledger de cada diretório raiz
+    """
+
+    def __init__(self):
+        self.program_dirs = {}
+        self.copies = []
+        self.followups = []
+        self.removals = []
+        self.ledgers = {}
+
+    def describe(self):
+        """
+        Imprime o plano sem executar nada.
+        """
+        for target_root, program_dirs in self.program_dirs.items():
+            print(f"{target_root}: {len(program_dirs)} program folder(s)")
+        for task in self.copies:
+            print(f"[dry-run] {task.message}")
+        for task in self.followups:
+            if task.message:
+                print(f"[dry-run] {task.message}")
+        for _, _, path in self.removals:
+            print(f"[dry-run] Remove {path}")
+        print(f"[dry-run] {len(self.copies)} copy(ies), {len(self.removals)} removal(s)")
+
+def run_copy_tasks(tasks, max_workers=DEFAULT_COPY_WORKERS, report=None):
+    """
+    Executa as tarefas de cópia em um pool de threads.
+
+    As cópias são limitadas pela latência de E/S (principalmente em sistemas
+    de arquivos de rede), por isso várias delas em paralelo aumentam a vazão.
+    As mensagens são impressas, e os caminhos criados registrados no ledger,
+    pela thread principal, conforme cada tarefa termina.
+
+    :param tasks: Lista de CopyTask
+    :param max_workers: Número máximo de cópias simultâneas (1 = execução serial)
+    :param report: RunReport que recebe contadores, bytes e mensagens (padrão: uma mensagem por cópia)
+    :return: Número de tarefas que falharam
+    """
+    if report is None:
+        report = RunReport('sync', verbose=True, stream=sys.stdout)
+    failures = 0
+    if max_workers <= 1:
+        results = ((task, _run_task(task.func, task.args)) for task in tasks)
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = [(task, executor.submit(_run_task, task.func, task.args)) for task in tasks]
+        results = ((task, future.result()) for task, future in futures)
+    try:
+        for task, (done, error) in results:
+            if error is not None:
+                failures += 1
+                report.file('failed')
+                report.error(f"Error running {task.func.__name__}{task.args}: {error}")
+            elif done:
+                if task.created is not None:
+                    ledger, key, path = task.created
+                    ledger.set(key, path_state(path))
+                    size = path_size(path)
+                    report.add_bytes(read=size, written=size)
+                report.file('changed')
+                if task.message:
+                    report.log(task.message)
+            else:
+                report.file('unchanged')
+    finally:
+        if max_workers > 1:
+            executor.shutdown()
+    return failures
+
+def _run_task(func, args):
+    try:
+        return func(*args), None
+    except Exception as e:
+        return False, e
+
+def load_template_state(template_dir, source_files, manifest):
+    """
+    Calcula (uma vez por execução) o hash dos arquivos de configuração do template.
+
+    :return: Dicionário {item de source_files: entrada do manifesto}
+    """
+    template_state = {}
+    for item in source_files:
+        item_path = os.path.join(template_dir, item)
+        if os.path.basename(item_path) in CONFIG_FILES and os.path.isfile(item_path):
+            key = 'template:' + os.path.abspath(item_path)
+            _, template_state[item] = manifest.lookup(key, item_path)
+            manifest.set(key, template_state[item])
+    return template_state
+
+def copy_files_to_non_empty_dir(template_dir, source_files, target_roots, manifest_path=None,
+                                max_workers=DEFAULT_COPY_WORKERS, dry_run=False, report=None):
     """
     Copia arquivos especificados para subpastas dos diretórios alvo que possuem pelo menos um arquivo README ou um diretório .git.
     Adiciona a data de modificação da pasta que está recebendo os arquivos ao arquivo CHANGES.txt se ele não existir.
     Exclui arquivos copiados para subsubpastas.
     
+    Os arquivos de configuração (.gitignore e .gitattributes) só são copiados
+    quando diferem do template, comparando-os pelo manifesto de sincronização.
+    As cópias de todos os diretórios e de todas as raízes são feitas em paralelo.
+    
+    Tudo o que a ferramenta cria é registrado em um ledger por diretório raiz
+    (LEDGER_NAME). Somente esses caminhos, e apenas se continuarem idênticos ao
+    que foi gravado, são removidos quando deixam de estar em um diretório de
+    programa; arquivos do usuário com o mesmo nome nunca são apagados.
+    
     :param template_dir: Diretório que contém os arquivos e pastas a serem copiados
     :param source_files: Lista de arquivos e/ou pastas para copiar
     :param target_roots: Lista de diretórios raiz onde as cópias serão feitas
+    :param manifest_path: Caminho do manifesto de sincronização (padrão: SYNC_MANIFEST_NAME dentro de template_dir)
+    :param max_workers: Número máximo de cópias simultâneas
+    :param dry_run: Se True, apenas imprime o plano, sem alterar nada no disco
+    :param report: RunReport que recebe tempos, contadores e mensagens (padrão: uma mensagem por ação)
+    :return: O plano executado (SyncPlan)
+    """
+    if report is None:
+        report = RunReport('sync', verbose=True, stream=sys.stdout)
+    manifest = Manifest(manifest_path or os.path.join(template_dir, SYNC_MANIFEST_NAME), version='1')
+    with report.stage('hash'):
+        template_state = load_template_state(template_dir, source_files, manifest)
+
+    plan = SyncPlan()
+    with report.stage('walk'):
+        for target_root in target_roots:
+            plan_target_root(template_dir, source_files, target_root, manifest, template_state, plan, report)
+
+    if dry_run:
+        plan.describe()
+        return plan
+
+    try:
+        with report.stage('copy'):
+            run_copy_tasks(plan.copies, max_workers, report)
+            # CHANGES.txt só é criado depois que a cópia do template (se houver) terminou
+            run_copy_tasks(plan.followups, max_workers, report)
+        with report.stage('remove'):
+            apply_removals(plan.removals, report)
+    finally:
+        manifest.save()
+        for ledger in plan.ledgers.values():
+            ledger.save()
+    return plan
+
+def plan_target_root(template_dir, source_files, target_root, manifest, template_state, plan, report=None):
+    """
+    Percorre um diretório raiz uma única vez e acrescenta ao plano as cópias e remoções necessárias.
+    
+    :param template_dir: Diretório que contém os arquivos e pastas a serem copiados
+    :param source_files: Lista de arquivos e/ou pastas para copiar
+    :param target_root: Diretório raiz onde as cópias serão feitas
+    :param manifest: Manifesto de sincronização
+    :param template_state: Estado dos arquivos de configuração do template, por item de source_files
+    :param plan: SyncPlan que recebe as ações
+    :param report: RunReport que recebe contadores e mensagens (padrão: uma mensagem por pasta)
     """
-    for target_root in target_roots:
-        program_dirs = []
-        for dirpath, dirnames, filenames in os.walk(target_root):
-            if should_process_directory(dirpath):
-                if contains_readme_or_git(dirpath):
-                    print(f"\nProcessing folder: {dirpath}\n")
-                    program_dirs.append(dirpath)
-                    for item in source_files:
-                        item_path = os.path.join(template_dir, item)
-                        target_item_path = os.path.join(dirpath, os.path.basename(item))
-                        
-                        if os.path.isfile(item_path):
-                            # Sobrescrever apenas arquivos de configuração
-                            if os.path.basename(item_path) in ['.gitignore', '.gitattributes']:
-                                shutil.copy(item_path, dirpath)
-                                print(f"File {item} copied to {dirpath}")
-                            # Não sobrescrever outros arquivos se já existirem
-                            elif not os.path.exists(target_item_path):
-                                shutil.copy(item_path, dirpath)
-                                print(f"File {item} copied to {dirpath}")
-                        elif os.path.isdir(item_path):
-                            # Copiar pastas somente se não existirem
-                            if not os.path.exists(target_item_path):
-                                shutil.copytree(item_path, target_item_path, dirs_exist_ok=True)
-                                print(f"Folder {item} copied to {dirpath}")
-                    update_changes_file_if_not_exists(dirpath)
-
-        # Remover arquivos copiados erroneamente para subpastas
-        for dirpath, dirnames, filenames in os.walk(target_root):
-            if dirpath not in program_dirs and should_process_directory(dirpath):
+    if report is None:
+        report = RunReport('sync', verbose=True, stream=sys.stdout)
+    ledger = Manifest(os.path.join(target_root, LEDGER_NAME), version='1')
+    plan.ledgers[target_root] = ledger
+    program_dirs = plan.program_dirs.setdefault(target_root, set())
+
+    def created(path):
+        return ledger, os.path.relpath(path, target_root), path
+
+    # Como na varredura original, só os diretórios ocultos (inclusive .git) são podados: pastas de programa
+    # ignoradas pelo git, em DEFAULT_PRUNE ou em ambientes virtuais continuam sendo encontradas
+    for listing in walk_tree(target_root, prune=(), prune_hidden=True, gitignore=False, prune_venvs=False):
+        dirpath = listing.path
+        if should_process_directory(dirpath):
+            if contains_readme_or_git(dirpath, listing.names):
+                report.log(f"\nProcessing folder: {dirpath}\n")
+                report.count('program_dirs')
+                program_dirs.add(os.path.normpath(dirpath))
+                names = set(listing.names)
                 for item in source_files:
-                    item_name = os.path.basename(item)
-                    target_item_path = os.path.join(dirpath, item_name)
-                    if os.path.isfile(target_item_path) and not (os.path.basename(target_item_path) in ['.gitignore', '.gitattributes']):
-                        os.remove(target_item_path)
-                        print(f"Removed file {target_item_path}")
-                    elif os.path.isdir(target_item_path):
-                        shutil.rmtree(target_item_path)
-                        print(f"Removed folder {target_item_path}")
+                    item_path = os.path.join(template_dir, item)
+                    target_item_path = os.path.join(dirpath, os.path.basename(item))
+                    exists = os.path.basename(item) in names
+                    planned = len(plan.copies)
+                    report.file('seen')
+                    
+                    if os.path.isfile(item_path):
+                        # Sobrescrever apenas arquivos de configuração
+                        if os.path.basename(item_path) in CONFIG_FILES:
+                            if not matches_template(target_item_path, manifest, template_state[item]):
+                                plan.copies.append(CopyTask(
+                                    f"File {item} copied to {dirpath}", sync_file,
+                                    (item_path, target_item_path, manifest, template_state[item]),
+                                    None if exists else created(target_item_path)))
+                        # Não sobrescrever outros arquivos se já existirem
+                        elif not exists:
+                            plan.copies.append(CopyTask(f"File {item} copied to {dirpath}", copy_if_missing,
+                                                        (item_path, target_item_path), created(target_item_path)))
+                    elif os.path.isdir(item_path):
+                        # Copiar pastas somente se não existirem
+                        if not exists:
+                            plan.copies.append(CopyTask(f"Folder {item} copied to {dirpath}", copy_if_missing,
+                                                        (item_path, target_item_path), created(target_item_path)))
+                    if len(plan.copies) == planned:
+                        report.file('skipped')
+                copies_changes_file = any(os.path.basename(item) == 'CHANGES.txt' and os.path.isfile(os.path.join(template_dir, item))
+                                          for item in source_files)
+                if 'CHANGES.txt' not in names and not copies_changes_file:
+                    changes_file_path = os.path.join(dirpath, 'CHANGES.txt')
+                    plan.followups.append(CopyTask(f"File CHANGES.txt created in {dirpath}",
+                                                   update_changes_file_if_not_exists,
+                                                   (dirpath, report), created(changes_file_path)))
+
+    # Remover o que a própria ferramenta criou em pastas que não são (mais) diretórios de programa
+    for key in sorted(ledger.entries):
+        path = os.path.join(target_root, key)
+        if os.path.normpath(os.path.dirname(path)) in program_dirs:
+            continue
+        if not os.path.lexists(path):
+            ledger.remove(key)
+        elif os.path.basename(path) in CONFIG_FILES:
+            continue
+        elif path_state(path) != ledger.get(key):
+            report.error(f"Keeping {path}: modified since it was copied")
+        else:
+            plan.removals.append((ledger, key, path))
+
+def apply_removals(removals, report=None):
+    """
+    Remove os caminhos do plano e os retira do ledger.
+    
+    :param removals: Tuplas (ledger, chave, caminho)
+    :param report: RunReport que recebe contadores e mensagens (padrão: uma mensagem por remoção)
+    """
+    if report is None:
+        report = RunReport('sync', verbose=True, stream=sys.stdout)
+    for ledger, key, path in removals:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+            report.log(f"Removed folder {path}")
+        else:
+            os.remove(path)
+            report.log(f"Removed file {path}")
+        report.count('removed')
+        ledger.remove(key)
 
-def update_changes_file_if_not_exists(dirpath):
+def update_changes_file_if_not_exists(dirpath, report=None):
     """
     Cria o arquivo CHANGES.txt com a data de modificação do diretório se ele não existir.
     
     :param dirpath: Diretório cujo arquivo CHANGES.txt será criado
+    :param report: RunReport que recebe as mensagens (padrão: uma mensagem por pasta)
+    :return: True se o arquivo foi criado
     """
+    if report is None:
+        report = RunReport('sync', verbose=True, stream=sys.stdout)
     changes_file_path = os.path.join(dirpath, 'CHANGES.txt')
     
     if not os.path.exists(changes_file_path):
@@ -93,22 +496,45 @@ def update_changes_file_if_not_exists(dirpath):
             f.write("==============================\n\n")
             f.write(f"**Revisão 0** - {mod_date}\n")
             f.write(f"- Pasta modificada em {mod_date}.\n")
-    else:
-        print(f"CHANGES.txt already exists in {dirpath}, not modified.")
-
-# Exemplo de uso
-template_dir = 'TEMPLATE'  # Diretório que contém os arquivos e pastas a serem copiados
-source_files = ['figures',
-                '.gitattributes',
-                '.gitignore',
-                'CHANGES.txt',
-                'copy_files_to_non_empty_dirs.py',
-                'convert_md_to_ipynb_and_py.py',
-                'convert_ipynb_to_md_and_py.py',
-                'LICENSE.txt']  # Lista de pastas e arquivos para copiar
-target_roots = ['android', 'debian', 'mac_os', 'ubuntu']  # Lista de diretórios raiz onde as cópias serão feitas
-
-copy_files_to_non_empty_dir(template_dir, source_files, target_roots)
+        return True
+    report.log(f"CHANGES.txt already exists in {dirpath}, not modified.")
+    return False
+
+def main(argv=None):
+    """
+    Sincroniza o template com os diretórios de programa das raízes indicadas.
+
+    :param argv: Argumentos de linha de comando (padrão: sys.argv[1:])
+    :return: Código de saída
+    """
+    parser = argparse.ArgumentParser(description='Copia os arquivos do template para os diretórios de programa.')
+    parser.add_argument('target_roots', nargs='*', default=DEFAULT_TARGET_ROOTS,
+                        help='diretórios raiz onde as cópias serão feitas (padrão: %(default)s)')
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE_DIR,
+                        help='diretório que contém os arquivos e pastas a serem copiados (padrão: %(default)s)')
+    parser.add_argument('--file', dest='source_files', action='append',
+                        help='arquivo ou pasta do template a copiar; pode ser repetido (padrão: DEFAULT_SOURCE_FILES)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_COPY_WORKERS,
+                        help='número máximo de cópias simultâneas (1 = serial)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='apenas imprime o que seria copiado e removido, sem alterar nada')
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    report = RunReport('sync', verbose=args.verbose)
+    with report_stdout(args.report):
+        try:
+            copy_files_to_non_empty_dir(args.template, args.source_files or DEFAULT_SOURCE_FILES, args.target_roots,
+                                        max_workers=args.workers, dry_run=args.dry_run, report=report)
+        finally:
+            report.finish(args.report)
+        if not args.dry_run:
+            print(f"Summary: {report.files['changed']} copied, {report.files['skipped']} already up to date, "
+                  f"{report.counters.get('removed', 0)} removed, {report.files['failed']} error(s)")
+        return 1 if report.files['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
 
 # Referências
 
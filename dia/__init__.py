@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+Ferramentas do template de documentação: sincronização do template, busca,
+conversão entre notebooks e Markdown, fluxogramas e filtro de notebooks do git.
+
+As funções continuam nos módulos de cada ferramenta (por exemplo,
+convert_md_to_ipynb_and_py.markdown_to_notebook) e podem ser importadas
+diretamente; este pacote contém apenas a interface de linha de comando `dia`.
+"""
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Interface de linha de comando `dia`, que reúne as ferramentas em subcomandos.
+
+Uso: dia <subcomando> [argumentos], por exemplo `dia md2nb --emit ipynb` ou
+`dia search -e palavra`; `dia <subcomando> --help` mostra as opções de cada um.
+
+O módulo de cada subcomando só é importado quando ele é executado, e nenhum
+módulo faz trabalho ao ser importado, de modo que dependências pesadas como o
+nbconvert só são carregadas pelos subcomandos que as usam.
+"""
+import importlib
+import os
+import sys
+
+# Subcomando -> (módulo com a função main, descrição)
+COMMANDS = {
+    'sync': ('copy_files_to_non_empty_dirs', 'copia os arquivos do template para os diretórios de programa'),
+    'search': ('find_files_with_keyword', 'procura palavras-chave ou expressões regulares nos arquivos'),
+    'nb2md': ('convert_ipynb_to_md_and_py', 'converte os arquivos README.ipynb para .md e .py'),
+    'md2nb': ('convert_md_to_ipynb_and_py', 'converte os arquivos .md para .ipynb e .py'),
+    'diagram': ('convert_py_to_mmd_and_svg', 'gera fluxogramas Mermaid (.mmd e .svg) para os arquivos .py'),
+    'filter': ('filter_nb_metadata', 'filtro clean do git para notebooks'),
+    'watch': ('watch_and_convert', 'sincroniza notebooks, Markdown e fluxogramas continuamente'),
+    'build': ('build_docs', 'reconstrói notebooks, Markdown e fluxogramas desatualizados'),
+}
+
+
+def usage():
+    """
+    Monta o texto de ajuda com a lista de subcomandos.
+
+    :return: Texto de ajuda
+    """
+    width = max(len(name) for name in COMMANDS)
+    lines = ['uso: dia <subcomando> [argumentos]', '', 'subcomandos:']
+    lines += [f'  {name:<{width}}  {description}' for name, (_, description) in COMMANDS.items()]
+    lines += ['', 'Use "dia <subcomando> --help" para ver as opções de cada subcomando.']
+    return '\n'.join(lines)
+
+
+def run(command, argv):
+    """
+    Importa o módulo do subcomando e executa a sua função main.
+
+    :param command: Nome do subcomando (uma chave de COMMANDS)
+    :param argv: Argumentos repassados ao subcomando
+    :return: Código de saída
+    """
+    module = importlib.import_module(COMMANDS[command][0])
+    if command == 'search':
+        # Instalado, o script não fica na pasta do projeto: a busca parte do diretório atual
+        return module.main(argv, root=os.getcwd())
+    return module.main(argv)
+
+
+def main(argv=None):
+    """
+    Ponto de entrada do comando `dia`.
+
+    :param argv: Argumentos de linha de comando (padrão: sys.argv[1:])
+    :return: Código de saída
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0 if argv else 2
+    command, argv = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f'dia: subcomando desconhecido: {command}\n\n{usage()}', file=sys.stderr)
+        return 2
+    return run(command, argv) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Manifesto persistente (JSON) para detectar arquivos alterados entre execuções.
+
+Cada entrada guarda tamanho, mtime e hash SHA-256 de um arquivo de origem,
+além de dados livres de quem a registrou (por exemplo, a lista de saídas
+geradas). Quando tamanho e mtime coincidem com os registrados, o hash não é
+recalculado, o que torna uma reexecução sem mudanças praticamente gratuita.
+"""
+import hashlib
+import json
+import os
+import secrets
+import stat
+import tempfile
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Calcula o hash SHA-256 do conteúdo de um arquivo.
+
+    :param path: Caminho do arquivo
+    :param chunk_size: Tamanho dos blocos lidos
+    :return: Hash em hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _create_temp(path):
+    """
+    Cria, no diretório de path, um arquivo temporário exclusivo.
+
+    Ao contrário do mkstemp (sempre 0600), o arquivo é criado com 0666 e o
+    próprio sistema aplica a umask, como em um open(path, 'w').
+
+    :return: Tupla (descritor aberto para escrita, caminho do temporário)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    prefix = '.' + os.path.basename(path) + '.'
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0)
+    for _ in range(tempfile.TMP_MAX):
+        tmp_path = os.path.join(directory, f'{prefix}{secrets.token_hex(4)}.tmp')
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f'nenhum nome temporário livre para {path}')
+
+
+def atomic_write(path, data, encoding='utf-8'):
+    """
+    Escreve um arquivo de forma atômica (arquivo temporário + os.replace).
+
+    O arquivo mantém as permissões do destino existente ou, se for novo, recebe
+    as mesmas de um open(path, 'w') (veja _create_temp).
+
+    :param path: Caminho do arquivo de destino
+    :param data: Conteúdo (str ou bytes)
+    :param encoding: Codificação usada quando data é str
+    """
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    fd, tmp_path = _create_temp(path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = None
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_if_changed(path, data, encoding='utf-8'):
+    """
+    Grava o arquivo (de forma atômica) somente se o conteúdo for diferente do atual.
+
+    Arquivos com o mesmo conteúdo não são tocados, preservando o mtime e sem
+    disparar observadores de arquivos.
+
+    :param path: Caminho do arquivo de destino
+    :param data: Conteúdo (str ou bytes)
+    :param encoding: Codificação usada quando data é str
+    :return: True se o arquivo foi gravado
+    """
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    atomic_write(path, data)
+    return True
+
+
+def output_state(path):
+    """
+    Estado de um arquivo gerado, para detectar alterações ou remoções posteriores.
+
+    :param path: Caminho do arquivo
+    :return: Dicionário com size e mtime_ns
+    """
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+class Manifest:
+    """
+    Manifesto de arquivos de origem associado a uma versão do gerador.
+
+    Se a versão gravada for diferente da atual, as entradas continuam
+    disponíveis (para localizar saídas órfãs), mas nenhuma é considerada
+    atualizada.
+
+    :param path: Caminho do arquivo JSON do manifesto
+    :param version: Identificador da versão de quem gera as saídas
+    """
+
+    def __init__(self, path, version=''):
+        self.path = path
+        self.version = version
+        self.entries = {}
+        self.stale = False
+        self._dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.entries = data.get('entries', {})
+        self.stale = data.get('version') != version
+        self._dirty = self.stale
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, entry):
+        self.entries[key] = entry
+        self._dirty = True
+
+    def remove(self, key):
+        if self.entries.pop(key, None) is not None:
+            self._dirty = True
+
+    def lookup(self, key, path, st=None):
+        """
+        Verifica se o arquivo mudou desde o registro no manifesto.
+
+        :param key: Chave da entrada
+        :param path: Caminho do arquivo de origem
+        :param st: Resultado de os.stat já obtido, se houver
+        :return: Tupla (inalterado, entrada) em que entrada já traz size, mtime_ns e sha256 atuais
+        """
+        st = st or os.stat(path)
+        entry = self.entries.get(key)
+        current = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        if entry and entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns:
+            current['sha256'] = entry.get('sha256')
+        else:
+            current['sha256'] = file_digest(path)
+        unchanged = bool(entry) and not self.stale and entry.get('sha256') == current['sha256']
+        return unchanged, current
+
+    def outputs_unchanged(self, key):
+        """
+        Verifica se as saídas registradas em entry['outputs'] continuam como foram gravadas.
+
+        :param key: Chave da entrada
+        :return: False se alguma saída sumiu ou mudou de tamanho ou mtime
+        """
+        entry = self.entries.get(key) or {}
+        outputs = entry.get('outputs')
+        if not outputs:
+            return False
+        for path, state in outputs.items():
+            try:
+                if output_state(path) != state:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def save(self):
+        if not self._dirty:
+            return
+        data = {'version': self.version, 'entries': self.entries}
+        atomic_write(self.path, json.dumps(data, indent=1, sort_keys=True, ensure_ascii=False))
+        self._dirty = False
@@ -1,11 +1,433 @@
 #!/usr/bin/env python3
+"""
+Filtro clean do git (filter=nbmetadata) que remove metadados e saídas indesejados dos notebooks.
 
+Uso como filtro simples (um interpretador por arquivo):
+
+    git config filter.nbmetadata.clean "python3 filter_nb_metadata.py"
+
+Uso como processo de longa duração (um único interpretador atende todos os
+arquivos de um git status/git add, pelo protocolo pkt-line versão 2):
+
+    git config filter.nbmetadata.process "python3 filter_nb_metadata.py --process"
+
+Com o pacote instalado, o mesmo filtro está disponível como `dia filter`:
+
+    git config filter.nbmetadata.process "dia filter --process"
+
+As regras vêm do arquivo .nbfilter.json na raiz do repositório (o git
+executa os filtros a partir dela) ou de --config. Sem configuração, apenas
+'jp-MarkdownHeadingCollapsed' é removida dos metadados das células.
+Exemplo com todas as opções:
+
+    {
+        "notebook_metadata_keys": ["widgets", "kernelspec.display_name"],
+        "cell_metadata_keys": ["jp-MarkdownHeadingCollapsed", "collapsed", "scrolled"],
+        "clear_execution_count": true,
+        "max_output_bytes": 100000,
+        "large_outputs": "truncate",
+        "max_attachment_bytes": 100000
+    }
+
+Chaves com ponto indicam caminhos dentro dos metadados. Saídas maiores que
+max_output_bytes (em JSON) são removidas ("drop") ou truncadas
+("truncate": textos são cortados e imagens e outros dados binários são
+substituídos por um aviso). Anexos de células markdown maiores que
+max_attachment_bytes são removidos. Os bytes economizados são informados
+em stderr ao fim de cada execução.
+
+Quando nenhuma regra tem o que remover e o notebook já está no formato
+gravado pelo Jupyter (chaves ordenadas, indentação 1), o conteúdo é
+devolvido sem ser serializado de novo (veja is_canonical).
+"""
+
+import argparse
+import os
+import re
 import sys
 import json
 
-nb = json.load(sys.stdin)
-for cell in nb['cells']:
-    if 'metadata' in cell:
-        cell['metadata'] = {k: v for k, v in cell['metadata'].items() if k != 'jp-MarkdownHeadingCollapsed'}
+COLLAPSED_KEY = 'jp-MarkdownHeadingCollapsed'
+# Arquivo de regras procurado no diretório em que o git executa o filtro
+CONFIG_NAME = '.nbfilter.json'
+# Detecta contadores de execução preenchidos sem decodificar o JSON
+EXECUTION_COUNT_PATTERN = re.compile(rb'"execution_count": *[0-9]')
+# Tipos MIME de saída mantidos (cortados) ao truncar; os demais são substituídos por um aviso
+TEXT_MIME_TYPES = ('text/plain', 'text/markdown', 'text/html', 'text/latex', 'application/json')
+# Aviso acrescentado ao fim dos textos truncados
+TRUNCATION_PATTERN = re.compile(r'\n\[\.\.\. [0-9]+ caracteres removidos por filter_nb_metadata\]\n')
+
+# Limite de dados em um pacote pkt-line (65520 bytes menos os 4 do cabeçalho)
+PKT_MAX_DATA = 65516
+FLUSH_PKT = b'0000'
+
+
+class UnsortedKeys(Exception):
+    """
+    Levantada por check_sorted_pairs ao encontrar um objeto JSON com as chaves fora de ordem.
+    """
+
+
+def check_sorted_pairs(pairs):
+    """
+    object_pairs_hook de json.loads que exige as chaves em ordem.
+    """
+    keys = [key for key, _ in pairs]
+    if keys != sorted(keys):
+        raise UnsortedKeys
+    return dict(pairs)
+
+
+def is_canonical(data):
+    """
+    Verifica se o notebook já está como este filtro o gravaria (sort_keys=True, indent=1, ensure_ascii=False).
+
+    O início do arquivo (a chave "cells" indentada com 1 espaço) e a ausência
+    de escapes \\u são conferidos nos bytes; a ordem das chaves, em todos os
+    níveis, por uma decodificação com check_sorted_pairs, bem mais barata que
+    serializar de novo. Não são conferidas a indentação dos níveis internos e
+    a grafia dos números reais, que não variam em arquivos gravados pelo
+    Jupyter ou pelo nbformat.
+
+    :param data: Conteúdo do notebook (bytes)
+    :return: True se o conteúdo pode ser devolvido sem ser serializado de novo
+    :raises ValueError: Se o conteúdo não for JSON válido
+    """
+    if not data.startswith(b'{\n "cells": [') or b'\\u' in data:
+        return False
+    try:
+        json.loads(data, object_pairs_hook=check_sorted_pairs)
+    except UnsortedKeys:
+        return False
+    return True
+
+
+class FilterRules:
+    """
+    Regras de limpeza de um notebook.
+
+    :param notebook_metadata_keys: Chaves removidas dos metadados do notebook
+    :param cell_metadata_keys: Chaves removidas dos metadados das células
+    :param clear_execution_count: Se True, apaga os contadores de execução
+    :param max_output_bytes: Tamanho máximo de uma saída, em bytes de JSON (None = sem limite)
+    :param large_outputs: O que fazer com saídas maiores: 'drop' ou 'truncate'
+    :param max_attachment_bytes: Tamanho máximo de um anexo de célula markdown (None = sem limite)
+    """
+
+    OPTIONS = ('notebook_metadata_keys', 'cell_metadata_keys', 'clear_execution_count',
+               'max_output_bytes', 'large_outputs', 'max_attachment_bytes')
+
+    def __init__(self, notebook_metadata_keys=(), cell_metadata_keys=(COLLAPSED_KEY,),
+                 clear_execution_count=False, max_output_bytes=None, large_outputs='truncate',
+                 max_attachment_bytes=None):
+        if large_outputs not in ('drop', 'truncate'):
+            raise ValueError(f"large_outputs deve ser 'drop' ou 'truncate', não {large_outputs!r}")
+        self.notebook_metadata_keys = [key.split('.') for key in notebook_metadata_keys]
+        self.cell_metadata_keys = [key.split('.') for key in cell_metadata_keys]
+        self.clear_execution_count = clear_execution_count
+        self.max_output_bytes = max_output_bytes
+        self.large_outputs = large_outputs
+        self.max_attachment_bytes = max_attachment_bytes
+        # Trechos cuja ausência no arquivo garante que as chaves não existem
+        self._key_markers = {f'"{path[-1]}"'.encode() for path in self.notebook_metadata_keys + self.cell_metadata_keys}
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Lê as regras de um arquivo JSON.
+
+        :param path: Caminho do arquivo; se None, usa CONFIG_NAME no diretório atual, se existir
+        :return: FilterRules (as regras padrão quando não há arquivo)
+        """
+        if path is None:
+            if not os.path.exists(CONFIG_NAME):
+                return cls()
+            path = CONFIG_NAME
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        unknown = set(config) - set(cls.OPTIONS)
+        if unknown:
+            raise ValueError(f"opções desconhecidas em {path}: {', '.join(sorted(unknown))}")
+        return cls(**config)
+
+    def needs_parse(self, data):
+        """
+        Verifica, sem decodificar o JSON, se alguma regra pode alterar o notebook.
+
+        :param data: Conteúdo do notebook (bytes)
+        :return: False somente quando é certo que nenhuma regra se aplica
+        """
+        if any(marker in data for marker in self._key_markers):
+            return True
+        if self.clear_execution_count and EXECUTION_COUNT_PATTERN.search(data):
+            return True
+        # Nenhuma saída ou anexo pode ser maior que o arquivo inteiro
+        limits = [limit for limit in (self.max_output_bytes, self.max_attachment_bytes) if limit is not None]
+        return any(len(data) > limit for limit in limits)
+
+    def apply(self, nb):
+        """
+        Aplica as regras ao notebook, alterando-o no lugar.
+
+        :param nb: Notebook decodificado (dict)
+        :return: True se alguma regra alterou o notebook
+        """
+        changed = False
+        for path in self.notebook_metadata_keys:
+            changed |= remove_key(nb.get('metadata'), path)
+        for cell in nb['cells']:
+            if 'metadata' in cell:
+                for path in self.cell_metadata_keys:
+                    changed |= remove_key(cell['metadata'], path)
+            if self.max_attachment_bytes is not None and cell.get('attachments'):
+                attachments = {name: attachment for name, attachment in cell['attachments'].items()
+                               if json_size(attachment) <= self.max_attachment_bytes}
+                changed |= len(attachments) != len(cell['attachments'])
+                cell['attachments'] = attachments
+            if cell.get('cell_type') != 'code':
+                continue
+            outputs = cell.get('outputs', [])
+            if self.clear_execution_count:
+                for item in [cell] + [output for output in outputs if 'execution_count' in output]:
+                    changed |= item.get('execution_count') is not None
+                    item['execution_count'] = None
+            if self.max_output_bytes is not None:
+                shrunk = [self.shrink_output(output) for output in outputs
+                          if self.large_outputs == 'truncate' or json_size(output) <= self.max_output_bytes]
+                changed |= len(shrunk) != len(outputs) or any(a is not b for a, b in zip(shrunk, outputs))
+                cell['outputs'] = shrunk
+        return changed
+
+    def shrink_output(self, output):
+        """
+        Trunca uma saída maior que max_output_bytes.
+
+        :param output: Saída de uma célula de código
+        :return: A própria saída, se couber no limite, ou uma versão reduzida
+        """
+        if json_size(output) <= self.max_output_bytes:
+            return output
+        limit = self.max_output_bytes
+        original, output = output, dict(output)
+        if 'text' in output:
+            output['text'] = truncate_text(output['text'], limit)
+        if 'traceback' in output:
+            output['traceback'] = [truncate_text(line, limit) for line in output['traceback']]
+        if 'data' in output:
+            data = {}
+            for mime, value in output['data'].items():
+                if mime in TEXT_MIME_TYPES and not isinstance(value, dict):
+                    data[mime] = truncate_text(value, limit)
+                elif json_size(value) <= limit:
+                    data[mime] = value
+                else:
+                    data.setdefault('text/plain', f'<{mime} removido por filter_nb_metadata: {json_size(value)} bytes>')
+            output['data'] = data
+        # Saídas já truncadas em execuções anteriores não contam como alteração
+        return original if output == original else output
+
+
+def json_size(value):
+    """
+    Tamanho aproximado, em bytes, de um valor serializado em JSON.
+    """
+    return len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+
+def truncate_text(text, limit):
+    """
+    Corta um texto (str ou lista de linhas, como no formato nbformat) em limit caracteres.
+    """
+    joined = ''.join(text) if isinstance(text, list) else text
+    if len(joined) <= limit or TRUNCATION_PATTERN.fullmatch(joined, limit):
+        # Textos já truncados em execuções anteriores ficam como estão
+        return text
+    joined = joined[:limit] + f'\n[... {len(joined) - limit} caracteres removidos por filter_nb_metadata]\n'
+    return joined.splitlines(True) if isinstance(text, list) else joined
+
+
+def remove_key(metadata, path):
+    """
+    Remove uma chave (ou caminho de chaves) de um dicionário de metadados, se existir.
+
+    :return: True se a chave existia
+    """
+    for key in path[:-1]:
+        if not isinstance(metadata, dict):
+            return False
+        metadata = metadata.get(key)
+    if isinstance(metadata, dict) and path[-1] in metadata:
+        del metadata[path[-1]]
+        return True
+    return False
+
+
+def clean_notebook(data, rules=None, stats=None):
+    """
+    Aplica as regras de limpeza a um notebook.
+
+    :param data: Conteúdo do notebook (bytes)
+    :param rules: FilterRules (padrão: remover COLLAPSED_KEY das células)
+    :param stats: Dicionário em que 'bytes_saved' é acumulado, se informado
+    :return: Conteúdo filtrado (bytes)
+    """
+    rules = rules or FilterRules()
+    if not rules.needs_parse(data) and is_canonical(data):
+        # Caminho rápido: json.dump não escreve a quebra de linha final que o Jupyter grava
+        return data[:-1] if data.endswith(b'}\n') else data
+
+    nb = json.loads(data)
+    changed = rules.apply(nb)
+    result = json.dumps(nb, sort_keys=True, indent=1, ensure_ascii=False).encode('utf-8')
+    if changed and stats is not None:
+        stats['bytes_saved'] = stats.get('bytes_saved', 0) + max(0, len(data) - len(result))
+    return result
+
+
+def report(stats):
+    """
+    Informa em stderr quantos bytes as regras removeram.
+    """
+    if stats.get('bytes_saved'):
+        print(f"filter_nb_metadata: {stats['bytes_saved']} bytes removidos", file=sys.stderr)
+
+
+def read_pkt_line(stream):
+    """
+    Lê um pacote pkt-line.
+
+    :param stream: Fluxo binário de entrada
+    :return: Conteúdo do pacote, None para um flush-pkt ou EOFError no fim da entrada
+    """
+    header = stream.read(4)
+    if not header:
+        raise EOFError
+    if len(header) < 4:
+        raise ValueError('pkt-line truncado')
+    length = int(header, 16)
+    if length == 0:
+        return None
+    if length < 4:
+        raise ValueError(f'tamanho de pkt-line inválido: {header!r}')
+    data = stream.read(length - 4)
+    if len(data) < length - 4:
+        raise ValueError('pkt-line truncado')
+    return data
+
+
+def read_pkt_lines(stream):
+    """
+    Lê pacotes até o próximo flush-pkt.
+
+    :param stream: Fluxo binário de entrada
+    :return: Lista com o conteúdo dos pacotes
+    """
+    packets = []
+    while True:
+        packet = read_pkt_line(stream)
+        if packet is None:
+            return packets
+        packets.append(packet)
+
+
+def read_pkt_text(stream):
+    """
+    Lê uma lista de pacotes de texto ("chave=valor\\n") até o flush-pkt.
+
+    :param stream: Fluxo binário de entrada
+    :return: Lista de linhas sem a quebra de linha final
+    """
+    return [packet.decode('utf-8').rstrip('\n') for packet in read_pkt_lines(stream)]
+
+
+def write_pkt_line(stream, data):
+    stream.write(b'%04x' % (len(data) + 4))
+    stream.write(data)
+
+
+def write_pkt_text(stream, *lines):
+    """
+    Escreve linhas de texto, uma por pacote, seguidas de um flush-pkt.
+    """
+    for line in lines:
+        write_pkt_line(stream, line.encode('utf-8') + b'\n')
+    stream.write(FLUSH_PKT)
+
+
+def write_pkt_content(stream, data):
+    """
+    Escreve um conteúdo binário dividido em pacotes, seguido de um flush-pkt.
+    """
+    for start in range(0, len(data), PKT_MAX_DATA):
+        write_pkt_line(stream, data[start:start + PKT_MAX_DATA])
+    stream.write(FLUSH_PKT)
+
+
+def run_process(stdin, stdout, rules=None, stats=None):
+    """
+    Atende o git pelo protocolo de filtro de longa duração (filter.<driver>.process).
+
+    :param stdin: Fluxo binário com as mensagens do git
+    :param stdout: Fluxo binário para as respostas
+    :param rules: FilterRules aplicadas a cada notebook
+    :param stats: Dicionário em que 'bytes_saved' é acumulado, se informado
+    """
+    # Apresentação: git-filter-client/version=2 -> git-filter-server/version=2
+    welcome = read_pkt_text(stdin)
+    if welcome[:1] != ['git-filter-client'] or 'version=2' not in welcome[1:]:
+        raise ValueError(f'apresentação inesperada do git: {welcome}')
+    write_pkt_text(stdout, 'git-filter-server', 'version=2')
+    stdout.flush()
+
+    # Capacidades: somente clean
+    capabilities = read_pkt_text(stdin)
+    if 'capability=clean' not in capabilities:
+        raise ValueError(f'o git não oferece a capacidade clean: {capabilities}')
+    write_pkt_text(stdout, 'capability=clean')
+    stdout.flush()
+
+    while True:
+        try:
+            header = read_pkt_text(stdin)
+        except EOFError:
+            return
+        request = dict(line.split('=', 1) for line in header if '=' in line)
+        content = b''.join(read_pkt_lines(stdin))
+        if request.get('command') != 'clean':
+            write_pkt_text(stdout, 'status=error')
+            stdout.flush()
+            continue
+        try:
+            result = clean_notebook(content, rules, stats)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Erro ao filtrar {request.get('pathname')}: {e}", file=sys.stderr)
+            write_pkt_text(stdout, 'status=error')
+        else:
+            write_pkt_text(stdout, 'status=success')
+            write_pkt_content(stdout, result)
+            # Lista vazia: mantém o status informado antes do conteúdo
+            stdout.write(FLUSH_PKT)
+        stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Filtro clean do git para notebooks.')
+    parser.add_argument('--process', action='store_true',
+                        help='atende o git pelo protocolo de filtro de longa duração')
+    parser.add_argument('--config', default=None,
+                        help=f'arquivo de regras (padrão: {CONFIG_NAME}, se existir)')
+    args = parser.parse_args(argv)
+
+    rules = FilterRules.load(args.config)
+    stats = {}
+    try:
+        if args.process:
+            run_process(sys.stdin.buffer, sys.stdout.buffer, rules, stats)
+        else:
+            sys.stdout.buffer.write(clean_notebook(sys.stdin.buffer.read(), rules, stats))
+    finally:
+        report(stats)
+
 
-json.dump(nb, sys.stdout, sort_keys=True, indent=1, ensure_ascii=False)
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,30 @@
 # -*- coding: utf-8 -*-
+import argparse
+import fnmatch
+import hashlib
 import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+from collections import namedtuple
+
+from tree_walker import iter_files
+
+# Índice de tokens, gravado na raiz do projeto
+INDEX_NAME = '.find_files_with_keyword.sqlite'
+# Tokens indexados: sequências de letras, dígitos e sublinhados
+TOKEN_PATTERN = re.compile(r'\w+')
+# Tamanho dos blocos lidos de cada arquivo na busca por padrões
+CHUNK_SIZE = 1 << 20
+# Sobreposição mantida ao partir linhas maiores que o bloco, para expressões regulares
+REGEX_OVERLAP = 4096
+# Trecho máximo de uma linha exibido em cada ocorrência
+MAX_LINE_DISPLAY = 400
+
+# Uma ocorrência de um padrão: arquivo, número da linha (a partir de 1), texto da linha e padrão
+Match = namedtuple('Match', 'path line_number line pattern')
 
 def find_files_with_keyword(directory, keyword):
     """
@@ -14,35 +39,557 @@ def find_files_with_keyword(directory, keyword):
     """
     matching_files = []
     
-    # Percorre todos os arquivos do diretório e subdiretórios
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.py'):
-                file_path = os.path.join(root, file)
-                # Abre e lê o conteúdo do arquivo
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        # Verifica se a palavra-chave está no conteúdo do arquivo
-                        if keyword in content:
-                            matching_files.append(file_path)
-                except Exception as e:
-                    print(f"Erro ao ler o arquivo {file_path}: {e}")
+    # Percorre todos os arquivos .py do diretório e subdiretórios
+    for entry in iter_files(directory, suffixes=('.py',)):
+        file_path = entry.path
+        # Abre e lê o conteúdo do arquivo
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+                # Verifica se a palavra-chave está no conteúdo do arquivo
+                if keyword in content:
+                    matching_files.append(file_path)
+        except Exception as e:
+            print(f"Erro ao ler o arquivo {file_path}: {e}")
     
     return matching_files
 
-# Diretório a partir do qual começar a busca (raiz do projeto)
-project_root_directory = os.path.dirname(os.path.abspath(__file__))
+def tokens(text):
+    """
+    Retorna o conjunto de tokens (sequências de letras, dígitos e sublinhados) de um texto.
+
+    :param text: Texto a ser decomposto.
+    :type text: str
+    :return: Conjunto de tokens.
+    :rtype: set
+    """
+    return set(TOKEN_PATTERN.findall(text))
+
+class KeywordIndex:
+    """
+    Índice invertido de tokens dos arquivos .py de um diretório, persistido em SQLite.
+
+    O índice é atualizado de forma incremental: arquivos com tamanho e mtime
+    iguais aos registrados não são relidos; arquivos alterados têm o hash
+    comparado e, se o conteúdo mudou, seus tokens são substituídos.
+
+    Uma palavra-chave é decomposta em tokens, que precisam aparecer no arquivo
+    inteiros, como prefixo ou como trecho de algum token, conforme estejam
+    delimitados na palavra-chave (o que também cobre buscas como "PoolExec").
+    Apenas os arquivos que passam nesse filtro são lidos para confirmar a
+    ocorrência.
+
+    :param directory: Diretório indexado.
+    :type directory: str
+    :param index_path: Caminho do banco SQLite (padrão: INDEX_NAME dentro de directory).
+    :type index_path: str
+    """
+
+    def __init__(self, directory, index_path=None):
+        self.directory = directory
+        self.connection = sqlite3.connect(index_path or os.path.join(directory, INDEX_NAME))
+        self.connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tokens (
+                token TEXT PRIMARY KEY
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS postings (
+                token TEXT NOT NULL,
+                file_id INTEGER NOT NULL,
+                PRIMARY KEY (token, file_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_file_id ON postings (file_id);
+        """)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def update(self):
+        """
+        Sincroniza o índice com os arquivos .py atuais do diretório.
+
+        :return: Número de arquivos (re)indexados.
+        :rtype: int
+        """
+        cursor = self.connection.cursor()
+        known = {path: (file_id, size, mtime_ns, sha256)
+                 for file_id, path, size, mtime_ns, sha256 in cursor.execute(
+                     'SELECT id, path, size, mtime_ns, sha256 FROM files')}
+        indexed = 0
+        seen = set()
+        for entry in iter_files(self.directory, suffixes=('.py',)):
+            path = os.path.relpath(entry.path, self.directory)
+            seen.add(path)
+            st = entry.stat()
+            row = known.get(path)
+            if row and row[1] == st.st_size and row[2] == st.st_mtime_ns:
+                continue
+            try:
+                with open(entry.path, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                print(f"Erro ao ler o arquivo {entry.path}: {e}")
+                continue
+            sha256 = hashlib.sha256(data).hexdigest()
+            if row and row[3] == sha256:
+                cursor.execute('UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?',
+                               (st.st_size, st.st_mtime_ns, row[0]))
+                continue
+            if row:
+                cursor.execute('DELETE FROM postings WHERE file_id = ?', (row[0],))
+                cursor.execute('UPDATE files SET size = ?, mtime_ns = ?, sha256 = ? WHERE id = ?',
+                               (st.st_size, st.st_mtime_ns, sha256, row[0]))
+                file_id = row[0]
+            else:
+                cursor.execute('INSERT INTO files (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)',
+                               (path, st.st_size, st.st_mtime_ns, sha256))
+                file_id = cursor.lastrowid
+            file_tokens = sorted(tokens(data.decode('utf-8', errors='replace')))
+            cursor.executemany('INSERT OR IGNORE INTO tokens (token) VALUES (?)',
+                               ((token,) for token in file_tokens))
+            cursor.executemany('INSERT INTO postings (token, file_id) VALUES (?, ?)',
+                               ((token, file_id) for token in file_tokens))
+            indexed += 1
+
+        removed = known.keys() - seen
+        for path in removed:
+            file_id = known[path][0]
+            cursor.execute('DELETE FROM postings WHERE file_id = ?', (file_id,))
+            cursor.execute('DELETE FROM files WHERE id = ?', (file_id,))
+        if removed or indexed:
+            # Descarta do vocabulário os tokens que não aparecem em mais nenhum arquivo
+            cursor.execute('DELETE FROM tokens WHERE NOT EXISTS '
+                           '(SELECT 1 FROM postings WHERE postings.token = tokens.token)')
+        self.connection.commit()
+        return indexed
+
+    def _files_with_token(self, token, exact_start, exact_end):
+        """
+        Retorna os ids dos arquivos com algum token compatível com um token da palavra-chave.
+
+        Um token delimitado dos dois lados na palavra-chave precisa existir inteiro
+        no arquivo; delimitado só à esquerda, como prefixo. Os demais casos exigem
+        percorrer o vocabulário.
+        """
+        if exact_start and exact_end:
+            query, args = 'SELECT file_id FROM postings WHERE token = ?', (token,)
+        elif exact_start:
+            query = 'SELECT DISTINCT file_id FROM postings WHERE token >= ? AND token < ?'
+            args = (token, token + '\U0010ffff')
+        else:
+            query = ('SELECT DISTINCT file_id FROM postings WHERE token IN '
+                     '(SELECT token FROM tokens WHERE instr(token, ?) > 0)')
+            args = (token,)
+        return {file_id for (file_id,) in self.connection.execute(query, args)}
+
+    def candidates(self, keyword):
+        """
+        Retorna os arquivos que podem conter a palavra-chave.
+
+        :param keyword: Palavra-chave procurada.
+        :type keyword: str
+        :return: Lista de caminhos relativos ao diretório indexado.
+        :rtype: list
+        """
+        keyword_tokens = [(match.group(), match.start() > 0, match.end() < len(keyword))
+                          for match in TOKEN_PATTERN.finditer(keyword)]
+        # Tokens que usam o índice diretamente bastam para filtrar; só sem eles o vocabulário é percorrido
+        indexed = [token for token in keyword_tokens if token[1]]
+        file_ids = None
+        for token, exact_start, exact_end in sorted(indexed or keyword_tokens, key=lambda t: -len(t[0])):
+            ids = self._files_with_token(token, exact_start, exact_end)
+            file_ids = ids if file_ids is None else file_ids & ids
+            if not file_ids:
+                return []
+
+        rows = self.connection.execute('SELECT id, path FROM files ORDER BY path')
+        # Palavras-chave sem nenhum token (por exemplo, "->") não podem ser filtradas pelo índice
+        return [path for file_id, path in rows if file_ids is None or file_id in file_ids]
+
+    def search(self, keyword):
+        """
+        Atualiza o índice e retorna os arquivos que contêm a palavra-chave.
+
+        :param keyword: Palavra-chave procurada.
+        :type keyword: str
+        :return: Lista de caminhos dos arquivos que contêm a palavra-chave.
+        :rtype: list
+        """
+        self.update()
+        matching_files = []
+        for path in self.candidates(keyword):
+            file_path = os.path.join(self.directory, path)
+            # Confirma a ocorrência, já que os tokens podem estar em posições diferentes
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    if keyword in f.read():
+                        matching_files.append(file_path)
+            except Exception as e:
+                print(f"Erro ao ler o arquivo {file_path}: {e}")
+        return matching_files
+
+def find_files_with_keyword_indexed(directory, keyword, index_path=None):
+    """
+    Equivalente a find_files_with_keyword, mas respondendo pelo índice de tokens persistente.
+
+    :param directory: Caminho do diretório a ser percorrido.
+    :type directory: str
+    :param keyword: Palavra-chave a ser procurada nos arquivos.
+    :type keyword: str
+    :param index_path: Caminho do banco SQLite (padrão: INDEX_NAME dentro de directory).
+    :type index_path: str
+    :return: Lista de caminhos dos arquivos que contêm a palavra-chave.
+    :rtype: list
+    """
+    with KeywordIndex(directory, index_path) as index:
+        return index.search(keyword)
+
+def compile_patterns(patterns, regex=False, ignore_case=False):
+    """
+    Compila os padrões de busca.
+
+    :param patterns: Padrões a procurar (texto literal ou expressões regulares).
+    :type patterns: list
+    :param regex: Se True, os padrões são expressões regulares; caso contrário, texto literal.
+    :type regex: bool
+    :param ignore_case: Se True, ignora maiúsculas e minúsculas.
+    :type ignore_case: bool
+    :return: Lista de tuplas (padrão original, expressão compilada).
+    :rtype: list
+    """
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return [(pattern, re.compile(pattern if regex else re.escape(pattern), flags)) for pattern in patterns]
+
+def _line_text(data, start, line_start):
+    """
+    Retorna o texto da linha que contém a posição start, limitado a MAX_LINE_DISPLAY caracteres.
+    """
+    line_end = data.find('\n', start)
+    if line_end == -1:
+        line_end = len(data)
+    if line_end - line_start > MAX_LINE_DISPLAY:
+        # Linhas enormes (arquivos gerados, minificados): mostra só um trecho em volta da ocorrência
+        line_start = max(line_start, start - MAX_LINE_DISPLAY // 4)
+        line_end = min(line_end, line_start + MAX_LINE_DISPLAY)
+    return data[line_start:line_end].rstrip('\r')
+
+def scan_file(path, patterns, chunk_size=CHUNK_SIZE, overlap=None):
+    """
+    Procura os padrões em um arquivo lido em blocos, sem carregá-lo inteiro na memória.
+
+    Cada bloco é cortado no último fim de linha e o resto é levado para o
+    bloco seguinte, de modo que as linhas são vistas inteiras. Uma linha maior
+    que o bloco é partida mantendo uma sobreposição de overlap caracteres, e
+    só são consideradas as ocorrências que começam antes do corte; os padrões
+    já relatados nessa linha são lembrados de um pedaço para o outro, e o
+    texto mostrado é o trecho em volta da primeira ocorrência.
+
+    :param path: Caminho do arquivo.
+    :type path: str
+    :param patterns: Padrões compilados por compile_patterns.
+    :type patterns: list
+    :param chunk_size: Quantidade de caracteres lidos por vez.
+    :type chunk_size: int
+    :param overlap: Sobreposição usada ao partir linhas longas (padrão: REGEX_OVERLAP; para padrões
+        literais basta o tamanho do maior deles, veja _scan_overlap).
+    :type overlap: int
+    :return: Gerador de Match, na ordem das linhas (uma por linha e padrão).
+    :rtype: generator
+    """
+    if overlap is None:
+        overlap = REGEX_OVERLAP
+    line_number = 1
+    carry = ''
+    # Padrões já relatados na linha partida que continua no bloco seguinte
+    continued = set()
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            data = carry + chunk
+            if not data:
+                return
+            end = len(data)
+            split = False
+            if not chunk:
+                # Fim do arquivo: o que sobrou é a última linha
+                cut = end
+            else:
+                cut = data.rfind('\n') + 1
+                if cut:
+                    end = cut
+                elif len(data) <= overlap:
+                    carry = data
+                    continue
+                else:
+                    cut = end - overlap
+                    split = True
+
+            found = []
+            for order, (text, regex) in enumerate(patterns):
+                for match in regex.finditer(data, 0, end):
+                    if match.start() >= cut:
+                        break
+                    found.append((match.start(), order, text))
+            if found:
+                found.sort()
+                seen = {(0, order) for order in continued}
+                newlines, position, line_start = 0, 0, 0
+                for start, order, text in found:
+                    newlines += data.count('\n', position, start)
+                    if start > position:
+                        line_start = data.rfind('\n', 0, start) + 1
+                    position = start
+                    key = (newlines, order)
+                    if key not in seen:
+                        seen.add(key)
+                        yield Match(path, line_number + newlines, _line_text(data, start, line_start), text)
+                if split:
+                    # Sem fim de linha no bloco: todas as ocorrências são da linha partida
+                    continued = {order for _, order in seen}
+            if not split:
+                continued = set()
+
+            line_number += data.count('\n', 0, cut)
+            carry = data[cut:]
+
+def _scan_overlap(patterns, regex):
+    """
+    Sobreposição necessária para não perder ocorrências ao partir linhas longas.
+    """
+    if regex or not patterns:
+        return REGEX_OVERLAP
+    return max(len(text) for text, _ in patterns)
+
+def _scan_to_list(path, patterns, chunk_size, overlap):
+    """
+    Executa scan_file em um processo do pool e devolve as ocorrências de uma vez.
+    """
+    try:
+        return list(scan_file(path, patterns, chunk_size, overlap)), None
+    except OSError as e:
+        return [], f"Erro ao ler o arquivo {path}: {e}"
+
+def iter_candidate_files(directory, globs=('*.py',)):
+    """
+    Itera pelos arquivos cujo nome casa com algum dos globs.
+
+    :param directory: Caminho do diretório a ser percorrido.
+    :type directory: str
+    :param globs: Padrões de nome de arquivo (por exemplo, '*.py', '*.md').
+    :type globs: tuple
+    :return: Gerador de caminhos.
+    :rtype: generator
+    """
+    for entry in iter_files(directory):
+        if any(fnmatch.fnmatchcase(entry.name, pattern) for pattern in globs):
+            yield entry.path
+
+def _search_with_threads(paths, patterns, chunk_size, overlap, jobs):
+    """
+    Procura com um pool de threads; as ocorrências são repassadas assim que encontradas.
+    """
+    results = queue.Queue(maxsize=1000)
+    pending = queue.Queue(maxsize=jobs * 4)
+    done = object()
+
+    def worker():
+        while True:
+            path = pending.get()
+            if path is done:
+                results.put(done)
+                return
+            try:
+                for match in scan_file(path, patterns, chunk_size, overlap):
+                    results.put(match)
+            except OSError as e:
+                print(f"Erro ao ler o arquivo {path}: {e}", file=sys.stderr)
+
+    def feeder():
+        try:
+            for path in paths:
+                pending.put(path)
+        finally:
+            for _ in range(jobs):
+                pending.put(done)
+
+    threads = [threading.Thread(target=feeder, daemon=True)]
+    threads += [threading.Thread(target=worker, daemon=True) for _ in range(jobs)]
+    for thread in threads:
+        thread.start()
+    finished = 0
+    while finished < jobs:
+        item = results.get()
+        if item is done:
+            finished += 1
+        else:
+            yield item
+
+def _search_with_processes(paths, patterns, chunk_size, overlap, jobs):
+    """
+    Procura com um pool de processos; as ocorrências de cada arquivo saem quando ele termina.
+    """
+    # Importado aqui para não atrasar a busca com threads, que é o caso comum
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    paths = iter(paths)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        in_flight = set()
+        while True:
+            # Limita os arquivos em andamento para não enfileirar a árvore inteira
+            for path in paths:
+                in_flight.add(pool.submit(_scan_to_list, path, patterns, chunk_size, overlap))
+                if len(in_flight) >= jobs * 4:
+                    break
+            if not in_flight:
+                return
+            completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in completed:
+                matches, error = future.result()
+                if error:
+                    print(error, file=sys.stderr)
+                yield from matches
+
+def search_files(directory, patterns, regex=False, globs=('*.py',), jobs=None,
+                 processes=False, ignore_case=False, chunk_size=CHUNK_SIZE, paths=None):
+    """
+    Procura vários padrões nos arquivos de um diretório, em paralelo e em streaming.
+
+    As ocorrências são devolvidas à medida que são encontradas, com o número
+    da linha; a ordem entre arquivos diferentes não é garantida.
+
+    :param directory: Caminho do diretório a ser percorrido.
+    :type directory: str
+    :param patterns: Padrões a procurar.
+    :type patterns: list
+    :param regex: Se True, os padrões são expressões regulares.
+    :type regex: bool
+    :param globs: Padrões de nome dos arquivos examinados.
+    :type globs: tuple
+    :param jobs: Número de threads ou processos (padrão: número de CPUs).
+    :type jobs: int
+    :param processes: Se True, usa um pool de processos (melhor para expressões regulares pesadas).
+    :type processes: bool
+    :param ignore_case: Se True, ignora maiúsculas e minúsculas.
+    :type ignore_case: bool
+    :param chunk_size: Quantidade de caracteres lidos por vez de cada arquivo.
+    :type chunk_size: int
+    :param paths: Arquivos a examinar; se omitido, percorre directory filtrando por globs.
+    :type paths: iterable
+    :return: Gerador de Match.
+    :rtype: generator
+    """
+    compiled = compile_patterns(patterns, regex, ignore_case)
+    overlap = _scan_overlap(compiled, regex)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    if paths is None:
+        paths = iter_candidate_files(directory, tuple(globs))
+    search = _search_with_processes if processes else _search_with_threads
+    return search(paths, compiled, chunk_size, overlap, jobs)
+
+def indexed_candidates(directory, patterns, index_path=None):
+    """
+    Usa o índice de tokens para restringir os arquivos .py que podem conter algum dos padrões literais.
+
+    :param directory: Diretório indexado.
+    :type directory: str
+    :param patterns: Padrões literais.
+    :type patterns: list
+    :param index_path: Caminho do banco SQLite (padrão: INDEX_NAME dentro de directory).
+    :type index_path: str
+    :return: Lista ordenada de caminhos candidatos.
+    :rtype: list
+    """
+    with KeywordIndex(directory, index_path) as index:
+        index.update()
+        candidates = set()
+        for pattern in patterns:
+            candidates.update(os.path.join(directory, path) for path in index.candidates(pattern))
+    return sorted(candidates)
+
+def interactive_search(directory):
+    """
+    Pergunta a palavra-chave ao usuário e exibe os arquivos que a contêm.
+
+    :param directory: Diretório a partir do qual começar a busca.
+    :type directory: str
+    """
+    keyword_to_find = input('Please enter the keyword to search for: ')
+
+    # Chama a função e exibe os arquivos encontrados
+    files_found = find_files_with_keyword_indexed(directory, keyword_to_find)
+    print(f'Files containing the word "{keyword_to_find}":')
+    for file in files_found:
+        # Imprime o caminho do arquivo em formato de link clicável
+        print(f'file://{file}')
+
+def main(argv=None, root=None):
+    """
+    Executa a busca pela linha de comando.
+
+    :param argv: Argumentos de linha de comando (padrão: sys.argv[1:])
+    :param root: Diretório usado quando nenhum é informado (padrão: a pasta deste script)
+    :return: 0 se algo foi encontrado, 1 caso contrário
+    """
+    parser = argparse.ArgumentParser(
+        description='Procura palavras-chave ou expressões regulares nos arquivos do projeto. '
+                    'Sem -e, pergunta a palavra-chave interativamente.')
+    parser.add_argument('directory', nargs='?', default=None,
+                        help='diretório da busca (padrão: a raiz do projeto)')
+    parser.add_argument('-e', '--pattern', dest='patterns', action='append', default=[],
+                        help='padrão a procurar; pode ser repetido')
+    parser.add_argument('-r', '--regex', action='store_true', help='interpreta os padrões como expressões regulares')
+    parser.add_argument('-i', '--ignore-case', action='store_true', help='ignora maiúsculas e minúsculas')
+    parser.add_argument('-g', '--glob', dest='globs', action='append', default=None,
+                        help="nomes de arquivo examinados (padrão: '*.py'); pode ser repetido")
+    parser.add_argument('-j', '--jobs', type=int, default=0, help='threads ou processos (0 = número de CPUs)')
+    parser.add_argument('--processes', action='store_true', help='usa um pool de processos em vez de threads')
+    parser.add_argument('-l', '--files-with-matches', action='store_true',
+                        help='mostra apenas o caminho de cada arquivo com ocorrências')
+    parser.add_argument('--index', action='store_true',
+                        help='usa o índice de tokens para escolher os arquivos .py (apenas padrões literais)')
+    args = parser.parse_args(argv)
+
+    # Diretório a partir do qual começar a busca (raiz do projeto)
+    directory = args.directory or root or os.path.dirname(os.path.abspath(__file__))
+    if not args.patterns:
+        interactive_search(directory)
+        return 0
+
+    globs = args.globs or ['*.py']
+    paths = None
+    if args.index:
+        if args.regex or args.ignore_case or globs != ['*.py']:
+            parser.error('--index só pode ser usado com padrões literais em arquivos .py')
+        paths = indexed_candidates(directory, args.patterns)
 
-# Pergunta a palavra-chave ao usuário
-keyword_to_find = input('Please enter the keyword to search for: ')
+    printed = set()
+    found = False
+    for match in search_files(directory, args.patterns, args.regex, globs, args.jobs,
+                              args.processes, args.ignore_case, paths=paths):
+        found = True
+        if args.files_with_matches:
+            if match.path not in printed:
+                printed.add(match.path)
+                print(match.path, flush=True)
+        else:
+            print(f'{match.path}:{match.line_number}: {match.line}', flush=True)
+    return 0 if found else 1
 
-# Chama a função e exibe os arquivos encontrados
-files_found = find_files_with_keyword(project_root_directory, keyword_to_find)
-print(f'Files containing the word "{keyword_to_find}":')
-for file in files_found:
-    # Imprime o caminho do arquivo em formato de link clicável
-    print(f'file://{file}')
+if __name__ == '__main__':
+    sys.exit(main())
 
 # Referências
 
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Representação intermediária compacta dos fluxogramas e os emissores de Mermaid, DOT e JSON.
+
+O percurso da AST (convert_py_to_mmd_and_svg) monta um FlowGraph em vez de
+texto Mermaid; cada formato de saída é um emissor independente sobre o grafo.
+Os nós são identificados pelo índice de criação e guardados em colunas
+(labels em uma lista, formas em um array de bytes) e as arestas em dois
+arrays de inteiros, de modo que o grafo ocupa pouca memória mesmo em módulos
+grandes. A forma JSON (to_dict/from_dict) é estável e pode ser guardada em
+cache e comparada entre execuções.
+
+Uso: python flow_graph.py arquivo.py [--format mermaid|dot|json] [--max-nodes 200]
+"""
+import argparse
+import json
+import os
+import sys
+from array import array
+
+# Incrementar quando o formato de to_dict mudar
+IR_VERSION = 1
+SHAPES = ("rect", "diamond", "parallelogram")
+FORMATS = ("mermaid", "dot", "json")
+
+
+class FlowGraph:
+    """
+    Fluxograma de um diagrama: nós, arestas, links para subdiagramas e nós omitidos.
+
+    :param limit: Número máximo de nós; os excedentes são apenas contados em omitted
+    """
+    __slots__ = ("labels", "shapes", "sources", "targets", "links", "limit", "omitted")
+
+    def __init__(self, limit=None):
+        self.labels = []
+        self.shapes = array("B")
+        self.sources = array("l")
+        self.targets = array("l")
+        self.links = {}
+        self.limit = limit
+        self.omitted = 0
+
+    def __len__(self):
+        return len(self.labels)
+
+    def add_node(self, label, shape="rect"):
+        """
+        Acrescenta um nó.
+
+        :return: Índice do nó, ou None se o limite de nós foi atingido
+        """
+        if self.limit is not None and len(self.labels) >= self.limit:
+            self.omitted += 1
+            return None
+        self.labels.append(label)
+        self.shapes.append(SHAPES.index(shape))
+        return len(self.labels) - 1
+
+    def add_edge(self, source, target):
+        """
+        Acrescenta uma aresta; é ignorada se uma das pontas for um nó omitido (None).
+        """
+        if source is not None and target is not None:
+            self.sources.append(source)
+            self.targets.append(target)
+
+    def add_link(self, node, target):
+        if node is not None:
+            self.links[node] = target
+
+    def shape(self, node):
+        return SHAPES[self.shapes[node]]
+
+    def edges(self):
+        return zip(self.sources, self.targets)
+
+    def to_dict(self):
+        """
+        :return: Dicionário serializável em JSON
+        """
+        return {
+            "ir_version": IR_VERSION,
+            "nodes": [{"label": label, "shape": SHAPES[shape]} for label, shape in zip(self.labels, self.shapes)],
+            "edges": [list(edge) for edge in self.edges()],
+            "links": [[node, target] for node, target in sorted(self.links.items())],
+            "omitted": self.omitted,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstrói um grafo gravado com to_dict.
+
+        :raises ValueError: Se o dicionário for de outra versão do formato
+        """
+        if data.get("ir_version") != IR_VERSION:
+            raise ValueError(f"versão do grafo não suportada: {data.get('ir_version')}")
+        graph = cls()
+        for node in data["nodes"]:
+            graph.add_node(node["label"], node["shape"])
+        for source, target in data["edges"]:
+            graph.add_edge(source, target)
+        graph.links = {node: target for node, target in data["links"]}
+        graph.omitted = data["omitted"]
+        return graph
+
+
+def omitted_label(graph):
+    return f"… {graph.omitted} nós omitidos"
+
+
+def to_mermaid(graph):
+    """
+    Emite o grafo como fluxograma Mermaid.
+
+    Cada aresta é escrita logo depois do seu nó de destino e cada link logo
+    depois das arestas do seu nó, na ordem em que o percurso da AST os cria.
+
+    :return: Código Mermaid
+    """
+    lines = ["flowchart TD"]
+    edge, edge_count = 0, len(graph.sources)
+    for node, label in enumerate(graph.labels):
+        shape = graph.shapes[node]
+        if shape == 1:
+            lines.append(f'n{node}{{"{label}"}}')
+        elif shape == 2:
+            lines.append(f'n{node}[/"{label}"/]')
+        else:
+            lines.append(f'n{node}["{label}"]')
+        while edge < edge_count and graph.targets[edge] <= node:
+            lines.append(f"n{graph.sources[edge]} --> n{graph.targets[edge]}")
+            edge += 1
+        if node in graph.links:
+            lines.append(f'click n{node} "{graph.links[node]}"')
+    for edge in range(edge, edge_count):
+        lines.append(f"n{graph.sources[edge]} --> n{graph.targets[edge]}")
+    if graph.omitted:
+        lines.append(f'n{len(graph)}["{omitted_label(graph)}"]')
+    return "\n".join(lines)
+
+
+def _dot_string(text):
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def to_dot(graph, name="flowchart"):
+    """
+    Emite o grafo na linguagem DOT do Graphviz (por exemplo, para `dot -Tsvg`).
+
+    :param name: Nome do grafo
+    :return: Código DOT
+    """
+    dot_shapes = {"rect": "box", "diamond": "diamond", "parallelogram": "parallelogram"}
+    lines = [f"digraph {_dot_string(name)} {{", "  rankdir=TB;", '  node [fontname="Helvetica"];']
+    for node, label in enumerate(graph.labels):
+        attributes = f"label={_dot_string(label)}, shape={dot_shapes[graph.shape(node)]}"
+        if node in graph.links:
+            attributes += f", URL={_dot_string(graph.links[node])}"
+        lines.append(f"  n{node} [{attributes}];")
+    if graph.omitted:
+        lines.append(f"  n{len(graph)} [label={_dot_string(omitted_label(graph))}, shape=box, style=dashed];")
+    lines += [f"  n{source} -> n{target};" for source, target in graph.edges()]
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def to_json(graph):
+    """
+    Emite o grafo em JSON (o formato de to_dict).
+
+    :return: Texto JSON
+    """
+    return json.dumps(graph.to_dict(), ensure_ascii=False, indent=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mostra o fluxograma de um arquivo .py em Mermaid, DOT ou JSON.")
+    parser.add_argument("file", help="arquivo .py")
+    parser.add_argument("--format", choices=FORMATS, default="mermaid", help="formato de saída")
+    parser.add_argument("--max-nodes", type=int, default=0,
+                        help="orçamento de nós por diagrama; acima dele os diagramas são resumidos (0 = sem limite)")
+    parser.add_argument("--max-label", type=int, default=0,
+                        help="número máximo de caracteres por label (0 = sem limite)")
+    args = parser.parse_args(argv)
+
+    from convert_py_to_mmd_and_svg import build_flow_graphs
+    with open(args.file, "r", encoding="utf-8") as f:
+        code = f.read()
+    name = os.path.basename(args.file)
+    graphs = build_flow_graphs(code, name, args.max_nodes or None, args.max_label or None)
+    if args.format == "json":
+        # Um único documento JSON: {sufixo: grafo}, com "" para o diagrama principal
+        print(json.dumps({suffix: graph.to_dict() for suffix, graph in graphs.items()}, ensure_ascii=False, indent=1))
+        return 0
+    for suffix, graph in graphs.items():
+        if args.format == "dot":
+            print(to_dot(graph, suffix or name))
+        else:
+            if len(graphs) > 1:
+                print(f"%% {suffix or name}")
+            print(to_mermaid(graph))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Exporta notebooks com o nbconvert lendo cada arquivo uma única vez.
+
+Os exportadores (cada um com seu ambiente de templates Jinja) são criados na
+primeira utilização e reutilizados por todo o processo, e todos os formatos
+pedidos são gerados a partir do mesmo notebook em memória.
+"""
+import datetime
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+# Formatos de saída: extensão do arquivo gerado -> exportador do nbconvert
+EXPORTER_NAMES = {'.md': 'MarkdownExporter', '.py': 'PythonExporter'}
+
+# Exportadores já criados neste processo, por extensão
+_exporters = {}
+
+
+def get_exporter(suffix):
+    """
+    Retorna o exportador do formato, criando-o na primeira chamada.
+
+    :param suffix: Extensão do arquivo de saída ('.md' ou '.py')
+    :return: Instância de um exportador do nbconvert
+    """
+    exporter = _exporters.get(suffix)
+    if exporter is None:
+        import nbconvert
+        exporter = _exporters[suffix] = getattr(nbconvert, EXPORTER_NAMES[suffix])()
+    return exporter
+
+
+def read_notebook(path):
+    """
+    Lê e valida um notebook (levanta nbformat.reader.NotJSONError se não for JSON).
+
+    :param path: Caminho do arquivo .ipynb
+    :return: NotebookNode na versão 4 do formato
+    """
+    import nbformat
+    with open(path, 'r', encoding='utf-8') as file:
+        return nbformat.read(file, as_version=4)
+
+
+def notebook_resources(path):
+    """
+    Monta os mesmos metadados que Exporter.from_filename passaria aos templates.
+
+    :param path: Caminho do arquivo .ipynb
+    :return: Dicionário de resources
+    """
+    directory, basename = os.path.split(path)
+    modified_date = datetime.datetime.fromtimestamp(os.path.getmtime(path), tz=datetime.timezone.utc)
+    date_format = '%B %d, %Y' if sys.platform == 'win32' else '%B %-d, %Y'
+    return {'metadata': {'name': os.path.splitext(basename)[0],
+                         'path': directory,
+                         'modified_date': modified_date.strftime(date_format)}}
+
+
+def export_notebook(notebook, path=None, suffixes=('.md', '.py')):
+    """
+    Exporta um notebook já lido para vários formatos.
+
+    :param notebook: NotebookNode (não é alterado; o nbconvert trabalha sobre uma cópia)
+    :param path: Caminho de origem, usado nos metadados dos templates; None para omiti-los
+    :param suffixes: Extensões dos formatos desejados
+    :return: Dicionário {extensão: conteúdo exportado}
+    """
+    exported = {}
+    for suffix in suffixes:
+        resources = notebook_resources(path) if path is not None else None
+        exported[suffix], _ = get_exporter(suffix).from_notebook_node(notebook, resources)
+    return exported
+
+
+def map_bounded(func, items, jobs=1, max_in_flight=None):
+    """
+    Aplica func a cada item em um pool de processos, com um limite de tarefas em andamento.
+
+    Cada processo do pool mantém seus próprios exportadores (criados por
+    get_exporter na primeira conversão) e os reutiliza nas seguintes. Os itens
+    só são consumidos à medida que há vaga, o que limita a memória usada.
+
+    :param func: Função de nível de módulo (precisa ser serializável com pickle)
+    :param items: Iterável de argumentos (um por chamada)
+    :param jobs: Número de processos; 1 executa tudo no processo atual
+    :param max_in_flight: Máximo de tarefas enviadas e ainda não concluídas (padrão: 2 * jobs)
+    :return: Gerador com os resultados, na ordem em que terminam
+    """
+    if jobs <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    max_in_flight = max(1, max_in_flight or 2 * jobs)
+    items = iter(items)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        in_flight = set()
+        while True:
+            for item in items:
+                in_flight.add(pool.submit(func, item))
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                return
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentação comum às ferramentas: tempo por estágio, contadores, bytes e progresso.
+
+Cada execução cria um RunReport. Os estágios (walk, parse, generate, render,
+copy, export, ...) são medidos com report.stage(nome); os arquivos são
+contados por situação (seen, skipped, changed, unchanged, failed) e os bytes
+lidos e gravados são somados. Em vez de uma linha por arquivo, o terminal
+recebe uma linha de progresso atualizada no máximo a cada `interval`
+segundos; as mensagens por arquivo só aparecem com verbose. Ao final, o
+relatório pode ser gravado em JSON (write_json) para alimentar painéis.
+Com --report -, o JSON vai para a saída padrão e as demais mensagens da
+execução são desviadas para stderr (report_stdout).
+
+Código executado em outros processos mede os seus estágios em um dicionário
+comum com timed(times, nome) e o devolve para ser somado com add_times.
+"""
+import datetime
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+
+from file_manifest import atomic_write
+
+# Versão do formato do relatório JSON
+REPORT_VERSION = 1
+# Situações de arquivo, na ordem em que aparecem no progresso e no relatório
+FILE_STATUSES = ('seen', 'skipped', 'changed', 'unchanged', 'failed')
+# Intervalo mínimo entre linhas de progresso quando a saída não é um terminal
+NON_TTY_INTERVAL = 5.0
+
+
+@contextmanager
+def timed(times, name):
+    """
+    Soma a duração do bloco ao estágio name de um dicionário de tempos.
+
+    :param times: Dicionário {estágio: [segundos, chamadas]}, ou None para não medir
+    :param name: Nome do estágio
+    """
+    if times is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage = times.setdefault(name, [0.0, 0])
+        stage[0] += time.perf_counter() - start
+        stage[1] += 1
+
+
+class RunReport:
+    """
+    Métricas e progresso de uma execução de uma ferramenta.
+
+    Os métodos podem ser chamados de várias threads ao mesmo tempo.
+
+    :param tool: Nome da ferramenta, gravado no relatório
+    :param verbose: Se True, mostra as mensagens por arquivo (log) em vez da linha de progresso
+    :param stream: Saída do progresso e das mensagens (padrão: sys.stderr)
+    :param interval: Intervalo mínimo, em segundos, entre atualizações da linha de progresso; None desativa o progresso
+    """
+
+    def __init__(self, tool, verbose=False, stream=None, interval=0.2):
+        self.tool = tool
+        self.verbose = verbose
+        self.stream = stream if stream is not None else sys.stderr
+        # Saída padrão do relatório JSON (write_json('-')), capturada antes de um eventual report_stdout
+        self.stdout = sys.stdout
+        self.tty = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self.interval = interval if self.tty or interval is None else max(interval, NON_TTY_INTERVAL)
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self.start = time.perf_counter()
+        self.elapsed = None
+        self.stages = {}
+        self.files = dict.fromkeys(FILE_STATUSES, 0)
+        self.counters = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        self._last_progress = self.start
+        self._progress_width = 0
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Mede a duração do bloco e a soma ao estágio name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds, calls=1):
+        """
+        Soma uma duração já medida ao estágio name.
+        """
+        with self._lock:
+            stage = self.stages.setdefault(name, [0.0, 0])
+            stage[0] += seconds
+            stage[1] += calls
+
+    def add_times(self, times):
+        """
+        Soma os tempos medidos com timed (por exemplo, em um processo do pool).
+
+        :param times: Dicionário {estágio: [segundos, chamadas]}
+        """
+        for name, (seconds, calls) in times.items():
+            self.add_time(name, seconds, calls)
+
+    def iter_stage(self, name, iterable):
+        """
+        Percorre iterable contando no estágio name apenas o tempo gasto para obter cada item.
+
+        Útil para geradores (como walk_tree) consumidos aos poucos, intercalados com outros estágios.
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def file(self, status, count=1):
+        """
+        Conta arquivos em uma situação (uma de FILE_STATUSES) e atualiza o progresso.
+        """
+        with self._lock:
+            self.files[status] += count
+        self.progress()
+
+    def count(self, name, count=1):
+        """
+        Soma count a um contador livre (por exemplo, 'diagrams' ou 'deleted').
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + count
+
+    def add_bytes(self, read=0, written=0):
+        """
+        Soma bytes lidos e gravados.
+        """
+        with self._lock:
+            self.bytes_read += read
+            self.bytes_written += written
+
+    def log(self, message):
+        """
+        Mensagem por arquivo: mostrada apenas com verbose; caso contrário, atualiza o progresso.
+        """
+        if self.verbose:
+            self._write(message + '\n')
+        else:
+            self.progress()
+
+    def error(self, message):
+        """
+        Mensagem que é sempre mostrada (erros e avisos), sem misturar com a linha de progresso.
+        """
+        self._write(message + '\n')
+
+    def progress_line(self):
+        """
+        Monta a linha de progresso com os contadores de arquivos e o tempo decorrido.
+        """
+        counts = ', '.join(f'{status} {self.files[status]}' for status in FILE_STATUSES if self.files[status])
+        return f'[{self.tool}] {counts or "0 arquivo(s)"} | {time.perf_counter() - self.start:.1f} s'
+
+    def progress(self, force=False):
+        """
+        Atualiza a linha de progresso, no máximo uma vez a cada interval segundos.
+        """
+        if self.verbose or self.interval is None:
+            return
+        now = time.perf_counter()
+        if not force and now - self._last_progress < self.interval:
+            return
+        with self._lock:
+            self._last_progress = now
+            line = self.progress_line()
+            if self.tty:
+                self.stream.write('\r' + line.ljust(self._progress_width))
+                self._progress_width = len(line)
+            else:
+                self.stream.write(line + '\n')
+            self.stream.flush()
+
+    def _write(self, text):
+        with self._lock:
+            if self._progress_width:
+                self.stream.write('\r' + ' ' * self._progress_width + '\r')
+                self._progress_width = 0
+            self.stream.write(text)
+            self.stream.flush()
+
+    def close(self):
+        """
+        Encerra a medição e apaga a linha de progresso do terminal.
+        """
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self.start
+        self._write('')
+
+    def to_dict(self):
+        """
+        Monta o relatório da execução.
+
+        :return: Dicionário serializável em JSON
+        """
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self.start
+        with self._lock:
+            return {
+                'report_version': REPORT_VERSION,
+                'tool': self.tool,
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'elapsed_s': round(elapsed, 6),
+                'stages': {name: {'seconds': round(seconds, 6), 'calls': calls}
+                           for name, (seconds, calls) in sorted(self.stages.items())},
+                'files': dict(self.files),
+                'counters': dict(sorted(self.counters.items())),
+                'bytes': {'read': self.bytes_read, 'written': self.bytes_written},
+            }
+
+    def write_json(self, path):
+        """
+        Grava o relatório em JSON (de forma atômica).
+
+        :param path: Caminho do arquivo; '-' escreve na saída padrão
+        """
+        text = json.dumps(self.to_dict(), indent=2, ensure_ascii=False) + '\n'
+        if path == '-':
+            self.stdout.write(text)
+            self.stdout.flush()
+        else:
+            atomic_write(path, text)
+
+    def finish(self, path=None):
+        """
+        Encerra a medição (close) e, se path for informado, grava o relatório em JSON.
+        """
+        self.close()
+        if path:
+            self.write_json(path)
+
+
+@contextmanager
+def report_stdout(path):
+    """
+    Reserva a saída padrão para o relatório JSON quando path é '-'.
+
+    Dentro do bloco, o que for impresso na saída padrão (resumos, avisos,
+    listas do --dry-run) vai para stderr; o RunReport deve ser criado antes do
+    bloco para gravar o JSON na saída padrão original.
+
+    :param path: Valor da opção --report
+    """
+    if path != '-':
+        yield
+        return
+    with redirect_stdout(sys.stderr):
+        yield
+
+
+def add_arguments(parser):
+    """
+    Acrescenta ao argparse as opções comuns de instrumentação (--verbose e --report).
+    """
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='mostra uma mensagem por arquivo em vez da linha de progresso')
+    parser.add_argument('--report', metavar='ARQUIVO', default=None,
+                        help="grava ao final um relatório JSON com tempos, contadores e bytes ('-' = saída padrão)")
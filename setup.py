@@ -12,57 +12,42 @@ def readme():
     Função LEIA-ME.
     """
 
-    with open('README.md') as file:
+    with open('README.md', encoding='utf-8') as file:
         return file.read()
 
-# remove older distribuitions
-# shutil.rmtree('proplib.egg-info/')
-# shutil.rmtree('dist/')
-
-setup(name='proplib',
-      version='0.0.2',
-      description='Library of functions related to propulsion for the'
-                  'APR (Propulsion Division) team.',
+setup(name='dia',
+      version='0.1.0',
+      description='Ferramentas do template de documentação: sincronização do template, busca, '
+                  'conversão entre notebooks e Markdown, fluxogramas Mermaid e filtro de notebooks do git.',
       long_description=readme(),
+      long_description_content_type='text/markdown',
       classifiers=[
-        'Development Status :: 0 - Alpha',
-        'License :: OSI Approved :: MIT License',  # TODO: update!
-        'Programming Language :: Python :: 3.8',
-        'Topic :: Thermodynamics :: Rocket propulsion'],
-      url='https://gitlab.com/iae-apr/proplib',
-      author='APR',
-      author_email=' ',
-      license=' ',
-      packages=[
-          'proplib',
-          'proplib.LPRE_lib',
-          'proplib.LPRE_lib.util',
-          'proplib.LPRE_lib.cycle',
-          'proplib.LPRE_lib.components',
-          'proplib.LPRE_lib.components.thrust_chamber_assembly',
-          'proplib.LPRE_lib.components.thrust_chamber_assembly',
-          'proplib.util',
-          'proplib.util.properties',
-          'proplib.util.software_interfaces',
-          'main_files',
-          'main_files.LPRE_main_files'],
-      python_requires='>=3.4',
-      install_requires=['coolprop',
-                        'matplotlib',
-                        'numpy',
-                        'pandas',
-                        'pytest',
-                        'scipy',
-                        'sympy',
-                        'Pillow'],
-      # scripts=['main_files/LPRE_main_files/TCA_main.py'],
+        'Development Status :: 3 - Alpha',
+        'License :: OSI Approved :: MIT License',
+        'Programming Language :: Python :: 3.9'],
+      license='MIT',
+      # Os scripts continuam na raiz para poderem ser copiados e executados diretamente nas pastas de programa
+      py_modules=[
+          'build_docs',
+          'convert_ipynb_to_md_and_py',
+          'convert_md_to_ipynb_and_py',
+          'convert_py_to_mmd_and_svg',
+          'copy_files_to_non_empty_dirs',
+          'file_manifest',
+          'filter_nb_metadata',
+          'find_files_with_keyword',
+          'flow_graph',
+          'notebook_export',
+          'run_report',
+          'svg_flowchart',
+          'tree_walker',
+          'watch_and_convert'],
+      packages=['dia'],
+      python_requires='>=3.9',
+      install_requires=['nbconvert',
+                        'nbformat'],
       entry_points={
           'console_scripts': [
-              'TCA_main=main_files.LPRE_main_files.TCA_main:main',
-              'pump_main=main_files.LPRE_main_files.pump_main:main',
-              'compare_inputs=proplib.util.check_modules:compare_external',
-              'sign_sha1=proplib.util.check_modules:sign_sha1_external']},
-      # test_suite='nose.collector',
-      tests_require=['nose', 'pytest'],
+              'dia=dia.cli:main']},
       include_package_data=True,
       zip_safe=False)
@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+"""
+Renderizador de fluxogramas Mermaid em SVG escrito em Python puro, sem mmdc nem navegador.
+
+Entende o subconjunto de Mermaid gerado por convert_py_to_mmd_and_svg:
+"flowchart TD" (ou TB), nós retangulares (id["texto"]), losangos
+(id{"texto"}) e paralelogramos (id[/"texto"/]), arestas "a --> b" (inclusive
+encadeadas) e linhas "click id \"destino\"", que viram links no SVG.
+
+O layout é em camadas, de cima para baixo: cada nó fica na camada seguinte à
+do seu predecessor mais profundo, a ordem dentro das camadas é ajustada pelo
+baricentro dos vizinhos para reduzir cruzamentos e cada nó é centralizado,
+dentro do possível, sob os seus pais e sobre os seus filhos.
+
+Uso: python svg_flowchart.py diagrama.mmd [outro.mmd ...]  (grava diagrama.svg, ...)
+"""
+import argparse
+import os
+import re
+import sys
+import textwrap
+from xml.sax.saxutils import escape, quoteattr
+
+from file_manifest import file_digest
+from flow_graph import omitted_label
+
+FONT_SIZE = 14
+# Largura média de um caractere e altura de uma linha de texto, em pixels
+CHAR_WIDTH = FONT_SIZE * 0.6
+LINE_HEIGHT = FONT_SIZE * 1.4
+# Caracteres por linha antes de quebrar o label
+WRAP_WIDTH = 40
+PADDING_X = 15
+PADDING_Y = 10
+H_GAP = 30
+V_GAP = 50
+MARGIN = 8
+# Passadas de ordenação por baricentro e de posicionamento horizontal
+ORDER_SWEEPS = 4
+PLACEMENT_SWEEPS = 4
+
+HEADER = re.compile(r"^(?:flowchart|graph)(?:\s+(\w+))?$")
+CLICK = re.compile(r'^click\s+(\w+)\s+(?:href\s+)?"([^"]*)"')
+NODE = re.compile(r"^(\w+)\s*(?:(\[/|\[|\{)(.*?)(/\]|\]|\}))?$")
+SHAPES = {("[", "]"): "rect", ("{", "}"): "diamond", ("[/", "/]"): "parallelogram"}
+
+STYLE = (
+    "text{font-family:'trebuchet ms',verdana,arial,sans-serif;font-size:%dpx;fill:#333}"
+    ".node{fill:#ECECFF;stroke:#9370DB;stroke-width:1px}"
+    ".edge{fill:none;stroke:#333;stroke-width:1.5px}"
+    "a .node{stroke-width:2px}" % FONT_SIZE
+)
+
+
+class Node:
+    """
+    Nó do fluxograma, com as dimensões e a posição (centro) calculadas no layout.
+    """
+    __slots__ = ("id", "label", "shape", "lines", "width", "height", "x", "y", "layer")
+
+    def __init__(self, node_id, label, shape="rect"):
+        self.id = node_id
+        self.label = label
+        self.shape = shape
+        self.lines = textwrap.wrap(label, WRAP_WIDTH) or [""]
+        text_width = max(len(line) for line in self.lines) * CHAR_WIDTH
+        text_height = len(self.lines) * LINE_HEIGHT
+        if shape == "diamond":
+            # Losango com o texto inscrito: metade da largura proporcional ao texto, altura três vezes a do texto
+            self.width = text_width * 1.5 + PADDING_X * 2
+            self.height = text_height * 3
+        elif shape == "parallelogram":
+            self.width = text_width + PADDING_X * 2 + text_height
+            self.height = text_height + PADDING_Y * 2
+        else:
+            self.width = text_width + PADDING_X * 2
+            self.height = text_height + PADDING_Y * 2
+        self.x = self.y = 0.0
+        self.layer = 0
+
+
+class Flowchart:
+    """
+    Fluxograma lido de um código Mermaid ou montado a partir de um grafo intermediário.
+
+    :ivar nodes: Dicionário {id: Node}, na ordem de declaração
+    :ivar edges: Lista de tuplas (id de origem, id de destino)
+    :ivar links: Dicionário {id: destino} das linhas click
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.edges = []
+        self.links = {}
+
+    def node(self, spec, line_number):
+        match = NODE.match(spec.strip())
+        if not match:
+            raise ValueError(f"linha {line_number}: nó inválido: {spec.strip()!r}")
+        node_id, opening, label, closing = match.groups()
+        if opening is None:
+            # Referência a um nó; se ainda não foi declarado, o label é o próprio id, como no Mermaid
+            if node_id not in self.nodes:
+                self.nodes[node_id] = Node(node_id, node_id)
+            return node_id
+        shape = SHAPES.get((opening, closing))
+        if shape is None:
+            raise ValueError(f"linha {line_number}: forma inválida: {spec.strip()!r}")
+        if len(label) >= 2 and label[0] == label[-1] == '"':
+            label = label[1:-1]
+        self.nodes[node_id] = Node(node_id, label, shape)
+        return node_id
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Monta o fluxograma a partir do grafo intermediário (flow_graph.FlowGraph), sem passar pelo texto Mermaid.
+        """
+        flowchart = cls()
+        for index, label in enumerate(graph.labels):
+            flowchart.nodes[f"n{index}"] = Node(f"n{index}", label, graph.shape(index))
+        if graph.omitted:
+            node_id = f"n{len(graph)}"
+            flowchart.nodes[node_id] = Node(node_id, omitted_label(graph))
+        flowchart.edges = [(f"n{source}", f"n{target}") for source, target in graph.edges()]
+        flowchart.links = {f"n{node}": target for node, target in graph.links.items()}
+        return flowchart
+
+
+def split_chain(line):
+    """
+    Divide uma linha nas setas "-->" que estão fora de labels entre aspas.
+
+    :return: Lista de especificações de nós (uma só, se a linha não tiver arestas)
+    """
+    parts = []
+    start = index = 0
+    quoted = False
+    while index < len(line):
+        if line[index] == '"':
+            quoted = not quoted
+        elif not quoted and line.startswith("-->", index):
+            parts.append(line[start:index])
+            index += 3
+            start = index
+            continue
+        index += 1
+    parts.append(line[start:])
+    return parts
+
+
+def parse_flowchart(code):
+    """
+    Lê um fluxograma Mermaid de cima para baixo.
+
+    :param code: Código Mermaid
+    :return: Flowchart
+    :raises ValueError: Se o código não for um fluxograma TD/TB ou tiver uma linha fora do subconjunto suportado
+    """
+    flowchart = Flowchart()
+    header = False
+    for line_number, line in enumerate(code.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("%%"):
+            continue
+        if not header:
+            match = HEADER.match(line)
+            if not match:
+                raise ValueError(f"linha {line_number}: esperado 'flowchart TD', encontrado {line!r}")
+            if (match.group(1) or "TD") not in ("TD", "TB"):
+                raise ValueError(f"linha {line_number}: direção {match.group(1)} não suportada (apenas TD/TB)")
+            header = True
+            continue
+        click = CLICK.match(line)
+        if click:
+            flowchart.links[click.group(1)] = click.group(2)
+            continue
+        ids = [flowchart.node(spec, line_number) for spec in split_chain(line)]
+        flowchart.edges.extend(zip(ids, ids[1:]))
+    if not header:
+        raise ValueError("fluxograma vazio")
+    return flowchart
+
+
+def assign_layers(flowchart, successors, predecessors):
+    """
+    Distribui os nós em camadas pelo caminho mais longo a partir das origens.
+
+    Os nós são visitados em ordem topológica; em um ciclo, o primeiro nó
+    pendente na ordem de declaração é tratado como origem, e as arestas que
+    voltam para ele são ignoradas no cálculo das camadas.
+
+    :return: Lista de camadas, cada uma uma lista de ids na ordem de visita
+    """
+    pending = {node_id: len(set(predecessors[node_id])) for node_id in flowchart.nodes}
+    remaining = list(flowchart.nodes)
+    done = set()
+    ready = [node_id for node_id in remaining if pending[node_id] == 0]
+    ready.reverse()
+    layers = []
+    while len(done) < len(flowchart.nodes):
+        if not ready:
+            ready.append(next(node_id for node_id in remaining if node_id not in done))
+        node_id = ready.pop()
+        if node_id in done:
+            continue
+        done.add(node_id)
+        node = flowchart.nodes[node_id]
+        node.layer = max((flowchart.nodes[p].layer + 1 for p in predecessors[node_id] if p in done and p != node_id),
+                         default=0)
+        while len(layers) <= node.layer:
+            layers.append([])
+        layers[node.layer].append(node_id)
+        # Pilha em ordem inversa: o primeiro sucessor é visitado primeiro, como em uma busca em profundidade
+        for child in reversed(list(dict.fromkeys(successors[node_id]))):
+            if child in done:
+                continue
+            pending[child] -= 1
+            if pending[child] == 0:
+                ready.append(child)
+    return layers
+
+
+def order_layers(flowchart, layers, successors, predecessors):
+    """
+    Reordena cada camada pelo baricentro das posições dos vizinhos, alternando passadas para baixo e para cima.
+    """
+    position = {node_id: index for layer in layers for index, node_id in enumerate(layer)}
+    for sweep in range(ORDER_SWEEPS):
+        downward = sweep % 2 == 0
+        indexes = range(1, len(layers)) if downward else range(len(layers) - 2, -1, -1)
+        neighbors = predecessors if downward else successors
+        for index in indexes:
+            layer = layers[index]
+
+            def barycenter(node_id):
+                adjacent = [position[other] for other in neighbors[node_id]
+                            if flowchart.nodes[other].layer != index]
+                return sum(adjacent) / len(adjacent) if adjacent else position[node_id]
+
+            layer.sort(key=barycenter)
+            for order, node_id in enumerate(layer):
+                position[node_id] = order
+
+
+def place_layer(nodes, desired):
+    """
+    Posiciona os centros de uma camada o mais perto possível dos desejados, sem sobreposição.
+
+    Calcula a solução empurrando os nós da esquerda para a direita e a
+    solução empurrando da direita para a esquerda; a média das duas respeita
+    os espaçamentos e não favorece nenhum dos lados.
+    """
+    left = []
+    for index, node in enumerate(nodes):
+        x = desired[index]
+        if left:
+            x = max(x, left[-1] + (nodes[index - 1].width + node.width) / 2 + H_GAP)
+        left.append(x)
+    right = [0.0] * len(nodes)
+    for index in range(len(nodes) - 1, -1, -1):
+        x = desired[index]
+        if index < len(nodes) - 1:
+            x = min(x, right[index + 1] - (nodes[index + 1].width + nodes[index].width) / 2 - H_GAP)
+        right[index] = x
+    for node, x_left, x_right in zip(nodes, left, right):
+        node.x = (x_left + x_right) / 2
+
+
+def layout(flowchart):
+    """
+    Calcula as posições (centros) de todos os nós.
+
+    :return: Tupla (largura, altura) do desenho, já com as margens
+    """
+    successors = {node_id: [] for node_id in flowchart.nodes}
+    predecessors = {node_id: [] for node_id in flowchart.nodes}
+    for source, target in flowchart.edges:
+        successors[source].append(target)
+        predecessors[target].append(source)
+
+    layers = assign_layers(flowchart, successors, predecessors)
+    order_layers(flowchart, layers, successors, predecessors)
+    rows = [[flowchart.nodes[node_id] for node_id in layer] for layer in layers]
+    for row in rows:
+        place_layer(row, [0.0] * len(row))
+
+    for sweep in range(PLACEMENT_SWEEPS):
+        downward = sweep % 2 == 0
+        neighbors = predecessors if downward else successors
+        for row in (rows[1:] if downward else reversed(rows[:-1])):
+            desired = []
+            for node in row:
+                adjacent = [flowchart.nodes[other].x for other in neighbors[node.id]
+                            if flowchart.nodes[other].layer != node.layer]
+                desired.append(sum(adjacent) / len(adjacent) if adjacent else node.x)
+            place_layer(row, desired)
+
+    nodes = flowchart.nodes.values()
+    if not nodes:
+        return MARGIN * 2, MARGIN * 2
+    offset = MARGIN - min(node.x - node.width / 2 for node in nodes)
+    y = MARGIN
+    for row in rows:
+        height = max((node.height for node in row), default=0)
+        for node in row:
+            node.x += offset
+            node.y = y + height / 2
+        y += height + V_GAP
+    width = max(node.x + node.width / 2 for node in nodes) + MARGIN
+    return width, y - V_GAP + MARGIN
+
+
+def _shape(node):
+    left, top = node.x - node.width / 2, node.y - node.height / 2
+    if node.shape == "diamond":
+        points = [(node.x, top), (left + node.width, node.y), (node.x, top + node.height), (left, node.y)]
+    elif node.shape == "parallelogram":
+        skew = len(node.lines) * LINE_HEIGHT / 2
+        points = [(left + skew, top), (left + node.width, top),
+                  (left + node.width - skew, top + node.height), (left, top + node.height)]
+    else:
+        return (f'<rect class="node" x="{left:.1f}" y="{top:.1f}" width="{node.width:.1f}" '
+                f'height="{node.height:.1f}" rx="4"/>')
+    return '<polygon class="node" points="%s"/>' % " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+
+
+def _text(node):
+    first = node.y - (len(node.lines) - 1) * LINE_HEIGHT / 2
+    spans = "".join(f'<tspan x="{node.x:.1f}" y="{first + index * LINE_HEIGHT:.1f}">{escape(line)}</tspan>'
+                    for index, line in enumerate(node.lines))
+    return f'<text text-anchor="middle" dominant-baseline="central">{spans}</text>'
+
+
+def _edge(source, target):
+    if target.layer > source.layer:
+        x1, y1 = source.x, source.y + source.height / 2
+        x2, y2 = target.x, target.y - target.height / 2
+        middle = (y1 + y2) / 2
+        return f'<path class="edge" d="M{x1:.1f},{y1:.1f} C{x1:.1f},{middle:.1f} {x2:.1f},{middle:.1f} ' \
+               f'{x2:.1f},{y2:.1f}" marker-end="url(#arrow)"/>'
+    # Aresta de retorno (ciclo) ou na mesma camada: contorna pela direita
+    x1, y1 = source.x + source.width / 2, source.y
+    x2, y2 = target.x + target.width / 2, target.y
+    bend = max(x1, x2) + H_GAP
+    return f'<path class="edge" d="M{x1:.1f},{y1:.1f} C{bend:.1f},{y1:.1f} {bend:.1f},{y2:.1f} ' \
+           f'{x2:.1f},{y2:.1f}" marker-end="url(#arrow)"/>'
+
+
+def render_svg(code):
+    """
+    Converte um fluxograma Mermaid em SVG.
+
+    :param code: Código Mermaid
+    :return: Documento SVG
+    :raises ValueError: Se o código estiver fora do subconjunto suportado
+    """
+    return draw(parse_flowchart(code))
+
+
+def render_graph(graph):
+    """
+    Converte um grafo intermediário (flow_graph.FlowGraph) em SVG.
+
+    :return: Documento SVG
+    """
+    return draw(Flowchart.from_graph(graph))
+
+
+def draw(flowchart):
+    """
+    Calcula o layout de um fluxograma e o desenha.
+
+    :return: Documento SVG
+    """
+    width, height = layout(flowchart)
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        f'width="{width:.0f}" height="{height:.0f}" viewBox="0 0 {width:.1f} {height:.1f}">',
+        f"<style>{STYLE}</style>",
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" '
+        'orient="auto"><path d="M0,0 L10,5 L0,10 z" fill="#333"/></marker></defs>',
+    ]
+    nodes = flowchart.nodes
+    parts += [_edge(nodes[source], nodes[target]) for source, target in flowchart.edges]
+    for node in nodes.values():
+        drawing = _shape(node) + _text(node)
+        target = flowchart.links.get(node.id)
+        if target is not None:
+            drawing = f"<a href={quoteattr(target)} xlink:href={quoteattr(target)}>{drawing}</a>"
+        parts.append(f"<g>{drawing}</g>")
+    parts.append("</svg>\n")
+    return "\n".join(parts)
+
+
+class SvgRenderer:
+    """
+    Renderiza os arquivos .mmd no próprio processo, com render_svg.
+
+    Tem a mesma interface dos renderizadores do mmdc em convert_py_to_mmd_and_svg,
+    que, por causa de renders_graphs, desenha os SVGs direto dos grafos
+    (render_graph) ao gerar os .mmd; render e render_many ficam para .mmd avulsos.
+    """
+    renders_graphs = True
+
+    @property
+    def version(self):
+        """
+        Identifica a saída do renderizador, para invalidar os caches quando este arquivo mudar.
+        """
+        return f"svg:{file_digest(__file__)[:16]}"
+
+    def render(self, mmd_path, svg_path):
+        with open(mmd_path, "r", encoding="utf-8") as f:
+            svg = render_svg(f.read())
+        with open(svg_path, "w", encoding="utf-8") as f:
+            f.write(svg)
+
+    def render_many(self, jobs):
+        """
+        Renderiza uma lista de pares (mmd_path, svg_path).
+
+        :param jobs: Lista de tuplas (mmd_path, svg_path)
+        :return: Gerador de tuplas (mmd_path, svg_path, erro), com erro None em caso de sucesso
+        """
+        for mmd_path, svg_path in jobs:
+            try:
+                self.render(mmd_path, svg_path)
+            except Exception as e:
+                yield mmd_path, svg_path, e
+            else:
+                yield mmd_path, svg_path, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renderiza fluxogramas Mermaid (.mmd) em SVG sem o mmdc.")
+    parser.add_argument("files", nargs="+", help="arquivos .mmd; cada um gera um .svg ao lado")
+    args = parser.parse_args(argv)
+
+    jobs = [(path, os.path.splitext(path)[0] + ".svg") for path in args.files]
+    failures = 0
+    for mmd_path, svg_path, error in SvgRenderer().render_many(jobs):
+        if error is None:
+            print(f"✅ SVG gerado: {svg_path}")
+        else:
+            print(f"❌ Erro ao renderizar {mmd_path}: {error}")
+            failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
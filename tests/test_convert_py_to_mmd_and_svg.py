@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import threading
+
+from convert_py_to_mmd_and_svg import update_diagrams
+from run_report import RunReport
+
+
+class BrokenRenderer:
+    """
+    Renderizador cujo render_many falha fora do subprocesso (por exemplo, ao abrir um .mmd).
+    """
+
+    def render_many(self, jobs):
+        raise OSError("falha no renderizador")
+        yield
+
+
+def test_update_diagrams_reraises_renderer_error_without_hanging(tmp_path):
+    py_files = []
+    for index in range(5):
+        path = tmp_path / f"programa_{index}.py"
+        path.write_text(f"x = {index}\nif x:\n    print(x)\n", encoding="utf-8")
+        py_files.append(str(path))
+    outcome = {}
+
+    def run():
+        try:
+            update_diagrams(py_files, BrokenRenderer(), root=str(tmp_path), queue_size=1,
+                            report=RunReport("diagram", verbose=False))
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive(), "update_diagrams ficou bloqueado na fila de renderização"
+    assert isinstance(outcome.get("error"), OSError)
+
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from find_files_with_keyword import _scan_overlap, compile_patterns, scan_file
+
+
+def test_scan_file_reports_long_line_once_per_pattern(tmp_path):
+    path = tmp_path / "minificado.py"
+    long_line = "foo " + "x" * 100 + " foo"
+    path.write_text(long_line + "\nbar foo\n", encoding="utf-8")
+    patterns = compile_patterns(["foo", "bar"])
+
+    matches = list(scan_file(str(path), patterns, chunk_size=32, overlap=_scan_overlap(patterns, False)))
+
+    assert [(match.line_number, match.pattern) for match in matches] == [(1, "foo"), (2, "bar"), (2, "foo")]
+    assert matches[0].line.startswith("foo ")
+    assert matches[1].line == "bar foo"
+
+
+def test_scan_file_long_line_matches_whole_file_scan(tmp_path):
+    path = tmp_path / "dados.py"
+    path.write_text(("ab" * 50 + "foo") * 20 + "\n" + "foo\n", encoding="utf-8")
+    patterns = compile_patterns(["foo"])
+
+    chunked = list(scan_file(str(path), patterns, chunk_size=16, overlap=3))
+    whole = list(scan_file(str(path), patterns))
+
+    assert [match.line_number for match in chunked] == [match.line_number for match in whole] == [1, 2]
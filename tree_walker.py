@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Percorre árvores de diretórios com os.scandir, podando cedo o que não interessa.
+
+Diretórios como .git, node_modules e ambientes virtuais são descartados antes
+de serem percorridos, e regras de arquivos .gitignore (de cada diretório
+visitado) são respeitadas. As entradas devolvidas são os.DirEntry, que
+guardam em cache o resultado de stat.
+"""
+import os
+import re
+
+# Diretórios que nunca são percorridos
+DEFAULT_PRUNE = frozenset({
+    '.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv',
+    '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.ruff_cache', '.ipynb_checkpoints',
+})
+# Arquivo que identifica um ambiente virtual do Python
+VENV_MARKER = 'pyvenv.cfg'
+
+
+class IgnoreRule:
+    """
+    Uma linha de um arquivo .gitignore.
+
+    :param base: Caminho (relativo à raiz percorrida) do diretório que contém o .gitignore
+    :param pattern: Padrão, já sem '!' e sem a barra final
+    :param negate: True se a linha começava com '!'
+    :param dir_only: True se a linha terminava com '/'
+    """
+    __slots__ = ('base', 'regex', 'negate', 'dir_only', 'anchored')
+
+    def __init__(self, base, pattern, negate=False, dir_only=False):
+        self.base = base
+        self.negate = negate
+        self.dir_only = dir_only
+        # Padrões sem barra valem para o nome em qualquer nível; com barra, a partir de base
+        self.anchored = '/' in pattern
+        self.regex = re.compile(translate_pattern(pattern.lstrip('/')))
+
+    def matches(self, rel_path, name, is_dir):
+        if self.dir_only and not is_dir:
+            return False
+        if not self.anchored:
+            return self.regex.match(name) is not None
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+
+def translate_pattern(pattern):
+    """
+    Converte um padrão no estilo .gitignore em expressão regular.
+
+    :param pattern: Padrão com *, **, ? e classes [...]
+    :return: Expressão regular equivalente (como texto)
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern.startswith('**', i):
+                out.append('.*')
+                i += 2
+                continue
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                chars = pattern[i + 1:end]
+                if chars.startswith('!'):
+                    chars = '^' + chars[1:]
+                out.append('[' + chars.replace('\\', '\\\\') + ']')
+                i = end + 1
+                continue
+        elif c == '\\' and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out) + r'\Z'
+
+
+def parse_ignore_file(path, base=''):
+    """
+    Lê um arquivo .gitignore.
+
+    :param path: Caminho do arquivo
+    :param base: Caminho relativo do diretório que contém o arquivo
+    :return: Lista de IgnoreRule, na ordem do arquivo
+    """
+    rules = []
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return rules
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if line:
+            rules.append(IgnoreRule(base, line, negate, dir_only))
+    return rules
+
+
+def is_ignored(rules, rel_path, name, is_dir):
+    """
+    Aplica as regras em ordem; a última que casar decide.
+    """
+    ignored = False
+    for rule in rules:
+        if rule.negate == ignored and rule.matches(rel_path, name, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+class DirListing:
+    """
+    Conteúdo de um diretório visitado.
+
+    :ivar path: Caminho do diretório
+    :ivar dirs: os.DirEntry dos subdiretórios que serão percorridos
+    :ivar files: os.DirEntry dos arquivos não ignorados
+    :ivar names: Nomes de todas as entradas do diretório, inclusive as podadas ou ignoradas
+    """
+    __slots__ = ('path', 'dirs', 'files', 'names')
+
+    def __init__(self, path, dirs, files, names):
+        self.path = path
+        self.dirs = dirs
+        self.files = files
+        self.names = names
+
+
+def _start_state(root, start, prune, prune_hidden, gitignore, prune_venvs):
+    """
+    Desce de root até start aplicando as mesmas podas de walk_tree.
+
+    :return: Tupla (caminho, caminho relativo, regras do .gitignore) de start, ou None se ele seria podado
+    """
+    rel = os.path.relpath(start, root)
+    if rel == os.curdir:
+        return root, '', []
+    parts = rel.split(os.sep)
+    if parts[0] == os.pardir:
+        raise ValueError(f'{start} não está dentro de {root}')
+    path, rel_path, rules = root, '', []
+    for name in parts:
+        if gitignore:
+            rules = rules + parse_ignore_file(os.path.join(path, '.gitignore'), rel_path)
+        entry_rel = f'{rel_path}/{name}' if rel_path else name
+        if name in prune or (prune_hidden and name.startswith('.')):
+            return None
+        if rules and is_ignored(rules, entry_rel, name, True):
+            return None
+        path, rel_path = os.path.join(path, name), entry_rel
+        if prune_venvs and os.path.exists(os.path.join(path, VENV_MARKER)):
+            return None
+    return path, rel_path, rules
+
+
+def walk_tree(root='.', prune=DEFAULT_PRUNE, prune_hidden=False, gitignore=True, prune_venvs=True, start=None):
+    """
+    Percorre a árvore a partir de root, de cima para baixo, como os.walk.
+
+    Os subdiretórios podados ou ignorados não são abertos. O chamador pode
+    remover itens de listing.dirs para não descer neles.
+
+    :param root: Diretório inicial
+    :param prune: Nomes de diretórios que nunca são percorridos
+    :param prune_hidden: Se True, também poda diretórios cujo nome começa com '.'
+    :param gitignore: Se True, respeita os arquivos .gitignore encontrados
+    :param prune_venvs: Se True, poda diretórios que contêm pyvenv.cfg
+    :param start: Subdiretório de root a percorrer no lugar de root; as podas e os .gitignore
+        do caminho entre os dois valem como se root fosse percorrida (nada é devolvido se start
+        for podado)
+    :return: Gerador de DirListing
+    """
+    stack = [(root, '', [])]
+    if start is not None:
+        state = _start_state(root, start, prune, prune_hidden, gitignore, prune_venvs)
+        if state is None:
+            return
+        stack = [state]
+    while stack:
+        path, rel_path, rules = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        names = [entry.name for entry in entries]
+        if prune_venvs and rel_path and VENV_MARKER in names:
+            continue
+        if gitignore and '.gitignore' in names:
+            rules = rules + parse_ignore_file(os.path.join(path, '.gitignore'), rel_path)
+
+        dirs, files = [], []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            entry_rel = f'{rel_path}/{entry.name}' if rel_path else entry.name
+            if is_dir and (entry.name in prune or (prune_hidden and entry.name.startswith('.'))):
+                continue
+            if rules and is_ignored(rules, entry_rel, entry.name, is_dir):
+                continue
+            (dirs if is_dir else files).append(entry)
+
+        listing = DirListing(path, dirs, files, names)
+        yield listing
+
+        for entry in reversed(listing.dirs):
+            if not entry.is_symlink():
+                entry_rel = f'{rel_path}/{entry.name}' if rel_path else entry.name
+                stack.append((entry.path, entry_rel, rules))
+
+
+def iter_files(root='.', suffixes=None, **options):
+    """
+    Itera pelos arquivos da árvore, opcionalmente filtrando pela extensão.
+
+    :param root: Diretório inicial
+    :param suffixes: Tupla de terminações aceitas (por exemplo, ('.py',)), ou None para todos
+    :param options: Argumentos repassados a walk_tree
+    :return: Gerador de os.DirEntry
+    """
+    for listing in walk_tree(root, **options):
+        for entry in listing.files:
+            if suffixes is None or entry.name.endswith(suffixes):
+                yield entry
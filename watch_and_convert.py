@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+"""
+Mantém notebooks, Markdown e fluxogramas sincronizados enquanto os arquivos são editados.
+
+Observa a árvore com inotify (via ctypes, no Linux) ou, na falta dele, por
+varredura periódica. Os eventos são agrupados (debounce) e cada arquivo
+alterado é encaminhado ao conversor correspondente:
+
+- README.ipynb -> .md e .py (convert_ipynb_to_md_and_py)
+- .md          -> .ipynb e .py (convert_md_to_ipynb_and_py)
+- .py          -> .py.mmd e .py.svg (convert_py_to_mmd_and_svg)
+
+Os módulos, exportadores do nbconvert e manifestos ficam carregados durante
+toda a execução, de modo que uma edição é refletida sem reprocessar a árvore.
+Arquivos gravados pelo próprio processo não são reencaminhados aos
+conversores de notebooks (o que faria README.ipynb e README.md se
+sobrescreverem em ciclo); os .py gerados seguem apenas para os fluxogramas.
+
+Uso: python watch_and_convert.py [--poll] [--debounce 0.3] [--no-diagrams]
+"""
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import shutil
+import struct
+import sys
+import time
+
+import convert_ipynb_to_md_and_py as ipynb_converter
+import convert_md_to_ipynb_and_py as md_converter
+import convert_py_to_mmd_and_svg as diagram_converter
+from file_manifest import Manifest, output_state
+from tree_walker import VENV_MARKER, walk_tree
+
+# Constantes de <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+# Tempo sem novos eventos antes de converter (editores gravam em várias etapas)
+DEFAULT_DEBOUNCE = 0.3
+# Intervalo entre varreduras no modo de polling
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+def route(path):
+    """
+    Indica qual conversor trata o arquivo.
+
+    :param path: Caminho do arquivo
+    :return: 'notebook', 'markdown', 'python' ou None
+    """
+    name = os.path.basename(path)
+    if name.startswith('.') or name.endswith('~'):
+        # Arquivos temporários de editores e arquivos ocultos
+        return None
+    if name == 'README.ipynb':
+        return 'notebook'
+    if name.endswith('.md'):
+        return 'markdown'
+    if name.endswith('.py'):
+        return 'python'
+    return None
+
+
+class InotifyWatcher:
+    """
+    Observa uma árvore de diretórios com inotify, acrescentando os diretórios criados depois.
+
+    :param root: Diretório raiz
+    """
+
+    def __init__(self, root):
+        libc_name = ctypes.util.find_library('c')
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify indisponível')
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 falhou')
+        self.root = root
+        self.paths = {}
+        self.overflowed = False
+        self.add_tree(root)
+
+    def add_tree(self, path):
+        """
+        Observa path e seus subdiretórios, com as mesmas podas (nomes, ambientes
+        virtuais e .gitignore) que valeriam para eles numa varredura a partir da raiz.
+
+        :return: Arquivos já existentes na árvore acrescentada
+        :raises OSError: Com errno.ENOSPC, se o limite de observações do inotify for atingido
+        """
+        files = set()
+        for listing in walk_tree(self.root, start=path):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(listing.path), WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error == errno.ENOSPC:
+                    raise OSError(error, 'limite de inotify atingido (fs.inotify.max_user_watches)')
+                continue
+            self.paths[wd] = listing.path
+            files.update(entry.path for entry in listing.files)
+        return files
+
+    def remove_tree(self, path):
+        """
+        Deixa de observar path e seus subdiretórios.
+        """
+        prefix = os.path.join(path, '')
+        for wd, watched in list(self.paths.items()):
+            if watched == path or watched.startswith(prefix):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.paths[wd]
+
+    def wait(self, timeout):
+        """
+        Espera por eventos.
+
+        :param timeout: Tempo máximo de espera, em segundos (None = indefinidamente)
+        :return: Conjunto de arquivos alterados, criados ou removidos
+        :raises OSError: Com errno.ENOSPC, se um diretório criado não puder ser observado
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        changed = set()
+        if not readable:
+            return changed
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Eventos perdidos: quem chamou deve refazer a varredura completa
+                    self.overflowed = True
+                    continue
+                if mask & IN_IGNORED:
+                    self.paths.pop(wd, None)
+                    continue
+                directory = self.paths.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed.update(self.add_tree(path))
+                    continue
+                if name == os.fsencode(VENV_MARKER) and directory != self.root:
+                    # Um ambiente virtual criado depois do diretório (python -m venv): sai da observação
+                    self.remove_tree(directory)
+                    prefix = os.path.join(directory, '')
+                    changed = {path for path in changed if not path.startswith(prefix)}
+                    continue
+                changed.add(path)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class PollingWatcher:
+    """
+    Observa uma árvore de diretórios comparando varreduras periódicas (tamanho e mtime).
+
+    :param root: Diretório raiz
+    :param interval: Intervalo entre varreduras, em segundos
+    """
+
+    def __init__(self, root, interval=DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.overflowed = False
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for listing in walk_tree(self.root):
+            for entry in listing.files:
+                if route(entry.path) is None:
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                snapshot[entry.path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        snapshot = self.scan()
+        changed = {path for path, state in snapshot.items() if self.snapshot.get(path) != state}
+        changed.update(path for path in self.snapshot if path not in snapshot)
+        self.snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+class SyncDaemon:
+    """
+    Encaminha arquivos alterados aos conversores, mantendo-os carregados entre as conversões.
+
+    :param root: Diretório raiz (as chaves dos manifestos são as mesmas dos scripts em lote)
+    :param renderer: Renderizador dos fluxogramas, ou None para não gerá-los
+    """
+
+    def __init__(self, root='.', renderer=None):
+        self.root = root
+        self.renderer = renderer
+        self.notebook_manifest = Manifest(os.path.join(root, ipynb_converter.MANIFEST_NAME),
+                                          ipynb_converter.converter_version())
+        self.markdown_manifest = Manifest(os.path.join(root, md_converter.MANIFEST_NAME),
+                                          md_converter.converter_version())
+        self.diagram_manifest = Manifest(os.path.join(root, diagram_converter.MANIFEST_NAME),
+                                         diagram_converter.generator_version(renderer))
+        # Saídas gravadas por este processo e o estado em que foram deixadas
+        self.written = {}
+
+    def remember(self, paths):
+        for path in paths:
+            try:
+                self.written[os.path.normpath(path)] = output_state(path)
+            except OSError:
+                pass
+
+    def is_own_output(self, path):
+        """
+        Verifica se o arquivo está exatamente como este processo o gravou.
+        """
+        key = os.path.normpath(path)
+        state = self.written.get(key)
+        if state is None:
+            return False
+        try:
+            if output_state(path) == state:
+                return True
+        except OSError:
+            pass
+        del self.written[key]
+        return False
+
+    def sync(self, paths):
+        """
+        Converte os arquivos alterados: notebooks, depois Markdown, depois fluxogramas.
+
+        :param paths: Caminhos alterados
+        :return: Número de arquivos convertidos
+        """
+        routed = {'notebook': [], 'markdown': [], 'python': []}
+        removed_python = False
+        for path in sorted(paths):
+            kind = route(path)
+            if kind is None:
+                continue
+            if not os.path.exists(path):
+                removed_python |= kind == 'python'
+                continue
+            if self.is_own_output(path):
+                # Saídas próprias só seguem para os fluxogramas
+                if kind == 'python':
+                    routed['python'].append(path)
+                continue
+            routed[kind].append(path)
+
+        converted = 0
+        for path in routed['notebook']:
+            try:
+                result = ipynb_converter.convert_notebook(path, self.notebook_manifest)
+            except Exception as e:
+                print(f'❌ Erro ao converter {path}: {e}')
+                continue
+            if result is not None:
+                output_filenames, _ = result
+                self.remember(output_filenames)
+                routed['python'].extend(name for name in output_filenames if name.endswith('.py'))
+                converted += 1
+                print(f'📓 {path} -> {" e ".join(output_filenames)}')
+
+        for path in routed['markdown']:
+            if self.is_own_output(path):
+                continue
+            try:
+                output_files = md_converter.convert_markdown(path, self.markdown_manifest)
+            except Exception as e:
+                print(f'❌ Erro ao converter {path}: {e}')
+                continue
+            if output_files is not None:
+                self.remember(output_files)
+                routed['python'].extend(name for name in output_files if name.endswith('.py'))
+                converted += 1
+                print(f'📝 {path} -> {" e ".join(output_files)}')
+
+        if self.renderer is not None:
+            if removed_python:
+                diagram_converter.remove_orphan_outputs(self.diagram_manifest, self.root)
+            python_files = sorted(set(routed['python']))
+            if python_files:
+                keys = [os.path.relpath(path, self.root) for path in python_files]
+                before = [self.diagram_manifest.get(key) for key in keys]
+                diagram_converter.update_diagrams(python_files, self.renderer, self.diagram_manifest, root=self.root)
+                # Arquivos cujos fluxogramas já estavam atualizados não contam
+                converted += sum(self.diagram_manifest.get(key) is not entry for key, entry in zip(keys, before))
+
+        for manifest in (self.notebook_manifest, self.markdown_manifest, self.diagram_manifest):
+            manifest.save()
+        return converted
+
+    def run(self, watcher, debounce=DEFAULT_DEBOUNCE):
+        """
+        Laço principal: acumula eventos e converte quando passam debounce segundos sem novidades.
+        """
+        pending = set()
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                changed = watcher.wait(timeout)
+            except OSError as e:
+                if e.errno != errno.ENOSPC:
+                    raise
+                # Sem observações livres para os diretórios novos: continua por varredura periódica
+                print(f'⚠️ {e.strerror}; usando varredura periódica.')
+                watcher.close()
+                watcher = PollingWatcher(self.root)
+                watcher.overflowed = True
+                changed = set()
+            if watcher.overflowed:
+                print('⚠️ Eventos perdidos; varrendo a árvore inteira.')
+                watcher.overflowed = False
+                changed = {entry.path for listing in walk_tree(self.root) for entry in listing.files}
+            if changed:
+                pending |= changed
+                deadline = time.monotonic() + debounce
+                continue
+            if pending and time.monotonic() >= deadline:
+                start = time.perf_counter()
+                converted = self.sync(pending)
+                if converted:
+                    print(f'⏱️ {converted} arquivo(s) sincronizado(s) em {(time.perf_counter() - start) * 1000:.0f} ms')
+                pending, deadline = set(), None
+
+
+def create_watcher(root, poll=False, interval=DEFAULT_POLL_INTERVAL):
+    """
+    Cria o observador: inotify quando disponível, senão varredura periódica.
+    """
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except OSError as e:
+            print(f'⚠️ inotify indisponível ({e}); usando varredura periódica.')
+    return PollingWatcher(root, interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sincroniza notebooks, Markdown e fluxogramas continuamente.')
+    parser.add_argument('root', nargs='?', default='.', help='diretório observado (padrão: o atual)')
+    parser.add_argument('--poll', action='store_true', help='usa varredura periódica em vez de inotify')
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help='intervalo entre varreduras no modo --poll, em segundos')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help='tempo sem eventos antes de converter, em segundos')
+    parser.add_argument('--no-diagrams', action='store_true', help='não gera os fluxogramas dos arquivos .py')
+    parser.add_argument('--renderer', choices=diagram_converter.RENDERERS, default='mmdc',
+                        help='gera os SVGs com o mermaid-cli (mmdc) ou com o renderizador em Python puro (svg)')
+    parser.add_argument('--mmdc', default='mmdc', help='comando do mermaid-cli')
+    args = parser.parse_args(argv)
+
+    renderer = None
+    if not args.no_diagrams:
+        if args.renderer == 'mmdc' and shutil.which(args.mmdc) is None:
+            print(f'⚠️ {args.mmdc} não encontrado; fluxogramas desativados (use --renderer svg para dispensá-lo).')
+        else:
+            renderer = diagram_converter.create_renderer(args.renderer, args.mmdc)
+
+    daemon = SyncDaemon(args.root, renderer)
+    watcher = create_watcher(args.root, args.poll, args.interval)
+    print(f'👀 Observando {os.path.abspath(args.root)} ({type(watcher).__name__}). Ctrl+C para sair.')
+    try:
+        daemon.run(watcher, args.debounce)
+    except KeyboardInterrupt:
+        print('👋 Encerrando.')
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    main()